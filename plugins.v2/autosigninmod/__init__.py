@@ -1,4 +1,6 @@
 import re
+import threading
+import time
 import traceback
 from datetime import datetime, timedelta
 from multiprocessing.dummy import Pool as ThreadPool
@@ -11,7 +13,10 @@ from app import schemas
 from app.core.config import settings
 from app.core.event import eventmanager, Event
 from app.db.site_oper import SiteOper
-from app.plugins.autosigninmod.cloak_helper import CloakBrowserHelper
+from app.plugins.autosigninmod.cloak_helper import CloakBrowserHelper, configure_browser_pool, \
+    shutdown_browser_pool
+from app.plugins.autosigninmod.handler_index import SiteHandlerIndex
+from app.plugins.autosigninmod.session_pool import close_session_pool, get_site_session, open_session_pool
 from app.helper.cloudflare import under_challenge
 from app.helper.module import ModuleHelper
 from app.helper.sites import SitesHelper
@@ -35,7 +40,7 @@ class AutoSignInMod(_PluginBase):
     # 插件图标
     plugin_icon = "signin.png"
     # 插件版本
-    plugin_version = "2.8.3.1"
+    plugin_version = "2.8.4.6"
     # 插件作者
     plugin_author = "thsrite,Seed680"
     # 作者主页
@@ -51,6 +56,8 @@ class AutoSignInMod(_PluginBase):
     _scheduler: Optional[BackgroundScheduler] = None
     # 加载的模块
     _site_schema: list = []
+    # 站点签到类索引
+    _site_index: SiteHandlerIndex = SiteHandlerIndex()
 
     # 配置属性
     _enabled: bool = False
@@ -65,6 +72,15 @@ class AutoSignInMod(_PluginBase):
     _start_time: int = None
     _end_time: int = None
     _auto_cf: int = 0
+    # 浏览器池：最大浏览器数量、单个浏览器打开多少个页面后重启、空闲多少秒后关闭
+    _browser_pool_size: int = 2
+    _browser_max_pages: int = 50
+    _browser_idle_timeout: int = 300
+    # 站点访问方式记忆有效期（天）
+    _strategy_days: float = 7
+    # 站点访问方式记忆 {域名: {"mode": "http"|"render", "time": 时间戳}}
+    _site_strategies: Optional[dict] = None
+    _site_strategies_lock = threading.Lock()
 
     def init_plugin(self, config: dict = None):
 
@@ -83,6 +99,10 @@ class AutoSignInMod(_PluginBase):
             self._retry_keyword = config.get("retry_keyword")
             self._auto_cf = config.get("auto_cf")
             self._clean = config.get("clean")
+            self._browser_pool_size = int(config.get("browser_pool_size") or 2)
+            self._browser_max_pages = int(config.get("browser_max_pages") or 50)
+            self._browser_idle_timeout = int(config.get("browser_idle_timeout") or 300)
+            self._strategy_days = float(config.get("strategy_days") or 7)
 
             # 过滤掉已删除的站点
             all_sites = [site.id for site in SiteOper().list_order_by_pri()] + [site.get("id") for site in
@@ -92,11 +112,16 @@ class AutoSignInMod(_PluginBase):
             # 保存配置
             self.__update_config()
 
+        # 浏览器池配置
+        configure_browser_pool(size=self._browser_pool_size, max_pages=self._browser_max_pages,
+                               idle_timeout=self._browser_idle_timeout)
+
         # 加载模块
         if self._enabled or self._onlyonce:
 
-            self._site_schema = ModuleHelper.load('app.plugins.autosignin.sites',
+            self._site_schema = ModuleHelper.load('app.plugins.autosigninmod.sites',
                                                   filter_func=lambda _, obj: hasattr(obj, 'match'))
+            self._site_index = SiteHandlerIndex(self._site_schema)
 
             # 立即运行一次
             if self._onlyonce:
@@ -134,6 +159,10 @@ class AutoSignInMod(_PluginBase):
                 "retry_keyword": self._retry_keyword,
                 "auto_cf": self._auto_cf,
                 "clean": self._clean,
+                "browser_pool_size": self._browser_pool_size,
+                "browser_max_pages": self._browser_max_pages,
+                "browser_idle_timeout": self._browser_idle_timeout,
+                "strategy_days": self._strategy_days,
             }
         )
 
@@ -1371,12 +1400,17 @@ class AutoSignInMod(_PluginBase):
 
         # 执行签到
         logger.info(f"开始执行{type_str}任务 ...")
-        if type_str == "签到":
-            with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
-                status = p.map(self.signin_site, do_sites)
-        else:
-            with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
-                status = p.map(self.login_site, do_sites)
+        # 本次任务中各站点复用HTTP会话，任务结束后关闭
+        open_session_pool()
+        try:
+            if type_str == "签到":
+                with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
+                    status = p.map(self.signin_site, do_sites)
+            else:
+                with ThreadPool(min(len(do_sites), int(self._queue_cnt))) as p:
+                    status = p.map(self.login_site, do_sites)
+        finally:
+            close_session_pool()
 
         if status:
             logger.info(f"站点{type_str}任务完成！")
@@ -1494,17 +1528,62 @@ class AutoSignInMod(_PluginBase):
             if event:
                 self.post_message(channel=event.event_data.get("channel"),
                                   title=f"站点{type_str}任务失败！", userid=event.event_data.get("user"))
+        # 保存站点访问方式
+        self.__save_site_strategies()
         # 保存配置
         self.__update_config()
 
+    def __get_site_strategy(self, domain: str) -> Optional[str]:
+        """
+        获取站点上次成功的访问方式，没有记录时返回None，记录过期后重新尝试普通请求
+        :param domain: 站点域名
+        :return: http|render
+        """
+        with self._site_strategies_lock:
+            if self._site_strategies is None:
+                self._site_strategies = self.get_data(key="site_strategies") or {}
+            strategy = self._site_strategies.get(domain)
+        if not strategy:
+            return None
+        if self.__is_strategy_expired(strategy):
+            return "http"
+        return strategy.get("mode")
+
+    def __is_strategy_expired(self, strategy: dict) -> bool:
+        """
+        站点访问方式记录是否已过期
+        """
+        return time.time() - (strategy.get("time") or 0) > self._strategy_days * 86400
+
+    def __set_site_strategy(self, domain: str, mode: str):
+        """
+        记录站点成功的访问方式，仍为仿真且未过期时保留原记录时间，过期后才会重新尝试普通请求
+        :param domain: 站点域名
+        :param mode: http|render
+        """
+        with self._site_strategies_lock:
+            if self._site_strategies is None:
+                self._site_strategies = self.get_data(key="site_strategies") or {}
+            strategy = self._site_strategies.get(domain)
+            if mode == "render" and strategy and strategy.get("mode") == "render" \
+                    and not self.__is_strategy_expired(strategy):
+                return
+            self._site_strategies[domain] = {"mode": mode, "time": time.time()}
+
+    def __save_site_strategies(self):
+        """
+        清理过期的站点访问方式并保存
+        """
+        with self._site_strategies_lock:
+            if self._site_strategies is None:
+                return
+            expire_time = time.time() - self._strategy_days * 86400
+            self._site_strategies = {domain: strategy for domain, strategy in self._site_strategies.items()
+                                     if (strategy.get("time") or 0) > expire_time}
+            self.save_data(key="site_strategies", value=self._site_strategies)
+
     def __build_class(self, url) -> Any:
-        for site_schema in self._site_schema:
-            try:
-                if site_schema.match(url):
-                    return site_schema
-            except Exception as e:
-                logger.error("站点模块加载失败：%s" % str(e))
-        return None
+        return self._site_index.resolve(url)
 
     def signin_by_domain(self, url: str, apikey: str) -> schemas.Response:
         """
@@ -1542,7 +1621,14 @@ class AutoSignInMod(_PluginBase):
                 state, message = False, f"签到失败：{str(e)}"
         else:
             state, message = self.__signin_base(site_info)
-        # 统计
+        return self.__record_site_result(site_info=site_info, state=state, message=message, start_time=start_time)
+
+    @staticmethod
+    def __record_site_result(site_info: CommentedMap, state: bool, message: str,
+                             start_time: datetime) -> Tuple[str, str]:
+        """
+        统计站点签到|登录耗时和成功率
+        """
         seconds = (datetime.now() - start_time).seconds
         domain = StringUtils.get_url_domain(site_info.get('url'))
         if state:
@@ -1551,10 +1637,9 @@ class AutoSignInMod(_PluginBase):
             SiteOper().fail(domain)
         return site_info.get("name"), message
 
-    @staticmethod
-    def __signin_base(site_info: CommentedMap) -> Tuple[bool, str]:
+    def __signin_base(self, site_info: CommentedMap) -> Tuple[bool, str]:
         """
-        通用签到处理
+        通用签到处理，优先使用普通请求，遇到Cloudflare或登录失败时再使用浏览器仿真，并记住站点成功的方式
         :param site_info: 站点信息
         :return: 签到结果信息
         """
@@ -1579,61 +1664,93 @@ class AutoSignInMod(_PluginBase):
                 # 拼登签到地址
                 checkin_url = urljoin(site_url, "attendance.php")
             logger.info(f"开始站点签到：{site}，地址：{checkin_url}...")
-            render = True
-            if render:
-                page_source = CloakBrowserHelper().get_page_source(url=checkin_url,
-                                                                 cookies=site_cookie,
-                                                                 ua=ua,
-                                                                 proxies=proxy_server,
-                                                                 timeout=timeout)
-                if not SiteUtils.is_logged_in(page_source):
-                    if under_challenge(page_source):
-                        return False, f"无法通过Cloudflare！"
-                    return False, f"仿真登录失败，Cookie已失效！"
-                else:
-                    # 判断是否已签到
-                    if re.search(r'已签|签到已得', page_source, re.IGNORECASE) \
-                            or SiteUtils.is_checkin(page_source):
-                        return True, f"签到成功"
-                    return True, "仿真签到成功"
-            else:
-                res = RequestUtils(cookies=site_cookie,
-                                   ua=ua,
-                                   proxies=proxies,
-                                   timeout=timeout
-                                   ).get_res(url=checkin_url)
-                if not res and site_url != checkin_url:
-                    logger.info(f"开始站点模拟登录：{site}，地址：{site_url}...")
-                    res = RequestUtils(cookies=site_cookie,
-                                       ua=ua,
-                                       proxies=proxies,
-                                       timeout=timeout
-                                       ).get_res(url=site_url)
-                # 判断登录状态
-                if res and res.status_code in [200, 500, 403]:
-                    if not SiteUtils.is_logged_in(res.text):
-                        if under_challenge(res.text):
-                            msg = "站点被Cloudflare防护，请打开站点浏览器仿真"
-                        elif res.status_code == 200:
-                            msg = "Cookie已失效"
-                        else:
-                            msg = f"状态码：{res.status_code}"
-                        logger.warn(f"{site} 签到失败，{msg}")
-                        return False, f"签到失败，{msg}！"
-                    else:
-                        logger.info(f"{site} 签到成功")
-                        return True, f"签到成功"
-                elif res is not None:
-                    logger.warn(f"{site} 签到失败，状态码：{res.status_code}")
-                    return False, f"签到失败，状态码：{res.status_code}！"
-                else:
-                    logger.warn(f"{site} 签到失败，无法打开网站")
-                    return False, f"签到失败，无法打开网站！"
+            domain = StringUtils.get_url_domain(site_url)
+            # 没有记录时，站点开启了仿真则直接仿真
+            mode = self.__get_site_strategy(domain) or ("render" if render else "http")
+            if mode == "http":
+                state, message, escalate = self.__signin_by_http(site=site, site_url=site_url,
+                                                                 checkin_url=checkin_url, cookie=site_cookie,
+                                                                 ua=ua, proxies=proxies, timeout=timeout)
+                if not escalate:
+                    if state:
+                        self.__set_site_strategy(domain, "http")
+                    return state, message
+                logger.info(f"{site} 普通请求{message}，改用浏览器仿真签到")
+            state, message = self.__signin_by_render(checkin_url=checkin_url, cookie=site_cookie, ua=ua,
+                                                     proxies=proxy_server, timeout=timeout)
+            if state:
+                self.__set_site_strategy(domain, "render")
+            return state, message
         except Exception as e:
             logger.warn("%s 签到失败：%s" % (site, str(e)))
             traceback.print_exc()
             return False, f"签到失败：{str(e)}！"
 
+    @staticmethod
+    def __signin_by_render(checkin_url: str, cookie: str, ua: str, proxies: Optional[dict],
+                           timeout: int) -> Tuple[bool, str]:
+        """
+        浏览器仿真签到
+        :return: 签到状态，签到结果信息
+        """
+        page_source = CloakBrowserHelper().get_page_source(url=checkin_url,
+                                                         cookies=cookie,
+                                                         ua=ua,
+                                                         proxies=proxies,
+                                                         timeout=timeout)
+        if not SiteUtils.is_logged_in(page_source):
+            if under_challenge(page_source):
+                return False, f"无法通过Cloudflare！"
+            return False, f"仿真登录失败，Cookie已失效！"
+        else:
+            # 判断是否已签到
+            if re.search(r'已签|签到已得', page_source, re.IGNORECASE) \
+                    or SiteUtils.is_checkin(page_source):
+                return True, f"签到成功"
+            return True, "仿真签到成功"
+
+    @staticmethod
+    def __signin_by_http(site: str, site_url: str, checkin_url: str, cookie: str, ua: str,
+                         proxies: Optional[dict], timeout: int) -> Tuple[bool, str, bool]:
+        """
+        普通请求签到
+        :return: 签到状态，签到结果信息，是否需要改用浏览器仿真
+        """
+        res = RequestUtils(cookies=cookie,
+                           session=get_site_session(url=site_url, ua=ua, proxies=proxies, cookie=cookie),
+                           ua=ua,
+                           proxies=proxies,
+                           timeout=timeout
+                           ).get_res(url=checkin_url)
+        if not res and site_url != checkin_url:
+            logger.info(f"开始站点模拟登录：{site}，地址：{site_url}...")
+            res = RequestUtils(cookies=cookie,
+                               session=get_site_session(url=site_url, ua=ua, proxies=proxies, cookie=cookie),
+                               ua=ua,
+                               proxies=proxies,
+                               timeout=timeout
+                               ).get_res(url=site_url)
+        # 判断登录状态
+        if res and res.status_code in [200, 500, 403]:
+            if not SiteUtils.is_logged_in(res.text):
+                if under_challenge(res.text):
+                    msg = "站点被Cloudflare防护"
+                elif res.status_code == 200:
+                    msg = "Cookie已失效"
+                else:
+                    msg = f"状态码：{res.status_code}"
+                logger.warn(f"{site} 签到失败，{msg}")
+                return False, f"签到失败，{msg}！", True
+            else:
+                logger.info(f"{site} 签到成功")
+                return True, f"签到成功", False
+        elif res is not None:
+            logger.warn(f"{site} 签到失败，状态码：{res.status_code}")
+            return False, f"签到失败，状态码：{res.status_code}！", False
+        else:
+            logger.warn(f"{site} 签到失败，无法打开网站")
+            return False, f"签到失败，无法打开网站！", False
+
     def login_site(self, site_info: CommentedMap) -> Tuple[str, str]:
         """
         模拟登录一个站点
@@ -1649,19 +1766,11 @@ class AutoSignInMod(_PluginBase):
                 state, message = False, f"模拟登录失败：{str(e)}"
         else:
             state, message = self.__login_base(site_info)
-        # 统计
-        seconds = (datetime.now() - start_time).seconds
-        domain = StringUtils.get_url_domain(site_info.get('url'))
-        if state:
-            SiteOper().success(domain=domain, seconds=seconds)
-        else:
-            SiteOper().fail(domain)
-        return site_info.get("name"), message
+        return self.__record_site_result(site_info=site_info, state=state, message=message, start_time=start_time)
 
-    @staticmethod
-    def __login_base(site_info: CommentedMap) -> Tuple[bool, str]:
+    def __login_base(self, site_info: CommentedMap) -> Tuple[bool, str]:
         """
-        模拟登录通用处理
+        模拟登录通用处理，优先使用普通请求，遇到Cloudflare或登录失败时再使用浏览器仿真，并记住站点成功的方式
         :param site_info: 站点信息
         :return: 签到结果信息
         """
@@ -1683,50 +1792,80 @@ class AutoSignInMod(_PluginBase):
             # 访问链接
             site_url = str(site_url).replace("attendance.php", "")
             logger.info(f"开始站点模拟登录：{site}，地址：{site_url}...")
-            render = True
-            if render:
-                page_source = CloakBrowserHelper().get_page_source(url=site_url,
-                                                                 cookies=site_cookie,
-                                                                 ua=ua,
-                                                                 proxies=proxy_server,
-                                                                 timeout=timeout)
-                if not SiteUtils.is_logged_in(page_source):
-                    if under_challenge(page_source):
-                        return False, f"无法通过Cloudflare！"
-                    return False, f"仿真登录失败，Cookie已失效！"
-                else:
-                    return True, "模拟登录成功"
-            else:
-                res = RequestUtils(cookies=site_cookie,
-                                   ua=ua,
-                                   proxies=proxies,
-                                   timeout=timeout
-                                   ).get_res(url=site_url)
-                # 判断登录状态
-                if res and res.status_code in [200, 500, 403]:
-                    if not SiteUtils.is_logged_in(res.text):
-                        if under_challenge(res.text):
-                            msg = "站点被Cloudflare防护，请打开站点浏览器仿真"
-                        elif res.status_code == 200:
-                            msg = "Cookie已失效"
-                        else:
-                            msg = f"状态码：{res.status_code}"
-                        logger.warn(f"{site} 模拟登录失败，{msg}")
-                        return False, f"模拟登录失败，{msg}！"
-                    else:
-                        logger.info(f"{site} 模拟登录成功")
-                        return True, f"模拟登录成功"
-                elif res is not None:
-                    logger.warn(f"{site} 模拟登录失败，状态码：{res.status_code}")
-                    return False, f"模拟登录失败，状态码：{res.status_code}！"
-                else:
-                    logger.warn(f"{site} 模拟登录失败，无法打开网站")
-                    return False, f"模拟登录失败，无法打开网站！"
+            domain = StringUtils.get_url_domain(site_url)
+            # 没有记录时，站点开启了仿真则直接仿真
+            mode = self.__get_site_strategy(domain) or ("render" if render else "http")
+            if mode == "http":
+                state, message, escalate = self.__login_by_http(site=site, site_url=site_url, cookie=site_cookie,
+                                                                ua=ua, proxies=proxies, timeout=timeout)
+                if not escalate:
+                    if state:
+                        self.__set_site_strategy(domain, "http")
+                    return state, message
+                logger.info(f"{site} 普通请求{message}，改用浏览器仿真登录")
+            state, message = self.__login_by_render(site_url=site_url, cookie=site_cookie, ua=ua,
+                                                    proxies=proxy_server, timeout=timeout)
+            if state:
+                self.__set_site_strategy(domain, "render")
+            return state, message
         except Exception as e:
             logger.warn("%s 模拟登录失败：%s" % (site, str(e)))
             traceback.print_exc()
             return False, f"模拟登录失败：{str(e)}！"
 
+    @staticmethod
+    def __login_by_render(site_url: str, cookie: str, ua: str, proxies: Optional[dict],
+                          timeout: int) -> Tuple[bool, str]:
+        """
+        浏览器仿真登录
+        :return: 登录状态，登录结果信息
+        """
+        page_source = CloakBrowserHelper().get_page_source(url=site_url,
+                                                         cookies=cookie,
+                                                         ua=ua,
+                                                         proxies=proxies,
+                                                         timeout=timeout)
+        if not SiteUtils.is_logged_in(page_source):
+            if under_challenge(page_source):
+                return False, f"无法通过Cloudflare！"
+            return False, f"仿真登录失败，Cookie已失效！"
+        else:
+            return True, "模拟登录成功"
+
+    @staticmethod
+    def __login_by_http(site: str, site_url: str, cookie: str, ua: str, proxies: Optional[dict],
+                        timeout: int) -> Tuple[bool, str, bool]:
+        """
+        普通请求登录
+        :return: 登录状态，登录结果信息，是否需要改用浏览器仿真
+        """
+        res = RequestUtils(cookies=cookie,
+                           session=get_site_session(url=site_url, ua=ua, proxies=proxies, cookie=cookie),
+                           ua=ua,
+                           proxies=proxies,
+                           timeout=timeout
+                           ).get_res(url=site_url)
+        # 判断登录状态
+        if res and res.status_code in [200, 500, 403]:
+            if not SiteUtils.is_logged_in(res.text):
+                if under_challenge(res.text):
+                    msg = "站点被Cloudflare防护"
+                elif res.status_code == 200:
+                    msg = "Cookie已失效"
+                else:
+                    msg = f"状态码：{res.status_code}"
+                logger.warn(f"{site} 模拟登录失败，{msg}")
+                return False, f"模拟登录失败，{msg}！", True
+            else:
+                logger.info(f"{site} 模拟登录成功")
+                return True, f"模拟登录成功", False
+        elif res is not None:
+            logger.warn(f"{site} 模拟登录失败，状态码：{res.status_code}")
+            return False, f"模拟登录失败，状态码：{res.status_code}！", False
+        else:
+            logger.warn(f"{site} 模拟登录失败，无法打开网站")
+            return False, f"模拟登录失败，无法打开网站！", False
+
     def stop_service(self):
         """
         退出插件
@@ -1737,6 +1876,8 @@ class AutoSignInMod(_PluginBase):
                 if self._scheduler.running:
                     self._scheduler.shutdown()
                 self._scheduler = None
+            # 关闭浏览器池
+            shutdown_browser_pool()
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e))
 
@@ -1761,6 +1902,10 @@ class AutoSignInMod(_PluginBase):
             "retry_keyword": self._retry_keyword,
             "auto_cf": self._auto_cf,
             "clean": self._clean,
+            "browser_pool_size": self._browser_pool_size,
+            "browser_max_pages": self._browser_max_pages,
+            "browser_idle_timeout": self._browser_idle_timeout,
+            "strategy_days": self._strategy_days,
             "all_sites": site_options
         }
 
@@ -3,24 +3,257 @@ CloakBrowser 辅助类 - 用于绕过反机器人检测
 完全兼容 Playwright API，只需修改导入语句即可使用
 GitHub: https://github.com/CloakHQ/CloakBrowser
 """
-from typing import Optional, Callable, Any
-import uuid
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Optional, Callable, Any, Set
+from urllib.parse import urlparse
 
-from app.core.config import settings
 from app.log import logger
 
 
+class BrowserLaunchError(Exception):
+    """
+    浏览器启动失败
+    """
+    pass
+
+
+class CloakBrowserPool:
+    """
+    CloakBrowser 浏览器池
+    Playwright 同步接口的对象只能在创建它的线程中使用，因此每个浏览器由一个工作线程独占，
+    任务通过队列分发给空闲的工作线程；每个任务使用独立的浏览器上下文，站点之间的 Cookie/UA 互不影响。
+    浏览器打开指定数量的页面后重新启动，空闲超时后关闭。
+    """
+
+    def __init__(self, launcher: Callable[..., Any], size: int = 2, max_pages: int = 50,
+                 idle_timeout: int = 300, headless: bool = False):
+        """
+        :param launcher: 浏览器启动方法
+        :param size: 最大浏览器数量
+        :param max_pages: 单个浏览器打开多少个页面后重新启动
+        :param idle_timeout: 浏览器空闲多少秒后关闭
+        :param headless: 是否无头模式
+        """
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self.idle_timeout = max(1, int(idle_timeout))
+        self.headless = headless
+        self._launcher = launcher
+        self._jobs: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: Set[threading.Thread] = set()
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, func: Callable[[Any], Any]) -> Future:
+        """
+        提交任务，任务在持有浏览器的工作线程中执行
+        :param func: 任务方法，接收浏览器对象
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("浏览器池已关闭")
+            self._jobs.put((func, future))
+            # 排队任务多于空闲浏览器时启动新的浏览器
+            if self._jobs.qsize() > self._idle and len(self._workers) < self.size:
+                worker = threading.Thread(target=self.__worker, name=f"CloakBrowser-{len(self._workers) + 1}",
+                                          daemon=True)
+                self._workers.add(worker)
+                worker.start()
+        return future
+
+    def action(self, url: str, callback: Callable, cookies: Optional[str] = None, ua: Optional[str] = None,
+               proxies: Optional[dict] = None, timeout: int = 60) -> Any:
+        """
+        在独立的浏览器上下文中打开页面并执行回调
+        """
+
+        def job(browser):
+            context = self.__new_context(browser=browser, ua=ua, proxies=proxies)
+            try:
+                if cookies:
+                    cookie_list = CloakBrowserHelper._parse_cookies(cookies, url)
+                    if cookie_list:
+                        context.add_cookies(cookie_list)
+                page = context.new_page()
+                page.goto(url, timeout=timeout * 1000, wait_until="networkidle")
+                page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+                return callback(page)
+            finally:
+                try:
+                    context.close()
+                except Exception as err:
+                    logger.debug(f"关闭浏览器上下文失败：{str(err)}")
+
+        return self.submit(job).result()
+
+    def get_page_source(self, url: str, cookies: Optional[str] = None, ua: Optional[str] = None,
+                        proxies: Optional[dict] = None, timeout: int = 60) -> Optional[str]:
+        """
+        获取页面源码
+        """
+        return self.action(url=url, callback=lambda page: page.content(), cookies=cookies, ua=ua,
+                           proxies=proxies, timeout=timeout)
+
+    def shutdown(self):
+        """
+        关闭浏览器池，已提交的任务执行完后工作线程退出
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._workers:
+                self._jobs.put(None)
+
+    @staticmethod
+    def __new_context(browser: Any, ua: Optional[str], proxies: Optional[dict]) -> Any:
+        """
+        创建浏览器上下文，设置 UA 和代理
+        """
+        options = {}
+        if ua:
+            options["user_agent"] = ua
+        if proxies:
+            try:
+                return browser.new_context(proxy=proxies, **options)
+            except Exception as err:
+                logger.warning(f"浏览器上下文设置代理失败，不使用代理：{str(err)}")
+        return browser.new_context(**options)
+
+    def __worker(self):
+        """
+        工作线程，独占一个浏览器并依次执行任务
+        """
+        browser = None
+        pages = 0
+        try:
+            while True:
+                with self._lock:
+                    self._idle += 1
+                try:
+                    job = self._jobs.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    job = False
+                finally:
+                    with self._lock:
+                        self._idle -= 1
+                if job is False:
+                    # 空闲超时，没有待执行的任务时退出并关闭浏览器
+                    with self._lock:
+                        if self._jobs.empty():
+                            self._workers.discard(threading.current_thread())
+                            logger.debug(f"浏览器空闲超过 {self.idle_timeout} 秒，已关闭")
+                            return
+                    continue
+                if job is None:
+                    return
+                func, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None:
+                        logger.debug(f"启动 CloakBrowser，当前浏览器数量：{len(self._workers)}")
+                        try:
+                            browser = self._launcher(headless=self.headless, humanize=True)
+                        except Exception as err:
+                            raise BrowserLaunchError(str(err)) from err
+                        pages = 0
+                    future.set_result(func(browser))
+                except BaseException as err:
+                    future.set_exception(err)
+                    # 浏览器已断开时下次任务重新启动
+                    if browser is not None and not self.__is_connected(browser):
+                        self.__close_browser(browser)
+                        browser = None
+                pages += 1
+                if browser is not None and pages >= self.max_pages:
+                    logger.debug(f"浏览器已打开 {pages} 个页面，重新启动")
+                    self.__close_browser(browser)
+                    browser = None
+        finally:
+            if browser is not None:
+                self.__close_browser(browser)
+            with self._lock:
+                self._workers.discard(threading.current_thread())
+
+    @staticmethod
+    def __is_connected(browser: Any) -> bool:
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def __close_browser(browser: Any):
+        try:
+            browser.close()
+        except Exception as err:
+            logger.debug(f"关闭浏览器失败：{str(err)}")
+
+
+# 全局浏览器池，所有站点共用
+_pool: Optional[CloakBrowserPool] = None
+_pool_lock = threading.Lock()
+_pool_config = {
+    "size": 2,
+    "max_pages": 50,
+    "idle_timeout": 300,
+}
+
+
+def configure_browser_pool(size: Optional[int] = None, max_pages: Optional[int] = None,
+                           idle_timeout: Optional[int] = None):
+    """
+    配置浏览器池，配置变化时关闭现有浏览器池，下次使用时按新配置创建
+    """
+    global _pool
+    config = {
+        "size": int(size or _pool_config["size"]),
+        "max_pages": int(max_pages or _pool_config["max_pages"]),
+        "idle_timeout": int(idle_timeout or _pool_config["idle_timeout"]),
+    }
+    with _pool_lock:
+        if config == _pool_config:
+            return
+        _pool_config.update(config)
+        if _pool:
+            _pool.shutdown()
+            _pool = None
+
+
+def get_browser_pool() -> CloakBrowserPool:
+    """
+    获取浏览器池，未安装 cloakbrowser 时抛出 ImportError
+    """
+    global _pool
+    from cloakbrowser import launch
+    with _pool_lock:
+        if not _pool:
+            _pool = CloakBrowserPool(launcher=launch, **_pool_config)
+        return _pool
+
+
+def shutdown_browser_pool():
+    """
+    关闭浏览器池
+    """
+    global _pool
+    with _pool_lock:
+        if _pool:
+            _pool.shutdown()
+            _pool = None
+
+
 class CloakBrowserHelper:
     """
     CloakBrowser 辅助类
-    提供与 PlaywrightHelper 兼容的接口，但使用 CloakBrowser 实现
+    提供与 PlaywrightHelper 兼容的接口，但使用 CloakBrowser 实现，浏览器由全局浏览器池复用
     """
-    
-    def __init__(self):
-        self._browser = None
-        self._context = None
-        self._page = None
-    
+
     def get_page_source(self, url: str,
                         cookies: Optional[str] = None,
                         ua: Optional[str] = None,
@@ -33,78 +266,30 @@ class CloakBrowserHelper:
         :param cookies: cookies
         :param ua: user-agent
         :param proxies: 代理
-        :param headless: 是否无头模式
+        :param headless: 是否无头模式，仅在回退到 Playwright 时生效，浏览器池使用统一配置
         :param timeout: 超时时间
         :return: 页面源码
         """
-        source = None
-        
         try:
-            # 尝试导入 cloakbrowser
-            from cloakbrowser import launch
-            
-            logger.debug(f"使用 CloakBrowser 访问: {url}")
-            
-            # 启动浏览器（默认启用 humanize 以模拟真人行为）
-            browser = launch(
-                headless=headless,
-                humanize=True  # 启用人类行为模拟
-            )
-            
-            try:
-                # 创建新页面
-                page = browser.new_page()
-                
-                try:
-                    # 设置 User-Agent
-                    if ua:
-                        page.set_extra_http_headers({"user-agent": ua})
-                    
-                    # 设置 Cookies
-                    if cookies:
-                        # 解析 cookie 字符串并设置
-                        cookie_list = self._parse_cookies(cookies, url)
-                        if cookie_list:
-                            context = page.context
-                            context.add_cookies(cookie_list)
-                    
-                    # 访问页面
-                    page.goto(url, timeout=timeout * 1000, wait_until="networkidle")
-                    
-                    # 等待页面加载完成
-                    page.wait_for_load_state("networkidle", timeout=timeout * 1000)
-                    
-                    # 获取页面源码
-                    source = page.content()
-                    logger.debug(f"成功获取页面源码，长度: {len(source)}")
-                    
-                except Exception as e:
-                    logger.error(f"CloakBrowser 页面操作失败: {str(e)}")
-                finally:
-                    # 关闭页面
-                    try:
-                        page.close()
-                    except:
-                        pass
-                        
-            finally:
-                # 关闭浏览器
-                try:
-                    browser.close()
-                except:
-                    pass
-                    
+            pool = get_browser_pool()
         except ImportError:
             logger.warning("未安装 cloakbrowser，回退到 Playwright")
             # 如果未安装 cloakbrowser，回退到 Playwright
             return self._fallback_to_playwright(url, cookies, ua, proxies, headless, timeout)
-        except Exception as e:
+
+        try:
+            logger.debug(f"使用 CloakBrowser 访问: {url}")
+            source = pool.get_page_source(url=url, cookies=cookies, ua=ua, proxies=proxies, timeout=timeout)
+            logger.debug(f"成功获取页面源码，长度: {len(source or '')}")
+            return source
+        except BrowserLaunchError as e:
             logger.error(f"CloakBrowser 初始化失败: {str(e)}")
             # 出错时回退到 Playwright
             return self._fallback_to_playwright(url, cookies, ua, proxies, headless, timeout)
-        
-        return source
-    
+        except Exception as e:
+            logger.error(f"CloakBrowser 页面操作失败: {str(e)}")
+            return None
+
     def action(self, url: str,
                callback: Callable,
                cookies: Optional[str] = None,
@@ -115,75 +300,32 @@ class CloakBrowserHelper:
         """
         访问网页，接收Page对象并执行操作
         :param url: 网页地址
-        :param callback: 回调函数，需要接收page对象
+        :param callback: 回调函数，需要接收page对象，在浏览器线程中执行
         :param cookies: cookies
         :param ua: user-agent
         :param proxies: 代理
-        :param headless: 是否无头模式
+        :param headless: 是否无头模式，浏览器池使用统一配置
         :param timeout: 超时时间
         :return: 回调函数的返回值
         """
-        result = None
-        
         try:
-            # 尝试导入 cloakbrowser
-            from cloakbrowser import launch
-            
-            logger.debug(f"使用 CloakBrowser 执行操作: {url}")
-            
-            # 启动浏览器
-            browser = launch(
-                headless=headless,
-                humanize=True
-            )
-            
-            try:
-                # 创建新页面
-                page = browser.new_page()
-                
-                try:
-                    # 设置 User-Agent
-                    if ua:
-                        page.set_extra_http_headers({"user-agent": ua})
-                    
-                    # 设置 Cookies
-                    if cookies:
-                        cookie_list = self._parse_cookies(cookies, url)
-                        if cookie_list:
-                            context = page.context
-                            context.add_cookies(cookie_list)
-                    
-                    # 访问页面
-                    page.goto(url, timeout=timeout * 1000, wait_until="networkidle")
-                    page.wait_for_load_state("networkidle", timeout=timeout * 1000)
-                    
-                    # 执行回调函数
-                    result = callback(page)
-                    
-                except Exception as e:
-                    logger.error(f"CloakBrowser action 操作失败: {str(e)}")
-                finally:
-                    try:
-                        page.close()
-                    except:
-                        pass
-                        
-            finally:
-                try:
-                    browser.close()
-                except:
-                    pass
-                    
+            pool = get_browser_pool()
         except ImportError:
             logger.warning("未安装 cloakbrowser，回退到 Playwright")
             # 回退逻辑需要在外部处理
             raise ImportError("cloakbrowser not available")
-        except Exception as e:
+
+        try:
+            logger.debug(f"使用 CloakBrowser 执行操作: {url}")
+            return pool.action(url=url, callback=callback, cookies=cookies, ua=ua, proxies=proxies,
+                               timeout=timeout)
+        except BrowserLaunchError as e:
             logger.error(f"CloakBrowser action 初始化失败: {str(e)}")
             raise
-        
-        return result
-    
+        except Exception as e:
+            logger.error(f"CloakBrowser action 操作失败: {str(e)}")
+            return None
+
     @staticmethod
     def _parse_cookies(cookie_str: str, url: str) -> list:
         """
@@ -195,13 +337,12 @@ class CloakBrowserHelper:
         cookies = []
         if not cookie_str:
             return cookies
-        
+
         try:
             # 从 URL 提取域名
-            from urllib.parse import urlparse
             parsed = urlparse(url)
             domain = parsed.netloc
-            
+
             # 解析 cookie 字符串 (name=value; name2=value2)
             for item in cookie_str.split(';'):
                 item = item.strip()
@@ -215,16 +356,16 @@ class CloakBrowserHelper:
                     })
         except Exception as e:
             logger.error(f"解析 cookies 失败: {str(e)}")
-        
+
         return cookies
-    
+
     @staticmethod
     def _fallback_to_playwright(url: str,
-                                 cookies: Optional[str],
-                                 ua: Optional[str],
-                                 proxies: Optional[dict],
-                                 headless: Optional[bool],
-                                 timeout: Optional[int]) -> Optional[str]:
+                                cookies: Optional[str],
+                                ua: Optional[str],
+                                proxies: Optional[dict],
+                                headless: Optional[bool],
+                                timeout: Optional[int]) -> Optional[str]:
         """
         回退到 Playwright 实现
         """
@@ -0,0 +1,71 @@
+"""
+站点签到类索引
+加载站点模块时按 site_url 建立 域名 -> 签到类 的索引，匹配站点时直接查表，
+只有自定义了匹配逻辑（custom_match）的签到类才逐个调用 match，匹配结果按站点地址缓存
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from app.log import logger
+
+
+class SiteHandlerIndex:
+    """
+    站点签到类索引
+    """
+
+    def __init__(self, handlers: Iterable[type] = ()):
+        """
+        :param handlers: ModuleHelper.load 加载的签到类，顺序即匹配优先级
+        """
+        self._index: Dict[str, type] = {}
+        self._custom: List[type] = []
+        self._cache: Dict[str, Optional[type]] = {}
+        self._lock = threading.Lock()
+        for handler in handlers:
+            key = self.url_key(getattr(handler, "site_url", None))
+            if getattr(handler, "custom_match", False) or not key:
+                self._custom.append(handler)
+            elif key in self._index:
+                logger.warn(f"站点签到类 {handler.__name__} 与 {self._index[key].__name__} 的站点地址重复：{key}")
+            else:
+                self._index[key] = handler
+
+    def __len__(self):
+        return len(self._index) + len(self._custom)
+
+    @staticmethod
+    def url_key(url: Optional[str]) -> str:
+        """
+        计算站点地址的索引键，与 StringUtils.url_equal 的比较规则一致
+        """
+        if not url:
+            return ""
+        url = str(url)
+        if url.startswith("http"):
+            url = urlparse(url).netloc
+        return url.replace("www.", "")
+
+    def resolve(self, url: Optional[str]) -> Optional[type]:
+        """
+        获取站点地址对应的签到类，没有时返回None
+        :param url: 站点地址
+        """
+        if not url:
+            return None
+        with self._lock:
+            if url in self._cache:
+                return self._cache[url]
+        handler = self._index.get(self.url_key(url))
+        if handler is None:
+            for custom_handler in self._custom:
+                try:
+                    if custom_handler.match(url):
+                        handler = custom_handler
+                        break
+                except Exception as e:
+                    logger.error("站点模块加载失败：%s" % str(e))
+        with self._lock:
+            self._cache[url] = handler
+        return handler
@@ -0,0 +1,123 @@
+"""
+站点 HTTP 会话池
+同一次签到/登录任务中，按 站点域名 + 代理 + UA 复用 requests.Session，
+多步骤签到（验证码、答题等）可以复用连接，避免每个请求重新握手
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.cookies import cookiejar_from_dict
+
+from app.log import logger
+from app.utils.http import RequestUtils
+from app.utils.string import StringUtils
+
+
+class SiteSessionPool:
+    """
+    站点会话池，键为 (站点域名, 代理, UA)
+    """
+
+    def __init__(self, pool_maxsize: int = 4):
+        """
+        :param pool_maxsize: 每个主机的最大连接数，超出时等待空闲连接
+        """
+        self.pool_maxsize = max(1, int(pool_maxsize))
+        self._sessions: Dict[Tuple[str, tuple, str], Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, ua: Optional[str] = None, proxies: Optional[dict] = None,
+            cookie: Optional[str] = None) -> Optional[Session]:
+        """
+        获取站点会话，首次创建时使用站点Cookie初始化
+        :param url: 请求地址
+        :param ua: user-agent
+        :param proxies: 代理
+        :param cookie: 站点Cookie
+        """
+        domain = StringUtils.get_url_domain(url)
+        if not domain:
+            return None
+        key = (domain, tuple(sorted((proxies or {}).items())), ua or "")
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self.__new_session(domain=domain, cookie=cookie)
+                self._sessions[key] = session
+            return session
+
+    def close(self):
+        """
+        关闭所有会话
+        """
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as err:
+                logger.debug(f"关闭站点会话失败：{str(err)}")
+        if sessions:
+            logger.debug(f"已关闭 {len(sessions)} 个站点会话")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def __new_session(self, domain: str, cookie: Optional[str]) -> Session:
+        """
+        创建会话，限制每个主机的连接数并保持长连接
+        """
+        session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if cookie:
+            cookies = RequestUtils.cookie_parse(cookie)
+            if cookies:
+                session.cookies = cookiejar_from_dict(cookies)
+        return session
+
+
+# 当前任务使用的会话池，签到和登录任务可能同时执行，按引用计数在最后一个任务结束时关闭
+_pool: Optional[SiteSessionPool] = None
+_pool_refs = 0
+_pool_lock = threading.Lock()
+
+
+def open_session_pool(pool_maxsize: int = 4) -> SiteSessionPool:
+    """
+    开始任务时打开会话池
+    """
+    global _pool, _pool_refs
+    with _pool_lock:
+        if _pool is None:
+            _pool = SiteSessionPool(pool_maxsize=pool_maxsize)
+        _pool_refs += 1
+        return _pool
+
+
+def close_session_pool():
+    """
+    任务结束时关闭会话池
+    """
+    global _pool, _pool_refs
+    with _pool_lock:
+        _pool_refs = max(0, _pool_refs - 1)
+        if _pool_refs or _pool is None:
+            return
+        pool, _pool = _pool, None
+    pool.close()
+
+
+def get_site_session(url: str, ua: Optional[str] = None, proxies: Optional[dict] = None,
+                     cookie: Optional[str] = None) -> Optional[Session]:
+    """
+    获取站点会话，没有执行中的任务时返回None，由 RequestUtils 自行创建请求
+    """
+    pool = _pool
+    if pool is None:
+        return None
+    return pool.get(url=url, ua=ua, proxies=proxies, cookie=cookie)
@@ -4,7 +4,7 @@ from typing import Tuple
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 from lxml import etree
@@ -126,6 +126,7 @@ class Pt52(_ISiteSigninHandler):
         logger.debug(f"签到请求参数 {data}")
 
         sign_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                 ua=ua,
                                 proxies=settings.PROXY if proxy else None,
                                 timeout=timeout
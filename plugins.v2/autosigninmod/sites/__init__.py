@@ -1,20 +1,15 @@
 # -*- coding: utf-8 -*-
 import re
 from abc import ABCMeta, abstractmethod
-from typing import Tuple
+from typing import Optional, Tuple
 
 import chardet
+from requests import Session
 from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
-import sys
-import os
-# 添加插件目录到 Python 路径，以便导入 cloak_helper
-plugin_dir = os.path.dirname(os.path.abspath(__file__))
-if plugin_dir not in sys.path:
-    sys.path.insert(0, os.path.dirname(plugin_dir))
-
-from app.plugins.autosignin.cloak_helper import CloakBrowserHelper
+from app.plugins.autosigninmod.cloak_helper import CloakBrowserHelper
+from app.plugins.autosigninmod.session_pool import get_site_session
 from app.log import logger
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
@@ -27,6 +22,8 @@ class _ISiteSigninHandler(metaclass=ABCMeta):
     """
     # 匹配的站点Url，每一个实现类都需要设置为自己的站点Url
     site_url = ""
+    # 是否自定义了match匹配逻辑，否则按site_url建立索引直接匹配，不再调用match
+    custom_match = False
 
     @abstractmethod
     def match(self, url: str) -> bool:
@@ -80,6 +77,8 @@ class _ISiteSigninHandler(metaclass=ABCMeta):
                     "Cookie": cookie
                 }
             res = RequestUtils(headers=headers,
+                               session=get_site_session(url=url, ua=ua, proxies=settings.PROXY if proxy else None,
+                                                        cookie=cookie),
                                proxies=settings.PROXY if proxy else None,
                                timeout=timeout or 20).get_res(url=url)
             if res is not None:
@@ -98,6 +97,19 @@ class _ISiteSigninHandler(metaclass=ABCMeta):
                     return res.text
             return ""
 
+    def get_session(self, cookie: str = None, ua: str = None, proxy: bool = False) -> Optional[Session]:
+        """
+        获取当前站点复用的会话，同一次任务中按 站点域名 + 代理 + UA 共享连接和Cookie
+        :param cookie: Cookie，首次创建会话时写入
+        :param ua: UA
+        :param proxy: 是否使用代理
+        :return: 不在签到任务中执行时返回None
+        """
+        return get_site_session(url=f"https://{self.site_url}",
+                                ua=ua,
+                                proxies=settings.PROXY if proxy else None,
+                                cookie=cookie)
+
     @staticmethod
     def sign_in_result(html_res: str, regexs: list) -> bool:
         """
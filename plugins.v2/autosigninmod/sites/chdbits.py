@@ -7,7 +7,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -126,6 +126,7 @@ class CHDBits(_ISiteSigninHandler):
         logger.debug(f"签到请求参数 {data}")
 
         sign_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                 ua=ua,
                                 proxies=settings.PROXY if proxy else None
                                 ).post_res(url='https://ptchdbits.co/bakatest.php', data=data)
@@ -4,7 +4,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -47,6 +47,7 @@ class HDArea(_ISiteSigninHandler):
             'action': 'sign_in'
         }
         html_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=site_info.get("proxy")),
                                 ua=ua,
                                 proxies=proxies,
                                 timeout=timeout
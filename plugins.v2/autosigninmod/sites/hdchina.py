@@ -6,7 +6,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -59,6 +59,7 @@ class HDChina(_ISiteSigninHandler):
         site_cookie = cookie
         # 获取页面html
         html_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=site_info.get("proxy")),
                                 ua=ua,
                                 proxies=proxies,
                                 timeout=timeout
@@ -100,6 +101,7 @@ class HDChina(_ISiteSigninHandler):
             'csrf': x_csrf
         }
         sign_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=site_info.get("proxy")),
                                 ua=ua,
                                 proxies=proxies,
                                 timeout=timeout
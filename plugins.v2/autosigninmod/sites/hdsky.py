@@ -7,7 +7,7 @@ from ruamel.yaml import CommentedMap
 from app.core.config import settings
 from app.helper.ocr import OcrHelper
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -71,6 +71,7 @@ class HDSky(_ISiteSigninHandler):
         img_hash = None
         while not img_hash and res_times <= 3:
             image_res = RequestUtils(cookies=site_cookie,
+                                     session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                      ua=ua,
                                      content_type='application/x-www-form-urlencoded; charset=UTF-8',
                                      referer="https://hdsky.me/index.php",
@@ -120,6 +121,7 @@ class HDSky(_ISiteSigninHandler):
                 }
                 # 访问签到链接
                 res = RequestUtils(cookies=site_cookie,
+                                   session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                    ua=ua,
                                    referer=referer,
                                    proxies=settings.PROXY if proxy else None
@@ -4,7 +4,7 @@ from typing import Tuple
 from ruamel.yaml import CommentedMap
 
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.string import StringUtils
 
 
@@ -3,7 +3,7 @@ from typing import Tuple
 from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -14,6 +14,8 @@ class MTorrent(_ISiteSigninHandler):
     """
     # 匹配的站点Url，每一个实现类都需要设置为自己的站点Url
     site_url = "m-team"
+    # 非标准域名匹配
+    custom_match = True
 
     @classmethod
     def match(cls, url: str) -> bool:
@@ -8,7 +8,7 @@ from ruamel.yaml import CommentedMap
 from app.core.config import settings
 from app.helper.ocr import OcrHelper
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -116,6 +116,7 @@ class Opencd(_ISiteSigninHandler):
             }
             # 访问签到链接
             sign_res = RequestUtils(cookies=site_cookie,
+                                    session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                     ua=ua,
                                     proxies=settings.PROXY if proxy else None
                                     ).post_res(url='https://www.open.cd/plugin_sign-in.php?cmd=signin', data=data)
@@ -10,7 +10,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -101,6 +101,7 @@ class Tjupt(_ISiteSigninHandler):
         logger.info(f"获取到签到图片 {img_url}")
         # 获取签到图片hash
         captcha_img_res = RequestUtils(cookies=site_cookie,
+                                       session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                        ua=ua,
                                        proxies=settings.PROXY if proxy else None
                                        ).get_res(url=img_url)
@@ -205,6 +206,7 @@ class Tjupt(_ISiteSigninHandler):
         }
         logger.debug(f"提交data {data}")
         sign_in_res = RequestUtils(cookies=site_cookie,
+                                   session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                    ua=ua,
                                    proxies=settings.PROXY if proxy else None
                                    ).post_res(url=self._sign_in_url, data=data)
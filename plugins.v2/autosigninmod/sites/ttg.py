@@ -5,7 +5,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -79,6 +79,7 @@ class TTG(_ISiteSigninHandler):
         }
         # 签到
         sign_res = RequestUtils(cookies=site_cookie,
+                                session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                 ua=ua,
                                 proxies=settings.PROXY if proxy else None
                                 ).post_res(url="https://totheglory.im/signed.php",
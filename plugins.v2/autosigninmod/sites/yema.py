@@ -4,7 +4,7 @@ from urllib.parse import urljoin
 from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 
 
@@ -14,6 +14,8 @@ class YemaPT(_ISiteSigninHandler):
     """
     # 匹配的站点Url，每一个实现类都需要设置为自己的站点Url
     site_url = "yemapt.org"
+    # 非标准域名匹配
+    custom_match = True
 
     @classmethod
     def match(cls, url: str) -> bool:
@@ -37,6 +39,8 @@ class YemaPT(_ISiteSigninHandler):
         }
         # 获取用户信息，更新最后访问时间
         res = (RequestUtils(headers=headers,
+                            session=self.get_session(cookie=site_info.get("cookie"), ua=site_info.get("ua"),
+                                                    proxy=site_info.get("proxy")),
                             timeout=site_info.get("timeout"),
                             cookies=site_info.get("cookie"),
                             proxies=settings.PROXY if site_info.get("proxy") else None,
@@ -64,6 +68,8 @@ class YemaPT(_ISiteSigninHandler):
         }
         # 获取用户信息，更新最后访问时间
         res = (RequestUtils(headers=headers,
+                            session=self.get_session(cookie=site_info.get("cookie"), ua=site_info.get("ua"),
+                                                    proxy=site_info.get("proxy")),
                             timeout=site_info.get("timeout"),
                             cookies=site_info.get("cookie"),
                             proxies=settings.PROXY if site_info.get("proxy") else None,
@@ -6,7 +6,7 @@ from ruamel.yaml import CommentedMap
 
 from app.core.config import settings
 from app.log import logger
-from app.plugins.autosignin.sites import _ISiteSigninHandler
+from app.plugins.autosigninmod.sites import _ISiteSigninHandler
 from app.utils.http import RequestUtils
 from app.utils.string import StringUtils
 
@@ -74,6 +74,7 @@ class ZhuQue(_ISiteSigninHandler):
                 "User-Agent": ua
             }
             skill_res = RequestUtils(cookies=site_cookie,
+                                     session=self.get_session(cookie=site_cookie, ua=ua, proxy=proxy),
                                      headers=headers,
                                      proxies=settings.PROXY if proxy else None,
                                      timeout=timeout
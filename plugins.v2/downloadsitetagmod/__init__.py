@@ -1,21 +1,26 @@
 import datetime
 import threading
+import time
 from typing import List, Tuple, Dict, Any, Optional
 
 import pytz
 from app.helper.sites import SitesHelper
+from qbittorrentapi import TorrentDictionary
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.core.config import settings
 from app.core.context import Context
 from app.core.event import eventmanager, Event
+from app.db import ScopedSession
 from app.db.downloadhistory_oper import DownloadHistoryOper
 from app.db.models.downloadhistory import DownloadHistory
 from app.modules.themoviedb import CategoryHelper
 from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.plugins import _PluginBase
+from app.plugins.downloadsitetagmod.downloader_runner import DownloaderRunner
+from app.plugins.downloadsitetagmod.tracker_helper import TrackerSiteResolver
 from app.schemas import ServiceInfo
 from app.schemas.types import EventType, MediaType
 from app.utils.string import StringUtils
@@ -29,7 +34,7 @@ class DownloadSiteTagMod(_PluginBase):
     # 插件图标
     plugin_icon = "Youtube-dl_B.png"
     # 插件版本
-    plugin_version = "2.3.2.1"
+    plugin_version = "2.3.7.6"
     # 插件作者
     plugin_author = "叮叮当,Seed680"
     # 作者主页
@@ -45,6 +50,12 @@ class DownloadSiteTagMod(_PluginBase):
 
     # 退出事件
     _event = threading.Event()
+    # 下载器任务执行器, 并发执行各下载器并记录耗时
+    _runner = DownloaderRunner(log_tag=LOG_TAG, stop_event=_event, thread_name_prefix="DownloadSiteTagMod")
+    # 批量查询下载历史时每批的hash数量
+    _history_chunk_size = 500
+    # 最近一次批量查询下载历史的统计
+    _history_lookup_stats = {}
     # 私有属性
     downloadhistory_oper = None
     sites_helper = None
@@ -60,12 +71,37 @@ class DownloadSiteTagMod(_PluginBase):
     _enabled_media_tag = False
     _enabled_tag = True
     _enabled_category = False
+    _enabled_incremental = False
     _category_movie = None
     _category_tv = None
     _category_anime = None
     _downloaders = None
+    # 批量设置标签与分类时每次调用下载器接口的种子数量
+    _batch_size = 100
+    # 并发扫描的下载器数量
+    _scan_workers = 4
+    # 单个下载器扫描超时时间(秒)
+    _scan_timeout = 1800
     _all_cat = []
     _cat_rename_dict = {}
+    # 增量扫描: 各下载器上次 sync_maindata 返回的 rid
+    _sync_rid = {}
+    # 增量扫描: 已处理种子的历史, 跨次运行保留, 供后续新增的辅种使用
+    _sync_dispose_history = {}
+    # 增量扫描关注的种子字段, 其他字段(进度、速度等)变化不触发重新分析
+    _sync_fields = {"added_on", "name", "size", "tags", "category", "tracker"}
+    # 增量扫描: 各下载器上次运行中由插件自身设置了标签或分类的种子hash, 下次增量扫描时忽略这些字段的变化
+    _sync_self_updated: Dict[str, set] = {}
+    # 插件自身会修改的种子字段
+    _sync_self_fields = {"tags", "category"}
+    # tracker域名映射
+    _tracker_mappings = {
+        "chdbits.xyz": "ptchdbits.co",
+        "agsvpt.trackers.work": "agsvpt.com",
+        "tracker.cinefiles.info": "audiences.me",
+    }
+    # tracker -> 站点 解析器, 站点变更后重建
+    _tracker_resolver: Optional[TrackerSiteResolver] = None
 
     def init_plugin(self, config: dict = None):
         self.downloadhistory_oper = DownloadHistoryOper()
@@ -73,6 +109,11 @@ class DownloadSiteTagMod(_PluginBase):
         self.sites_helper = SitesHelper()
         self.category_helper = CategoryHelper()
         self._all_cat = [*self.category_helper.tv_categorys, *self.category_helper.movie_categorys]
+        # 重置增量扫描状态
+        self._sync_rid = {}
+        self._sync_dispose_history = {}
+        self._sync_self_updated = {}
+        self._tracker_resolver = None
         # 读取配置
         logger.debug(f"读取配置")
         if config:
@@ -81,10 +122,14 @@ class DownloadSiteTagMod(_PluginBase):
             self._interval = config.get("interval") or "计划任务"
             self._interval_cron = config.get("interval_cron") or "5 4 * * *"
             self._interval_time = self.str_to_number(config.get("interval_time"), 6)
+            self._batch_size = max(self.str_to_number(config.get("batch_size") or 100, 100), 1)
+            self._scan_workers = max(self.str_to_number(config.get("scan_workers") or 4, 4), 1)
+            self._scan_timeout = max(self.str_to_number(config.get("scan_timeout") or 1800, 1800), 60)
             self._interval_unit = config.get("interval_unit") or "小时"
             self._enabled_media_tag = config.get("enabled_media_tag")
             self._enabled_tag = config.get("enabled_tag")
             self._enabled_category = config.get("enabled_category")
+            self._enabled_incremental = config.get("enabled_incremental")
             self._category_movie = config.get("category_movie") or "电影"
             self._category_tv = config.get("category_tv") or "电视"
             self._category_anime = config.get("category_anime") or "动漫"
@@ -106,7 +151,8 @@ class DownloadSiteTagMod(_PluginBase):
             # 添加 补全下载历史的标签与分类 任务
             self._scheduler.add_job(func=self._complemented_history, trigger='date',
                                     run_date=datetime.datetime.now(
-                                        tz=pytz.timezone(settings.TZ)) + datetime.timedelta(seconds=3)
+                                        tz=pytz.timezone(settings.TZ)) + datetime.timedelta(seconds=3),
+                                    kwargs={"full_scan": True}
                                     )
 
             if self._scheduler and self._scheduler.get_jobs():
@@ -149,7 +195,15 @@ class DownloadSiteTagMod(_PluginBase):
         pass
 
     def get_api(self) -> List[Dict[str, Any]]:
-        pass
+        return [
+            {
+                "path": "/scan_stats",
+                "endpoint": self._get_scan_stats,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "获取各下载器最近一次执行耗时"
+            }
+        ]
 
     def get_service(self) -> List[Dict[str, Any]]:
         """
@@ -205,143 +259,315 @@ class DownloadSiteTagMod(_PluginBase):
         except ValueError:
             return i
 
-    def _complemented_history(self):
+    def _complemented_history(self, full_scan: bool = False):
         """
         补全下载历史的标签与分类
+        :param full_scan: 强制全量扫描, 忽略增量扫描设置
         """
         if not self.service_infos:
             return
         logger.info(f"{self.LOG_TAG}开始执行 ...")
         # 记录处理的种子, 供辅种(无下载历史)使用
-        dispose_history = {}
+        dispose_history = self._sync_dispose_history if self._enabled_incremental else {}
         # 所有站点索引
         indexers = [indexer.get("name") for indexer in self.sites_helper.get_indexers()]
         # JackettIndexers索引器支持多个站点, 如果不存在历史记录, 则通过tracker会再次附加其他站点名称
         indexers.append("JackettIndexers")
         indexers = set(indexers)
-        tracker_mappings = {
-            "chdbits.xyz": "ptchdbits.co",
-            "agsvpt.trackers.work": "agsvpt.com",
-            "tracker.cinefiles.info": "audiences.me",
-        }
-        for service in self.service_infos.values():
-            downloader = service.name
-            downloader_obj = service.instance
-            logger.info(f"{self.LOG_TAG}开始扫描下载器 {downloader} ...")
-            if not downloader_obj:
-                logger.error(f"{self.LOG_TAG} 获取下载器失败 {downloader}")
-                continue
-            # 获取下载器中的种子
-            torrents, error = downloader_obj.get_torrents()
-            # 如果下载器获取种子发生错误 或 没有种子 则跳过
-            if error or not torrents:
-                continue
-            logger.info(f"{self.LOG_TAG}按时间重新排序 {downloader} 种子数：{len(torrents)}")
-            # 按添加时间进行排序, 时间靠前的按大小和名称加入处理历史, 判定为原始种子, 其他为辅种
-            torrents = self._torrents_sort(torrents=torrents, dl_type=service.type)
-            logger.info(f"{self.LOG_TAG}下载器 {downloader} 分析种子信息中 ...")
+        tracker_resolver = self._get_tracker_resolver()
+        services = list(self.service_infos.values())
+        # 第一阶段: 并发获取各下载器的种子与下载历史
+        scans: Dict[str, Tuple[list, Dict[str, DownloadHistory]]] = {}
+
+        def _collect(service: ServiceInfo):
+            scan = self._collect_downloader(service=service, full_scan=full_scan)
+            if scan:
+                scans[service.name] = scan
+
+        self._runner.run(task="获取下载器种子与下载历史", func=_collect, services=services,
+                         workers=self._scan_workers, timeout=self._scan_timeout)
+        # 按下载器顺序和种子添加时间汇总有下载历史的种子, 辅种的识别不受各下载器执行先后的影响
+        for service in services:
+            torrents, histories = scans.get(service.name) or ([], {})
             for torrent in torrents:
-                try:
-                    if self._event.is_set():
-                        logger.info(
-                            f"{self.LOG_TAG}停止服务")
-                        return
-                    # 获取已处理种子的key (size, name)
-                    _key = self._torrent_key(torrent=torrent, dl_type=service.type)
-                    # 获取种子hash
-                    _hash = self._get_hash(torrent=torrent, dl_type=service.type)
-                    if not _hash:
-                        continue
-                    # 获取种子当前标签
-                    torrent_tags = self._get_label(torrent=torrent, dl_type=service.type)
-                    torrent_cat = self._get_category(torrent=torrent, dl_type=service.type)
+                history = histories.get(self._get_hash(torrent=torrent, dl_type=service.type))
+                _key = self._torrent_key(torrent=torrent, dl_type=service.type)
+                if history and _key:
+                    dispose_history[_key] = history
+        # 第二阶段: 并发设置各下载器种子的标签与分类
+        if not self._runner.run(task="补全下载历史的标签与分类",
+                                func=lambda service: self._complement_downloader(
+                                    service=service, torrents=scans[service.name][0],
+                                    histories=scans[service.name][1], indexers=indexers,
+                                    tracker_resolver=tracker_resolver, dispose_history=dispose_history),
+                                services=[service for service in services if service.name in scans],
+                                workers=self._scan_workers, timeout=self._scan_timeout):
+            # 获取的变更未处理, 下次重新全量扫描
+            for downloader in scans:
+                self._sync_rid.pop(downloader, None)
+
+        logger.info(f"{self.LOG_TAG}执行完成")
+
+    def _collect_downloader(self, service: ServiceInfo,
+                            full_scan: bool = False) -> Optional[Tuple[list, Dict[str, DownloadHistory]]]:
+        """
+        获取单个下载器中需要分析的种子(按添加时间排序)及其下载历史
+        :param full_scan: 强制全量扫描, 忽略增量扫描设置
+        """
+        downloader = service.name
+        downloader_obj = service.instance
+        logger.info(f"{self.LOG_TAG}开始扫描下载器 {downloader} ...")
+        if not downloader_obj:
+            logger.error(f"{self.LOG_TAG} 获取下载器失败 {downloader}")
+            return None
+        # 获取下载器中需要分析的种子
+        torrents = self._get_scan_torrents(service=service, full_scan=full_scan)
+        # 如果下载器获取种子发生错误 或 没有种子 则跳过
+        if not torrents:
+            return None
+        logger.info(f"{self.LOG_TAG}按时间重新排序 {downloader} 种子数：{len(torrents)}")
+        # 按添加时间进行排序, 时间靠前的按大小和名称加入处理历史, 判定为原始种子, 其他为辅种
+        torrents = self._torrents_sort(torrents=torrents, dl_type=service.type)
+        # 批量预取种子hash对应的下载历史, 预取失败时逐个查询
+        hashes = [self._get_hash(torrent=torrent, dl_type=service.type) for torrent in torrents]
+        histories = self._get_histories_by_hashes(hashes)
+        if histories is None:
+            histories = {}
+            for _hash in hashes:
+                if self._runner.is_stopped():
+                    break
+                history = self.downloadhistory_oper.get_by_hash(_hash) if _hash else None
+                if history:
+                    histories[_hash] = history
+        if self._runner.is_stopped():
+            logger.info(f"{self.LOG_TAG}停止服务")
+            # 本次变更未处理完, 下次重新全量扫描
+            self._sync_rid.pop(downloader, None)
+            return None
+        return torrents, histories
 
-                    # 提取种子hash对应的下载历史
-                    history: DownloadHistory = self.downloadhistory_oper.get_by_hash(_hash)
+    def _complement_downloader(self, service: ServiceInfo, torrents: list, histories: Dict[str, DownloadHistory],
+                               indexers: set, tracker_resolver: TrackerSiteResolver, dispose_history: dict):
+        """
+        补全单个下载器中下载历史的标签与分类
+        :param torrents: 按添加时间排序的种子
+        :param histories: 种子hash对应的下载历史
+        :param dispose_history: 所有下载器中有下载历史的种子 (size, name) -> 下载历史, 供辅种使用
+        """
+        downloader = service.name
+        downloader_obj = service.instance
+        logger.info(f"{self.LOG_TAG}下载器 {downloader} 分析种子信息中 ...")
+        # 待批量设置的标签分组 tags -> [hash] 与分类分组 category -> [hash]
+        tag_groups: Dict[Tuple[str, ...], List[str]] = {}
+        cat_groups: Dict[str, List[str]] = {}
+        for torrent in torrents:
+            try:
+                if self._runner.is_stopped():
+                    logger.info(
+                        f"{self.LOG_TAG}停止服务")
+                    # 本次变更未处理完, 下次重新全量扫描
+                    self._sync_rid.pop(downloader, None)
+                    return
+                # 获取已处理种子的key (size, name)
+                _key = self._torrent_key(torrent=torrent, dl_type=service.type)
+                # 获取种子hash
+                _hash = self._get_hash(torrent=torrent, dl_type=service.type)
+                if not _hash:
+                    continue
+                # 获取种子当前标签
+                torrent_tags = self._get_label(torrent=torrent, dl_type=service.type)
+                torrent_cat = self._get_category(torrent=torrent, dl_type=service.type)
+
+                # 提取种子hash对应的下载历史
+                history: DownloadHistory = histories.get(_hash)
+                if not history:
+                    # 如果找到已处理种子的历史, 表明当前种子是辅种, 否则创建一个空DownloadHistory
+                    # 处理历史由各下载器共享, 只读不改, 站点名字使用局部变量
+                    history = dispose_history.get(_key) if _key else None
                     if not history:
-                        # 如果找到已处理种子的历史, 表明当前种子是辅种, 否则创建一个空DownloadHistory
-                        if _key and _key in dispose_history:
-                            history = dispose_history[_key]
-                            # 因为辅种站点必定不同, 所以需要更新站点名字 history.torrent_site
-                            history.torrent_site = None
-                        else:
-                            history = DownloadHistory()
-                    else:
-                        # 加入历史记录
-                        if _key:
-                            dispose_history[_key] = history
-                    logger.debug(f"history.title:{history.title} torrent_cat:{torrent_cat} history.type:{history.type}")
-                    # 如果标签已经存在任意站点, 则不再添加站点标签
-                    if indexers.intersection(set(torrent_tags)):
-                        history.torrent_site = None
-                    # 如果站点名称为空, 尝试通过trackers识别
-                    elif not history.torrent_site:
-                        trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
-                        for tracker in trackers:
-                            # 检查tracker是否包含特定的关键字，并进行相应的映射
-                            for key, mapped_domain in tracker_mappings.items():
-                                if key in tracker:
-                                    domain = mapped_domain
-                                    break
+                        history = DownloadHistory()
+                    # 因为辅种站点必定不同, 所以不沿用原始种子的站点名字
+                    torrent_site = None
+                else:
+                    torrent_site = history.torrent_site
+                logger.debug(f"history.title:{history.title} torrent_cat:{torrent_cat} history.type:{history.type}")
+                # 如果标签已经存在任意站点, 则不再添加站点标签
+                if indexers.intersection(set(torrent_tags)):
+                    torrent_site = None
+                # 如果站点名称为空, 尝试通过trackers识别
+                elif not torrent_site:
+                    trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
+                    for tracker in trackers:
+                        # 通过映射或tracker域名识别站点
+                        site_info = tracker_resolver.resolve(tracker)
+                        if site_info:
+                            torrent_site = site_info.get("name")
+                            break
+                    # 如果通过tracker还是无法获取站点名称, 且tmdbid, type, title都是空的, 那么跳过当前种子
+                    if not torrent_site and not history.tmdbid and not history.type and not history.title:
+                        continue
+                # 按设置生成需要写入的标签与分类
+                _tags = []
+                _cat = None
+                # 站点标签, 如果勾选开关的话 因允许torrent_site为空时运行到此, 因此需要判断torrent_site不为空
+                if self._enabled_tag and torrent_site:
+                    _tags.append(torrent_site)
+                # 媒体标题标签, 如果勾选开关的话 因允许title为空时运行到此, 因此需要判断title不为空
+                if self._enabled_media_tag and history.title:
+                    _tags.append(history.title)
+                # 分类, 如果勾选开关的话 <tr暂不支持> 因允许mtype为空时运行到此, 因此需要判断mtype不为空。为防止不必要的识别, 种子已经存在分类torrent_cat时 也不执行
+                if service.type == "qbittorrent" and self._enabled_category and not torrent_cat and history.type:
+                    # 因允许tmdbid为空时运行到此, 因此需要判断tmdbid不为空
+                    history_type = MediaType(history.type) if history.type else None
+                    if history.tmdbid and history_type:
+                        # tmdb_id获取tmdb信息
+                        tmdb_info = self.chain.tmdb_info(mtype=history_type, tmdbid=history.tmdbid)
+                        if tmdb_info:
+                            # 确定二级分类
+                            if tmdb_info.get('media_type') == MediaType.TV:
+                                cat = self.category_helper.get_tv_category(tmdb_info)
                             else:
-                                domain = StringUtils.get_url_domain(tracker)
-                            site_info = self.sites_helper.get_indexer(domain)
-                            if site_info:
-                                history.torrent_site = site_info.get("name")
-                                break
-                        # 如果通过tracker还是无法获取站点名称, 且tmdbid, type, title都是空的, 那么跳过当前种子
-                        if not history.torrent_site and not history.tmdbid and not history.type and not history.title:
-                            continue
-                    # 按设置生成需要写入的标签与分类
-                    _tags = []
+                                cat = self.category_helper.get_movie_category(tmdb_info)
+                        else:
+                            logger.warn(f'{history.title} 未获取到tmdb信息')
+
+                        if cat:
+                            logger.debug(f'{history.title} 本剧集类别:{cat}')
+                            _cat = self._cat_rename_dict[str(cat)]
+                        else:
+                            logger.warn(f'{history.title} 未获取到二级分类信息')
+
+
+                # 去除种子已经存在的标签
+                if _tags and torrent_tags:
+                    _tags = list(set(_tags) - set(torrent_tags))
+                # 如果分类一样, 那么不需要修改
+                if _cat == torrent_cat:
+                    logger.debug(f"分类一样跳过处理")
                     _cat = None
-                    # 站点标签, 如果勾选开关的话 因允许torrent_site为空时运行到此, 因此需要判断torrent_site不为空
-                    if self._enabled_tag and history.torrent_site:
-                        _tags.append(history.torrent_site)
-                    # 媒体标题标签, 如果勾选开关的话 因允许title为空时运行到此, 因此需要判断title不为空
-                    if self._enabled_media_tag and history.title:
-                        _tags.append(history.title)
-                    # 分类, 如果勾选开关的话 <tr暂不支持> 因允许mtype为空时运行到此, 因此需要判断mtype不为空。为防止不必要的识别, 种子已经存在分类torrent_cat时 也不执行
-                    if service.type == "qbittorrent" and self._enabled_category and not torrent_cat and history.type:
-                        # 因允许tmdbid为空时运行到此, 因此需要判断tmdbid不为空
-                        history_type = MediaType(history.type) if history.type else None
-                        if history.tmdbid and history_type:
-                            # tmdb_id获取tmdb信息
-                            tmdb_info = self.chain.tmdb_info(mtype=history_type, tmdbid=history.tmdbid)
-                            if tmdb_info:
-                                # 确定二级分类
-                                if tmdb_info.get('media_type') == MediaType.TV:
-                                    cat = self.category_helper.get_tv_category(tmdb_info)
-                                else:
-                                    cat = self.category_helper.get_movie_category(tmdb_info)
-                            else:
-                                logger.warn(f'{history.title} 未获取到tmdb信息')
+                # 判断当前种子是否不需要修改
+                if not _cat and not _tags:
+                    continue
+                # 按目标标签与分类分组, 扫描结束后批量设置
+                if _tags:
+                    # tr设置标签会覆盖原有标签, 因此需要合并原始标签
+                    if service.type != "qbittorrent" and torrent_tags:
+                        _tags = list(set(torrent_tags).union(set(_tags)))
+                    tag_groups.setdefault(tuple(sorted(_tags)), []).append(_hash)
+                if _cat and service.type == "qbittorrent":
+                    cat_groups.setdefault(_cat, []).append(_hash)
+            except Exception as e:
+                logger.error(
+                    f"{self.LOG_TAG}分析种子信息时发生了错误: {str(e)}")
+        # 批量设置种子标签与分类
+        self._set_torrents_info_batch(service=service, tag_groups=tag_groups, cat_groups=cat_groups)
 
-                            if cat:
-                                logger.debug(f'{history.title} 本剧集类别:{cat}')
-                                _cat = self._cat_rename_dict[str(cat)]
-                            else:
-                                logger.warn(f'{history.title} 未获取到二级分类信息')
-                        
-
-                    # 去除种子已经存在的标签
-                    if _tags and torrent_tags:
-                        _tags = list(set(_tags) - set(torrent_tags))
-                    # 如果分类一样, 那么不需要修改
-                    if _cat == torrent_cat:
-                        logger.debug(f"分类一样跳过处理")
-                        _cat = None
-                    # 判断当前种子是否不需要修改
-                    if not _cat and not _tags:
-                        continue
-                    # 执行通用方法, 设置种子标签与分类
-                    self._set_torrent_info(service=service, _hash=_hash, _torrent=torrent, _tags=_tags, _cat=_cat,
-                                           _original_tags=torrent_tags)
-                except Exception as e:
-                    logger.error(
-                        f"{self.LOG_TAG}分析种子信息时发生了错误: {str(e)}")
+    def _get_scan_torrents(self, service: ServiceInfo, full_scan: bool = False) -> list:
+        """
+        获取需要分析的种子
+        qBittorrent开启增量扫描时, 通过 sync_maindata 的 rid 只返回新增或变更的种子,
+        首次运行或服务端返回 full_update 时退回全量扫描
+        """
+        downloader = service.name
+        downloader_obj = service.instance
+        if not self._enabled_incremental or service.type != "qbittorrent":
+            torrents, error = downloader_obj.get_torrents()
+            return torrents if not error else []
+        # 上次运行中插件自身设置过标签或分类的种子
+        self_updated = self._sync_self_updated.pop(downloader, set())
+        try:
+            last_rid = self._sync_rid.get(downloader)
+            # 强制全量扫描时从 rid=0 开始, 服务端直接返回全部种子
+            rid = 0 if full_scan else (last_rid or 0)
+            data = downloader_obj.qbc.sync_maindata(rid=rid)
+            self._sync_rid[downloader] = data.get("rid", rid)
+        except Exception as e:
+            logger.error(f"{self.LOG_TAG}下载器 {downloader} 增量同步失败, 退回全量扫描: {str(e)}")
+            self._sync_rid.pop(downloader, None)
+            torrents, error = downloader_obj.get_torrents()
+            return torrents if not error else []
+        if not rid or data.get("full_update", False):
+            # 全量数据已包含所有种子的完整信息, 无需再次获取种子列表
+            torrents = [TorrentDictionary(data={**fields, "hash": _hash}, client=downloader_obj.qbc)
+                        for _hash, fields in (data.get("torrents") or {}).items()]
+            logger.info(f"{self.LOG_TAG}下载器 {downloader} 执行全量扫描 rid: {self._sync_rid[downloader]}"
+                        f" 种子数：{len(torrents)}")
+            return torrents
+        # 仅处理新增或关注字段发生变化的种子, 插件自身设置的标签与分类变化不触发重新分析
+        changed_hashes = [_hash for _hash, fields in (data.get("torrents") or {}).items()
+                          if (self._sync_fields - self._sync_self_fields
+                              if _hash in self_updated else self._sync_fields).intersection(fields or {})]
+        logger.info(f"{self.LOG_TAG}下载器 {downloader} 增量扫描 rid: {last_rid} -> {self._sync_rid[downloader]}"
+                    f" 变更种子数：{len(changed_hashes)}")
+        if not changed_hashes:
+            return []
+        torrents, error = downloader_obj.get_torrents(ids=changed_hashes)
+        return torrents if not error else []
 
-        logger.info(f"{self.LOG_TAG}执行完成")
+    def _get_scan_stats(self) -> Dict[str, Any]:
+        """
+        API Endpoint: 返回各任务最近一次执行时每个下载器的耗时
+        """
+        return self._runner.stats
+
+    def _get_tracker_resolver(self) -> TrackerSiteResolver:
+        """
+        获取 tracker -> 站点 解析器, 按站点域名建立索引, 站点变更后重新构建
+        """
+        if not self._tracker_resolver:
+            domain_index = {}
+            for indexer in self.sites_helper.get_indexers():
+                domain = StringUtils.get_url_domain(indexer.get("domain"))
+                if domain:
+                    domain_index.setdefault(domain, indexer)
+            self._tracker_resolver = TrackerSiteResolver(domain_index=domain_index,
+                                                         mappings=self._tracker_mappings,
+                                                         fallback=self.sites_helper.get_indexer)
+        return self._tracker_resolver
+
+    @eventmanager.register([EventType.SiteDeleted, EventType.SiteUpdated])
+    def site_changed(self, event: Event):
+        """
+        站点变更时重建 tracker -> 站点 解析器
+        """
+        self._tracker_resolver = None
+
+    def _get_histories_by_hashes(self, hashes: List[str]) -> Optional[Dict[str, DownloadHistory]]:
+        """
+        按种子hash批量查询下载历史, 分批使用 IN (...) 查询, 每个hash只保留最新的一条记录
+        查询失败时返回None
+        """
+        hashes = list({_hash for _hash in hashes if _hash})
+        if not hashes:
+            return {}
+        histories: Dict[str, DownloadHistory] = {}
+        query_count = 0
+        begin = time.perf_counter()
+        db = ScopedSession()
+        try:
+            for i in range(0, len(hashes), self._history_chunk_size):
+                chunk = hashes[i:i + self._history_chunk_size]
+                records = db.query(DownloadHistory).filter(DownloadHistory.download_hash.in_(chunk)) \
+                    .order_by(DownloadHistory.date.desc()).all()
+                query_count += 1
+                for record in records:
+                    histories.setdefault(record.download_hash, record)
+        except Exception as e:
+            logger.error(f"{self.LOG_TAG}批量查询下载历史失败, 将逐个查询: {str(e)}")
+            return None
+        finally:
+            db.close()
+        elapsed = time.perf_counter() - begin
+        self._history_lookup_stats = {
+            "hashes": len(hashes),
+            "hits": len(histories),
+            "queries": query_count,
+            "saved_queries": len(hashes) - query_count,
+            "elapsed": round(elapsed, 3)
+        }
+        logger.info(f"{self.LOG_TAG}批量查询下载历史: 种子 {len(hashes)} 个, 命中 {len(histories)} 条, "
+                    f"查询 {query_count} 次(减少 {len(hashes) - query_count} 次), 耗时 {elapsed:.3f}s")
+        return histories
 
     def _genre_ids_get_cat(self, mtype, genre_ids=None):
         """
@@ -467,6 +693,57 @@ class DownloadSiteTagMod(_PluginBase):
             print(str(e))
             return None
 
+    def _set_torrents_info_batch(self, service: ServiceInfo, tag_groups: Dict[Tuple[str, ...], List[str]],
+                                 cat_groups: Dict[str, List[str]]):
+        """
+        按标签与分类分组批量设置种子, 每组按批量大小分批调用下载器接口
+        """
+        if not service or not service.instance or (not tag_groups and not cat_groups):
+            return
+        downloader_obj = service.instance
+        if self._enabled_incremental and service.type == "qbittorrent":
+            # 记录插件自身修改的种子, 下次增量扫描时不因这些修改重新分析
+            updated = self._sync_self_updated.setdefault(service.name, set())
+            for hashes in [*tag_groups.values(), *cat_groups.values()]:
+                updated.update(hashes)
+        api_count = 0
+        torrent_count = 0
+        for _tags, hashes in tag_groups.items():
+            for i in range(0, len(hashes), self._batch_size):
+                chunk = hashes[i:i + self._batch_size]
+                try:
+                    # 下载器api不通用, 因此需分开处理
+                    if service.type == "qbittorrent":
+                        downloader_obj.set_torrents_tag(ids=chunk, tags=list(_tags))
+                    else:
+                        downloader_obj.set_torrent_tag(ids=chunk, tags=list(_tags))
+                    api_count += 1
+                    torrent_count += len(chunk)
+                    logger.warn(
+                        f"{self.LOG_TAG}下载器: {service.name} 批量设置 {len(chunk)} 个种子  标签: {','.join(_tags)}")
+                except Exception as e:
+                    logger.error(f"{self.LOG_TAG}下载器: {service.name} 批量设置标签 {','.join(_tags)} 失败: {str(e)}")
+        # 设置分类 <tr暂不支持>
+        for _cat, hashes in cat_groups.items():
+            for i in range(0, len(hashes), self._batch_size):
+                chunk = hashes[i:i + self._batch_size]
+                try:
+                    # 尝试设置种子分类, 如果失败, 则创建再设置一遍
+                    try:
+                        downloader_obj.qbc.torrents_set_category(category=_cat, torrent_hashes=chunk)
+                    except Exception as e:
+                        logger.warn(f"下载器 {service.name} 批量设置分类 {_cat} 失败：{str(e)}, "
+                                    f"尝试创建分类再设置 ...")
+                        downloader_obj.qbc.torrents_createCategory(name=_cat)
+                        downloader_obj.qbc.torrents_set_category(category=_cat, torrent_hashes=chunk)
+                    api_count += 1
+                    torrent_count += len(chunk)
+                    logger.warn(f"{self.LOG_TAG}下载器: {service.name} 批量设置 {len(chunk)} 个种子  分类: {_cat}")
+                except Exception as e:
+                    logger.error(f"{self.LOG_TAG}下载器: {service.name} 批量设置分类 {_cat} 失败: {str(e)}")
+        logger.info(f"{self.LOG_TAG}下载器: {service.name} 批量设置标签与分类完成, "
+                    f"调用接口 {api_count} 次, 涉及种子 {torrent_count} 个")
+
     def _set_torrent_info(self, service: ServiceInfo, _hash: str, _torrent: Any = None, _tags=None, _cat: str = None,
                           _original_tags: list = None):
         """
@@ -715,7 +992,8 @@ class DownloadSiteTagMod(_PluginBase):
                             {
                                 'component': 'VCol',
                                 'props': {
-                                    'cols': 12
+                                    'cols': 12,
+                                    'md': 6
                                 },
                                 'content': [
                                     {
@@ -726,6 +1004,22 @@ class DownloadSiteTagMod(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VCheckboxBtn',
+                                        'props': {
+                                            'model': 'enabled_incremental',
+                                            'label': '定时任务增量扫描(仅qBittorrent)'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -735,7 +1029,8 @@ class DownloadSiteTagMod(_PluginBase):
                             {
                                 'component': 'VCol',
                                 'props': {
-                                    'cols': 12
+                                    'cols': 12,
+                                    'md': 9
                                 },
                                 'content': [
                                     {
@@ -751,6 +1046,62 @@ class DownloadSiteTagMod(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'batch_size',
+                                            'label': '批量设置每批种子数',
+                                            'placeholder': '100'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 6,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'scan_workers',
+                                            'label': '并发扫描下载器数',
+                                            'placeholder': '4'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 6,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'scan_timeout',
+                                            'label': '单个下载器超时(秒)',
+                                            'placeholder': '1800'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -894,6 +1245,7 @@ class DownloadSiteTagMod(_PluginBase):
                                             'type': 'info',
                                             'variant': 'tonal',
                                             'text': '定时任务：支持两种定时方式，主要针对辅种刷流等种子补全站点信息。如没有对应的需求建议切换为禁用。'
+                                                    '开启增量扫描后，qBittorrent仅分析上次执行后新增或变更的种子。'
                                         }
                                     }
                                 ]
@@ -903,7 +1255,7 @@ class DownloadSiteTagMod(_PluginBase):
                 ]
             }
         for  index, item in enumerate(vrow_list):
-            form["content"].insert( 4+index, item)
+            form["content"].insert( 5+index, item)
 
         data:Dict[str, Any] = {
             "enabled": False,
@@ -911,13 +1263,17 @@ class DownloadSiteTagMod(_PluginBase):
             "enabled_tag": True,
             "enabled_media_tag": False,
             "enabled_category": False,
+            "enabled_incremental": False,
             "category_movie": "电影",
             "category_tv": "电视",
             "category_anime": "动漫",
             "interval": "计划任务",
             "interval_cron": "5 4 * * *",
             "interval_time": "6",
-            "interval_unit": "小时"
+            "interval_unit": "小时",
+            "batch_size": "100",
+            "scan_workers": "4",
+            "scan_timeout": "1800"
         }
 
         return [
@@ -931,6 +1287,8 @@ class DownloadSiteTagMod(_PluginBase):
         """
         停止服务
         """
+        # 通知执行中的下载器任务退出, 定时服务(get_service)启动的任务同样需要停止
+        self._runner.stop()
         try:
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
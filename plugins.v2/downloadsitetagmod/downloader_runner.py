@@ -0,0 +1,129 @@
+"""
+下载器任务执行辅助类
+并发执行各下载器的任务, 单个下载器超时或异常不会阻塞其他下载器, 并记录各下载器的耗时
+"""
+import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.log import logger
+from app.schemas import ServiceInfo
+
+
+class DownloaderRunner:
+    """
+    下载器任务执行器
+    1、每个下载器在独立线程中执行, 超时的下载器通过停止标志通知其退出
+    2、同一任务上次执行的下载器仍未退出时跳过本次执行, 避免同一下载器被并发修改
+    3、下载器任务中通过 is_stopped 判断是否需要退出
+    """
+
+    def __init__(self, log_tag: str, stop_event: threading.Event, thread_name_prefix: str):
+        """
+        :param log_tag: 日志前缀
+        :param stop_event: 插件退出事件
+        :param thread_name_prefix: 执行线程名称前缀
+        """
+        self._log_tag = log_tag
+        self._stop_event = stop_event
+        self._thread_name_prefix = thread_name_prefix
+        # 当前线程所执行下载器任务的停止标志
+        self._local = threading.local()
+        # 执行中的下载器任务 任务名称 -> {下载器名称: (Future, 停止标志)}
+        self._running_tasks: Dict[str, Dict[str, Tuple[Future, threading.Event]]] = {}
+        # 各任务最近一次执行时每个下载器的耗时
+        self.stats: Dict[str, Dict[str, dict]] = {}
+
+    def run(self, task: str, func: Callable[[ServiceInfo], Any], services: List[ServiceInfo],
+            workers: int = 4, timeout: float = 1800) -> bool:
+        """
+        并发执行各下载器的任务
+        :param task: 任务名称
+        :param func: 单个下载器的处理方法
+        :param services: 下载器服务列表
+        :param workers: 并发执行的下载器数量
+        :param timeout: 单个下载器执行超时时间(秒)
+        :return: 是否执行, 上次执行的下载器仍未退出时跳过本次执行
+        """
+        if not services:
+            return True
+        running = [name for name, (future, _) in self._running_tasks.get(task, {}).items() if not future.done()]
+        if running:
+            logger.warn(f"{self._log_tag}{task} 上次执行的下载器 {','.join(running)} 仍未退出, 跳过本次执行")
+            return False
+        stats: Dict[str, dict] = {}
+        self.stats[task] = stats
+        # 各下载器开始执行的时间, 用于判断超时
+        start_times: Dict[str, float] = {}
+        running_tasks: Dict[str, Tuple[Future, threading.Event]] = {}
+        self._running_tasks[task] = running_tasks
+
+        def _run(_service: ServiceInfo, _stop_flag: threading.Event):
+            self._local.stop_flag = _stop_flag
+            start_times[_service.name] = time.monotonic()
+            status = "完成"
+            try:
+                func(_service)
+                if self.is_stopped():
+                    status = "停止"
+            except Exception as e:
+                status = "失败"
+                logger.error(f"{self._log_tag}{task} 下载器 {_service.name} 发生了错误: {str(e)}", exc_info=True)
+            finally:
+                self._local.stop_flag = None
+                duration = round(time.monotonic() - start_times[_service.name], 3)
+                # 已超时的下载器保留超时状态
+                if stats.get(_service.name, {}).get("status") != "超时":
+                    stats[_service.name] = {"status": status, "duration": duration,
+                                            "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+                logger.info(f"{self._log_tag}{task} 下载器 {_service.name} {status} 耗时 {duration}s")
+
+        executor = ThreadPoolExecutor(max_workers=max(min(workers, len(services)), 1),
+                                      thread_name_prefix=self._thread_name_prefix)
+        futures: Dict[Future, str] = {}
+        for service in services:
+            stop_flag = threading.Event()
+            future = executor.submit(_run, service, stop_flag)
+            futures[future] = service.name
+            running_tasks[service.name] = (future, stop_flag)
+        pending = set(futures)
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                if self._stop_event.is_set():
+                    # 停止服务时不再启动排队中的下载器, 执行中的下载器会自行退出
+                    for future in pending:
+                        future.cancel()
+                        running_tasks[futures[future]][1].set()
+                now = time.monotonic()
+                for future in list(pending):
+                    downloader = futures[future]
+                    if downloader in start_times and now - start_times[downloader] > timeout:
+                        logger.error(f"{self._log_tag}{task} 下载器 {downloader} 执行超过 {timeout}s, "
+                                     f"不再等待其完成并通知其停止")
+                        running_tasks[downloader][1].set()
+                        stats[downloader] = {"status": "超时", "duration": round(now - start_times[downloader], 3),
+                                             "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+                        pending.discard(future)
+                    elif future.cancelled():
+                        pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def stop(self):
+        """
+        通知所有执行中的下载器任务退出
+        """
+        for running_tasks in self._running_tasks.values():
+            for _, stop_flag in running_tasks.values():
+                stop_flag.set()
+
+    def is_stopped(self) -> bool:
+        """
+        当前下载器任务是否需要停止: 停止服务或当前下载器执行超时
+        """
+        stop_flag = getattr(self._local, "stop_flag", None)
+        return self._stop_event.is_set() or bool(stop_flag and stop_flag.is_set())
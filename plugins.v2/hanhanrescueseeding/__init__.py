@@ -1,7 +1,9 @@
 import re
 import datetime
 import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import pytz
 from typing import List, Tuple, Dict, Any, Optional
@@ -24,6 +26,50 @@ from app.utils.http import RequestUtils
 from torrentool.torrent import Torrent
 
 
+class RangeFilter:
+    """
+    数值范围过滤条件，配置时编译一次，过滤时直接比较
+    支持格式: "3"(不大于3)、"1-3"(闭区间)、"1-"(不小于1)、"-3"(不大于3)
+    以及列表 "1-3,8,10-"(任一条件满足即可，列表中的单个数字表示等于该值)
+    """
+
+    def __init__(self, expr: str, name: str = "范围"):
+        self.expr = str(expr).strip()
+        self.name = name
+        parts = [part.strip() for part in re.split(r"[,，]", self.expr) if part.strip()]
+        if not parts:
+            raise ValueError(f"{self.name}条件不能为空")
+        # (下限, 上限) 列表，None表示不限制
+        self.ranges: List[Tuple[Optional[float], Optional[float]]] = [
+            self._parse_part(part, single=len(parts) == 1) for part in parts
+        ]
+
+    def _parse_part(self, part: str, single: bool) -> Tuple[Optional[float], Optional[float]]:
+        try:
+            if "-" not in part:
+                value = float(part)
+                return (None, value) if single else (value, value)
+            lower_str, upper_str = part.split("-", 1)
+            lower = float(lower_str) if lower_str.strip() else None
+            upper = float(upper_str) if upper_str.strip() else None
+        except ValueError:
+            raise ValueError(f"无效的{self.name}格式: {part}")
+        if lower is None and upper is None:
+            raise ValueError(f"无效的{self.name}格式: {part}")
+        if lower is not None and upper is not None and lower > upper:
+            raise ValueError(f"{self.name}下限大于上限: {part}")
+        return lower, upper
+
+    def match(self, value: float) -> bool:
+        for lower, upper in self.ranges:
+            if (lower is None or value >= lower) and (upper is None or value <= upper):
+                return True
+        return False
+
+    def __str__(self):
+        return self.expr
+
+
 class HanHanRescueSeeding(_PluginBase):
     # 插件名称
     plugin_name = "憨憨保种区"
@@ -32,7 +78,7 @@ class HanHanRescueSeeding(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/wikrin/MoviePilot-Plugins/main/icons/alter_1.png"
     # 插件版本
-    plugin_version = "1.2.7.2"
+    plugin_version = "1.2.11"
     # 插件作者
     plugin_author = "Seed680"
     # 作者主页
@@ -62,8 +108,26 @@ class HanHanRescueSeeding(_PluginBase):
     _history_rescue_enabled = None
     _user_id = None
     _force_resume = None
+    # 编译后的做种人数与种子大小过滤条件
+    _seeding_filter: Optional[RangeFilter] = None
+    _size_filter: Optional[RangeFilter] = None
+    # 过滤条件配置错误信息，修正前不执行保种任务
+    _filter_error: Optional[str] = None
+    # 种子大小解析
+    _size_pattern = re.compile(r'([\d.]+)\s*(KB|MB|GB|TB)')
+    _size_units = {"KB": 1 / (1024 * 1024), "MB": 1 / 1024, "GB": 1, "TB": 1024}
     # 退出事件
     _event = threading.Event()
+    # 保种区最大页数
+    _max_pages = 11
+    # 同时请求的保种区页面数量
+    _page_workers = 3
+    # 同时下载种子的数量
+    _download_workers = 3
+    # 请求站点的最小间隔(秒)
+    _request_interval = 0.5
+    _request_lock = threading.Lock()
+    _last_request_time = 0.0
 
     def init_plugin(self, config: dict = None):
         try:
@@ -101,6 +165,22 @@ class HanHanRescueSeeding(_PluginBase):
 
             # 停止现有任务
             self.stop_service()
+
+            # 编译过滤条件，配置错误时通知用户，修正前不执行保种任务
+            if config:
+                self._filter_error = None
+                try:
+                    self._compile_filters()
+                except ValueError as e:
+                    self._seeding_filter = None
+                    self._size_filter = None
+                    self._filter_error = str(e)
+                    logger.error(f"过滤条件配置错误，修正前不会执行保种任务：{self._filter_error}")
+                    self.post_message(
+                        mtype=NotificationType.Plugin,
+                        title="【憨憨保种区】",
+                        text=f"过滤条件配置错误，修正前不会执行保种任务：{self._filter_error}"
+                    )
             
             # 检查是否需要立即运行一次性任务
             need_run_once = self._run_once or (self._history_rescue_enabled and self._user_id)
@@ -190,6 +270,15 @@ class HanHanRescueSeeding(_PluginBase):
             ):
                 setattr(self, f"_{key}", config.get(key, getattr(self, f"_{key}")))
 
+    def _compile_filters(self):
+        """
+        编译做种人数与种子大小过滤条件，条件为空时不过滤，格式错误时抛出ValueError
+        """
+        self._seeding_filter = RangeFilter(self._seeding_count, name="做种人数") \
+            if str(self._seeding_count or "").strip() else None
+        self._size_filter = RangeFilter(self._torrent_size, name="种子大小") \
+            if str(self._torrent_size or "").strip() else None
+
     @staticmethod
     def get_render_mode() -> Tuple[str, str]:
         """
@@ -283,26 +372,14 @@ class HanHanRescueSeeding(_PluginBase):
         size_str = size_str.strip().upper()
         
         # 匹配数字和单位
-        match = re.match(r'([\d.]+)\s*(KB|MB|GB|TB)', size_str)
+        match = self._size_pattern.match(size_str)
         if not match:
             logger.warning(f"无法解析种子大小格式: {size_str}")
             return None
         
         try:
-            value = float(match.group(1))
-            unit = match.group(2)
-            
             # 转换为GB
-            if unit == 'KB':
-                return value / (1024 * 1024)
-            elif unit == 'MB':
-                return value / 1024
-            elif unit == 'GB':
-                return value
-            elif unit == 'TB':
-                return value * 1024
-            else:
-                return None
+            return float(match.group(1)) * self._size_units[match.group(2)]
         except Exception as e:
             logger.error(f"解析种子大小失败: {str(e)}")
             return None
@@ -427,208 +504,99 @@ class HanHanRescueSeeding(_PluginBase):
                 logger.info("憨憨保种区插件未启用，跳过检查")
                 return
 
+            if self._filter_error:
+                logger.error(f"过滤条件配置错误，无法执行保种任务：{self._filter_error}")
+                return
+
             if not self._downloader:
                 logger.error("未配置下载器，无法执行保种任务")
                 return
-            downloaded_count = 0
+            service_info = self.downloader_helper.get_service(self._downloader)
+            if not service_info or not service_info.instance:
+                logger.error(f"下载器 {self._downloader} 未连接或不可用")
+                return
             success_downloaded_count = 0
             failed_downloaded_count = 0
-            # 先获取现有的下载记录列表
-            download_records = self.get_data("download_records") or []
-            for page in range(0, 11):
-                url = "https://" + self.domain + f"/rescue.php?page={page}"
-                logger.info(f"憨憨保种区第{page + 1}页:{url}")
-                torrent_detail_source = self._get_page_source(url=url, site=self.site)
-                if not torrent_detail_source:
-                    logger.error(f"请求憨憨保种区第{page}页失败")
-                    break
-                # logger.debug(f"憨憨保种区第{page + 1}页详情：" +torrent_detail_source)
-                html = etree.HTML(torrent_detail_source)
-                if html is None:
-                    logger.error(f"憨憨保种区第{page}页页面解析失败")
-                    break
-                elements = html.xpath('//*[@id="mainContent"]/div[1]/div[2]/div[3]/div')
-                logger.info(f"第{page + 1}页数据获取{len(elements)}条数据")
-                if len(elements) == 0:
-                    break
-                for elem in elements:
-                    try:
-                        # 在每个找到的元素中再次通过xpath搜索
-                        # 做种人数
-                        seed = elem.xpath('div[3]/div/div[3]/a')
-                        # 英文标题
-                        title = elem.xpath('div[2]/div/a')
-                        # 中文标题
-                        zh_title = elem.xpath('div[2]/div/div[1]/div')
-                        # 种子大小
-                        size = elem.xpath('div[3]/div/div[1]')
-                        sub_elem = seed[0] if len(seed) > 0 else None
-                        # 打印子元素的文本内容和链接
-                        if sub_elem is not None and sub_elem.text is not None:
-                            logger.info(f"做种人数: {sub_elem.text}")
-                        else:
-                            logger.warning(f"未找到做种人数元素或做种人数为空，跳过此种子")
-                            continue
-                        # 检查做种人数是否在设定区间内
-                        # 将 text 转换为整数，处理 "0" 的情况
-                        try:
-                            seeders_count = int(sub_elem.text.strip())
-                        except (ValueError, AttributeError):
-                            logger.warning(f"做种人数格式错误: {sub_elem.text}，跳过此种子")
-                            continue
-                        
-                        seeding_count_str = str(self._seeding_count)
-                        if '-' in seeding_count_str:
-                            # 分割范围字符串并转换为整数
-                            range_parts = seeding_count_str.split('-')
-                            if len(range_parts) == 2:
-                                try:
-                                    lower_bound = int(range_parts[0])
-                                    upper_bound = int(range_parts[1])
-                                    # 检查做种人数是否在范围内
-                                    if (lower_bound > seeders_count) or (upper_bound < seeders_count):
-                                        continue
-                                except ValueError:
-                                    logger.error(f"无效的范围格式: {seeding_count_str}")
-                                    continue
-                        else:
-                            # 不包含-号，判断做种人数是否小于该数字
-                            try:
-                                if seeders_count > int(seeding_count_str):
-                                    continue
-                            except ValueError:
-                                logger.error(f"无效的数字格式: {seeding_count_str}")
-                                continue
-                        
-                        # 检查种子大小是否在设定范围内
-                        size_text = size[0].text.strip() if size else None
-                        if size_text and self._torrent_size:
-                            size_gb = self._parse_size_to_gb(size_text)
-                            if size_gb is not None:
-                                torrent_size_str = str(self._torrent_size)
-                                size_in_range = False
-                                
-                                if '-' in torrent_size_str:
-                                    # 范围格式，如 1-5
-                                    range_parts = torrent_size_str.split('-')
-                                    if len(range_parts) == 2:
-                                        try:
-                                            lower_bound = float(range_parts[0])
-                                            upper_bound = float(range_parts[1])
-                                            if lower_bound <= size_gb <= upper_bound:
-                                                size_in_range = True
-                                        except ValueError:
-                                            logger.error(f"无效的种子大小范围格式: {torrent_size_str}")
-                                            continue
-                                else:
-                                    # 单个数字格式，检查种子大小是否小于该数字
-                                    try:
-                                        if size_gb <= float(torrent_size_str):
-                                            size_in_range = True
-                                    except ValueError:
-                                        logger.error(f"无效的种子大小数字格式: {torrent_size_str}")
-                                        continue
-                                
-                                if not size_in_range:
-                                    logger.info(f"种子大小 {size_gb:.2f}GB 不在设定范围内 {torrent_size_str}GB，跳过")
-                                    continue
-                            else:
-                                logger.warning(f"无法解析种子大小: {size_text}，跳过大小检查")
-                        # 检查下载数量限制
-                        if self._download_limit > 0 and downloaded_count >= self._download_limit:
-                            logger.info(f"已达到单次下载数量限制 ({self._download_limit})，停止下载")
-                            break
-                        # 如果做种人数在设定区间内，则下载种子
-                        download_element = elem.xpath('div[4]/div/a')
-                        if download_element:
-                            # 下载链接
-                            download_link = "https://" + self.domain + "/" + download_element[0].get('href')
-                            if download_link:
-                                logger.info(f"下载种子链接: {download_link}")
-                                # 先下载种子文件获取hash
-                                torrent_content, torrent_hash = self._download_torrent(download_link, self.site)
-                                if not torrent_content:
-                                    logger.error(f"下载种子文件失败: {download_link}")
-                                    failed_downloaded_count += 1
-                                    continue
-                                
-                                # 调用下载器下载种子
-                                downloader = self._downloader
-                                service_info = self.downloader_helper.get_service(downloader)
-                                if service_info and service_info.instance:
-                                    try:
-                                        logger.debug(f"获取下载器实例成功: {downloader}")
-                                        # 准备下载参数
-                                        download_kwargs = {
-                                            "content": torrent_content,  # 使用下载的种子内容而不是URL
-                                            "cookie": self.site.cookie
-                                        }
-                                        if self._save_path:
-                                            download_kwargs["download_dir"] = self._save_path
-                                        # 如果有自定义标签，则添加标签参数
-                                        if self._custom_tag:
-                                            if service_info.type == "qbittorrent":
-                                                download_kwargs["tag"] = self._custom_tag.split(',')
-                                            elif service_info.type == "transmission":
-                                                download_kwargs["labels"] = self._custom_tag.split(',')
-                                        logger.debug(f"下载种子参数: {download_kwargs}")
-                                        # 下载种子文件
-                                        result = service_info.instance.add_torrent(**download_kwargs)
-                                        logger.debug(f"下载结果: {result}")
-                                        if result:
-                                            logger.info(f"成功下载种子: {download_link}")
-                                            downloaded_count += 1
-                                            success_downloaded_count += 1
-                                            
-                                            # 如果启用了强制继续且是qbittorrent，设置强制作种
-                                            if self._force_resume and service_info.type == "qbittorrent":
-                                                try:
-                                                    # 等待一下让种子添加到下载器
-                                                    import time
-                                                    time.sleep(1)
-                                                    service_info.instance.torrents_set_force_start(ids=torrent_hash)
-                                                    logger.info(f"已设置种子强制作种: {torrent_hash}")
-                                                except Exception as e:
-                                                    logger.error(f"设置强制作种失败: {str(e)}")
-                                            
-                                            # 获取种子信息
-                                            title_text = title[0].text.strip() if title else "未知标题"
-                                            zh_title_text = zh_title[0].text.strip() if zh_title else "无中文标题"
-                                            size_text = size[0].text.strip() if size else "未知大小"
-                                            seed_count = str(seeders_count)
-
-                                            # 保存下载记录
-                                            download_record = {
-                                                "title": title_text,
-                                                "zh_title": zh_title_text,
-                                                "size": size_text,
-                                                "seeders": seed_count,
-                                                "download_link": download_link,
-                                                "torrent_hash": torrent_hash,  # 使用下载时计算的种子hash
-                                                "download_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                            }
-
-                                            # 使用self.save_data保存数据，以列表形式保存所有下载记录
-                                            # 将新记录添加到列表中
-                                            download_records.append(download_record)
-                                            # 保存更新后的列表
-                                            self.save_data(key="download_records", value=download_records)
+            skipped_count = 0
+            # 已拯救种子索引与下载器中的种子hash, 已存在的种子不再下载
+            rescued_index = self._load_rescued_index()
+            downloader_hashes = self._get_downloader_hashes(service_info)
+            # 本次拯救的种子, 任务结束后统一保存下载记录
+            new_records = []
+            # 需要强制作种的种子hash
+            force_hashes = []
+            # 执行中的下载任务
+            running = set()
 
+            def _collect(_futures):
+                nonlocal success_downloaded_count, failed_downloaded_count, skipped_count
+                for _future in _futures:
+                    torrent_id, torrent_hash, record = _future.result()
+                    if torrent_id and torrent_hash:
+                        rescued_index[torrent_id] = torrent_hash
+                    if record:
+                        success_downloaded_count += 1
+                        new_records.append(record)
+                        if torrent_hash:
+                            force_hashes.append(torrent_hash)
+                            downloader_hashes.add(torrent_hash)
+                    elif torrent_hash:
+                        # 种子已在下载器中
+                        skipped_count += 1
+                    else:
+                        failed_downloaded_count += 1
 
-                                        else:
-                                            logger.error(f"下载种子失败: {download_link}")
-                                            failed_downloaded_count += 1
+            executor = ThreadPoolExecutor(max_workers=self._download_workers, thread_name_prefix="HanHanRescue")
+            try:
+                reach_limit = False
+                for page, elements in self._iter_rescue_pages():
+                    for row in self._filter_rescue_rows(self._parse_rescue_rows(elements)):
+                        if self._event.is_set():
+                            logger.info("憨憨保种区任务停止")
+                            reach_limit = True
+                            break
+                        torrent_id = self._get_torrent_id(row.get("download_link"))
+                        if torrent_id and rescued_index.get(torrent_id) in downloader_hashes:
+                            logger.info(f"种子 {torrent_id} 已拯救且仍在下载器中，跳过")
+                            skipped_count += 1
+                            continue
+                        # 检查下载数量限制, 执行中的下载任务同样计入
+                        if self._download_limit > 0:
+                            while running and success_downloaded_count + len(running) >= self._download_limit:
+                                done, running = wait(running, return_when=FIRST_COMPLETED)
+                                _collect(done)
+                            if success_downloaded_count >= self._download_limit:
+                                logger.info(f"已达到单次下载数量限制 ({self._download_limit})，停止下载")
+                                reach_limit = True
+                                break
+                        # 如果做种人数在设定区间内，则下载种子
+                        logger.info(f"下载种子链接: {row.get('download_link')}")
+                        running.add(executor.submit(self._rescue_torrent, service_info, row, downloader_hashes))
+                    if reach_limit:
+                        break
+                done, running = wait(running)
+                _collect(done)
+            finally:
+                executor.shutdown(wait=True)
+                # 统一保存本次的下载记录
+                if new_records:
+                    download_records = self.get_data("download_records") or []
+                    download_records.extend(new_records)
+                    self.save_data(key="download_records", value=download_records)
+                self.save_data(key="rescued_index", value=rescued_index)
 
-                                    except Exception as e:
-                                        logger.error(f"下载种子失败: {str(e)}")
-                                        failed_downloaded_count += 1
-                                else:
-                                    logger.error(f"下载器 {downloader} 未连接或不可用")
-                                    failed_downloaded_count += 1
-                    except Exception as e:
-                        logger.error(f"处理种子时出错: {str(e)}\n{traceback.format_exc()}")
-                        continue
+            # 如果启用了强制继续且是qbittorrent，设置强制作种
+            if force_hashes and self._force_resume and service_info.type == "qbittorrent":
+                try:
+                    # 等待一下让种子添加到下载器
+                    time.sleep(1)
+                    service_info.instance.torrents_set_force_start(ids=force_hashes)
+                    logger.info(f"已设置 {len(force_hashes)} 个种子强制作种")
+                except Exception as e:
+                    logger.error(f"设置强制作种失败: {str(e)}")
 
+            logger.info(f"憨憨保种区任务完成: 成功 {success_downloaded_count}, 失败 {failed_downloaded_count}, "
+                        f"已存在跳过 {skipped_count}")
             # 发送通知
             if self._enable_notification:
                 # 检查是否需要在种子数为0时发送通知
@@ -648,6 +616,215 @@ class HanHanRescueSeeding(_PluginBase):
                     text=f"保种任务执行异常，请查看日志了解详情"
                 )
 
+    def _iter_rescue_pages(self):
+        """
+        并发获取保种区页面, 按页码顺序返回 (页码, 种子元素列表), 遇到请求失败或空页时停止
+        同时请求的页面数量不超过 _page_workers
+        """
+        executor = ThreadPoolExecutor(max_workers=self._page_workers, thread_name_prefix="HanHanRescuePage")
+        futures = {}
+        next_page = 0
+        try:
+            for page in range(0, self._max_pages):
+                if self._event.is_set():
+                    return
+                # 预先提交后续页面的请求
+                while next_page < self._max_pages and next_page < page + self._page_workers:
+                    futures[next_page] = executor.submit(self._get_rescue_page, next_page)
+                    next_page += 1
+                elements = futures.pop(page).result()
+                if not elements:
+                    return
+                yield page, elements
+        finally:
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _get_rescue_page(self, page: int) -> Optional[list]:
+        """
+        获取保种区指定页的种子元素列表
+        """
+        url = "https://" + self.domain + f"/rescue.php?page={page}"
+        logger.info(f"憨憨保种区第{page + 1}页:{url}")
+        self._wait_request_interval()
+        torrent_detail_source = self._get_page_source(url=url, site=self.site)
+        if not torrent_detail_source:
+            logger.error(f"请求憨憨保种区第{page}页失败")
+            return None
+        # logger.debug(f"憨憨保种区第{page + 1}页详情：" +torrent_detail_source)
+        html = etree.HTML(torrent_detail_source)
+        if html is None:
+            logger.error(f"憨憨保种区第{page}页页面解析失败")
+            return None
+        elements = html.xpath('//*[@id="mainContent"]/div[1]/div[2]/div[3]/div')
+        logger.info(f"第{page + 1}页数据获取{len(elements)}条数据")
+        return elements
+
+    def _wait_request_interval(self):
+        """
+        控制请求站点的最小间隔
+        """
+        with self._request_lock:
+            wait_seconds = self._last_request_time + self._request_interval - time.monotonic()
+            if wait_seconds > 0:
+                time.sleep(wait_seconds)
+            self._last_request_time = time.monotonic()
+
+    def _parse_rescue_rows(self, elements: list) -> List[Dict[str, Any]]:
+        """
+        解析保种区页面中的种子元素
+        """
+        rows = []
+        for elem in elements:
+            try:
+                # 在每个找到的元素中再次通过xpath搜索
+                # 做种人数
+                seed = elem.xpath('div[3]/div/div[3]/a')
+                # 英文标题
+                title = elem.xpath('div[2]/div/a')
+                # 中文标题
+                zh_title = elem.xpath('div[2]/div/div[1]/div')
+                # 种子大小
+                size = elem.xpath('div[3]/div/div[1]')
+                sub_elem = seed[0] if len(seed) > 0 else None
+                # 打印子元素的文本内容和链接
+                if sub_elem is not None and sub_elem.text is not None:
+                    logger.info(f"做种人数: {sub_elem.text}")
+                else:
+                    logger.warning(f"未找到做种人数元素或做种人数为空，跳过此种子")
+                    continue
+                # 将 text 转换为整数，处理 "0" 的情况
+                try:
+                    seeders_count = int(sub_elem.text.strip())
+                except (ValueError, AttributeError):
+                    logger.warning(f"做种人数格式错误: {sub_elem.text}，跳过此种子")
+                    continue
+                # 下载链接
+                download_element = elem.xpath('div[4]/div/a')
+                if not download_element or not download_element[0].get('href'):
+                    continue
+                size_text = size[0].text.strip() if size and size[0].text else None
+                rows.append({
+                    "title": title[0].text.strip() if title and title[0].text else "未知标题",
+                    "zh_title": zh_title[0].text.strip() if zh_title and zh_title[0].text else "无中文标题",
+                    "size": size_text,
+                    "size_gb": self._parse_size_to_gb(size_text) if size_text else None,
+                    "seeders": seeders_count,
+                    "download_link": "https://" + self.domain + "/" + download_element[0].get('href')
+                })
+            except Exception as e:
+                logger.error(f"处理种子时出错: {str(e)}\n{traceback.format_exc()}")
+        return rows
+
+    def _filter_rescue_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        使用编译好的过滤条件一次性过滤整页种子，返回做种人数与种子大小均在设定范围内的种子
+        """
+        seeding_filter, size_filter = self._seeding_filter, self._size_filter
+        matched = []
+        for row in rows:
+            if seeding_filter and not seeding_filter.match(row.get("seeders")):
+                continue
+            size_gb = row.get("size_gb")
+            if size_filter and size_gb is not None and not size_filter.match(size_gb):
+                logger.info(f"种子大小 {size_gb:.2f}GB 不在设定范围内 {size_filter}GB，跳过")
+                continue
+            if size_filter and size_gb is None:
+                logger.warning(f"无法解析种子大小: {row.get('size')}，跳过大小检查")
+            matched.append(row)
+        logger.info(f"本页 {len(rows)} 个种子中 {len(matched)} 个符合过滤条件")
+        return matched
+
+    def _rescue_torrent(self, service_info: ServiceInfo, row: Dict[str, Any],
+                        downloader_hashes: set) -> Tuple[Optional[str], Optional[str], Optional[Dict[str, Any]]]:
+        """
+        下载种子文件并添加到下载器
+        返回 (种子ID, 种子hash, 下载记录), 种子已在下载器中时下载记录为None, 失败时均为None
+        """
+        download_link = row.get("download_link")
+        torrent_id = self._get_torrent_id(download_link)
+        try:
+            # 先下载种子文件获取hash
+            self._wait_request_interval()
+            torrent_content, torrent_hash = self._download_torrent(download_link, self.site)
+            if not torrent_content:
+                logger.error(f"下载种子文件失败: {download_link}")
+                return torrent_id, None, None
+            if torrent_hash and torrent_hash in downloader_hashes:
+                logger.info(f"种子 {torrent_hash} 已在下载器中，跳过: {download_link}")
+                return torrent_id, torrent_hash, None
+            # 准备下载参数
+            download_kwargs = {
+                "content": torrent_content,  # 使用下载的种子内容而不是URL
+                "cookie": self.site.cookie
+            }
+            if self._save_path:
+                download_kwargs["download_dir"] = self._save_path
+            # 如果有自定义标签，则添加标签参数
+            if self._custom_tag:
+                if service_info.type == "qbittorrent":
+                    download_kwargs["tag"] = self._custom_tag.split(',')
+                elif service_info.type == "transmission":
+                    download_kwargs["labels"] = self._custom_tag.split(',')
+            logger.debug(f"下载种子参数: {download_kwargs}")
+            # 下载种子文件
+            result = service_info.instance.add_torrent(**download_kwargs)
+            logger.debug(f"下载结果: {result}")
+            if not result:
+                logger.error(f"下载种子失败: {download_link}")
+                return torrent_id, None, None
+            logger.info(f"成功下载种子: {download_link}")
+            return torrent_id, torrent_hash, {
+                "title": row.get("title"),
+                "zh_title": row.get("zh_title"),
+                "size": row.get("size") or "未知大小",
+                "seeders": str(row.get("seeders")),
+                "download_link": download_link,
+                "torrent_hash": torrent_hash,  # 使用下载时计算的种子hash
+                "download_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+        except Exception as e:
+            logger.error(f"下载种子失败: {str(e)}")
+            return torrent_id, None, None
+
+    def _load_rescued_index(self) -> Dict[str, Optional[str]]:
+        """
+        获取已拯救种子的 种子ID -> hash 索引, 首次使用时从下载记录生成
+        """
+        rescued_index = self.get_data("rescued_index")
+        if rescued_index is None:
+            rescued_index = {}
+            for record in self.get_data("download_records") or []:
+                torrent_id = self._get_torrent_id(record.get("download_link"))
+                if torrent_id:
+                    rescued_index[torrent_id] = record.get("torrent_hash")
+        return rescued_index
+
+    @staticmethod
+    def _get_torrent_id(download_link: Optional[str]) -> Optional[str]:
+        """
+        从下载链接中获取种子ID
+        """
+        match = re.search(r'[?&]id=(\d+)', download_link or "")
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _get_downloader_hashes(service_info: ServiceInfo) -> set:
+        """
+        获取下载器中全部种子的hash
+        """
+        try:
+            torrents, error = service_info.instance.get_torrents()
+            if error or not torrents:
+                return set()
+            if service_info.type == "qbittorrent":
+                return {torrent.get("hash") for torrent in torrents if torrent.get("hash")}
+            return {torrent.hashString for torrent in torrents if torrent.hashString}
+        except Exception as e:
+            logger.error(f"获取下载器种子列表失败: {str(e)}")
+            return set()
+
     def _get_page_source(self, url: str, site):
         """
         获取页面资源
@@ -758,6 +935,10 @@ class HanHanRescueSeeding(_PluginBase):
         if not self._user_id:
             logger.error("用户ID未配置，无法执行下载历史保种任务")
             return
+
+        if self._filter_error:
+            logger.error(f"过滤条件配置错误，无法执行下载历史保种任务：{self._filter_error}")
+            return
         
         try:
             # 初始化passkey变量
@@ -765,6 +946,11 @@ class HanHanRescueSeeding(_PluginBase):
             downloaded_count = 0
             success_downloaded_count = 0
             failed_downloaded_count = 0
+            # 已拯救种子索引与下载器中的种子hash, 已存在的种子不再下载
+            rescued_index = self._load_rescued_index()
+            service_info = self.downloader_helper.get_service(self._downloader)
+            downloader_hashes = self._get_downloader_hashes(service_info) \
+                if service_info and service_info.instance else set()
             
             # 遍历页面，从page=0开始
             page = 0
@@ -839,68 +1025,23 @@ class HanHanRescueSeeding(_PluginBase):
                         logger.info(f"种子 {torrent_id}: {title}, 大小: {size}, 做种人数: {seeders}")
                         
                         # 检查做种人数是否在设定区间内
-                        seeding_count_str = str(self._seeding_count)
-                        is_in_range = False
-                        
-                        if '-' in seeding_count_str:
-                            # 范围格式，如 1-3
-                            range_parts = seeding_count_str.split('-')
-                            if len(range_parts) == 2:
-                                try:
-                                    lower_bound = int(range_parts[0])
-                                    upper_bound = int(range_parts[1])
-                                    if lower_bound <= seeders <= upper_bound:
-                                        is_in_range = True
-                                except ValueError:
-                                    logger.error(f"无效的范围格式: {seeding_count_str}")
-                                    continue
-                        else:
-                            # 单个数字格式，检查做种人数是否小于该数字
-                            try:
-                                if seeders <= int(seeding_count_str):
-                                    is_in_range = True
-                            except ValueError:
-                                logger.error(f"无效的数字格式: {seeding_count_str}")
-                                continue
-                        
-                        if not is_in_range:
-                            logger.info(f"种子 {torrent_id} 做种人数 {seeders} 不在设定范围内 {seeding_count_str}，跳过")
+                        if self._seeding_filter and not self._seeding_filter.match(seeders):
+                            logger.info(f"种子 {torrent_id} 做种人数 {seeders} 不在设定范围内 {self._seeding_filter}，跳过")
                             continue
                         
                         # 检查种子大小是否在设定范围内
-                        if self._torrent_size:
+                        if self._size_filter:
                             size_gb = self._parse_size_to_gb(size)
-                            if size_gb is not None:
-                                torrent_size_str = str(self._torrent_size)
-                                size_in_range = False
-                                
-                                if '-' in torrent_size_str:
-                                    # 范围格式，如 1-5
-                                    range_parts = torrent_size_str.split('-')
-                                    if len(range_parts) == 2:
-                                        try:
-                                            lower_bound = float(range_parts[0])
-                                            upper_bound = float(range_parts[1])
-                                            if lower_bound <= size_gb <= upper_bound:
-                                                size_in_range = True
-                                        except ValueError:
-                                            logger.error(f"无效的种子大小范围格式: {torrent_size_str}")
-                                            continue
-                                else:
-                                    # 单个数字格式，检查种子大小是否小于该数字
-                                    try:
-                                        if size_gb <= float(torrent_size_str):
-                                            size_in_range = True
-                                    except ValueError:
-                                        logger.error(f"无效的种子大小数字格式: {torrent_size_str}")
-                                        continue
-                                
-                                if not size_in_range:
-                                    logger.info(f"种子 {torrent_id} 大小 {size_gb:.2f}GB 不在设定范围内 {torrent_size_str}GB，跳过")
-                                    continue
-                            else:
+                            if size_gb is None:
                                 logger.warning(f"无法解析种子大小: {size}，跳过大小检查")
+                            elif not self._size_filter.match(size_gb):
+                                logger.info(f"种子 {torrent_id} 大小 {size_gb:.2f}GB 不在设定范围内 {self._size_filter}GB，跳过")
+                                continue
                         
+                        if rescued_index.get(torrent_id) in downloader_hashes:
+                            logger.info(f"种子 {torrent_id} 已拯救且仍在下载器中，跳过")
+                            continue
+
                         # 如果passkey为空，访问第一个种子的详情页获取passkey
                         if not passkey:
                             first_detail_url = f"https://{self.domain}/{detail_link}"
@@ -941,6 +1082,11 @@ class HanHanRescueSeeding(_PluginBase):
                             logger.error(f"下载种子文件失败: {download_link}")
                             failed_downloaded_count += 1
                             continue
+                        if torrent_hash:
+                            rescued_index[torrent_id] = torrent_hash
+                            if torrent_hash in downloader_hashes:
+                                logger.info(f"种子 {torrent_hash} 已在下载器中，跳过: {torrent_id}")
+                                continue
                         
                         # 调用下载器下载种子
                         downloader = self._downloader
@@ -1021,6 +1167,9 @@ class HanHanRescueSeeding(_PluginBase):
                 if self._download_limit > 0 and success_downloaded_count >= self._download_limit:
                     break
                 page += 1
+
+            # 保存已拯救种子索引
+            self.save_data(key="rescued_index", value=rescued_index)
             
             # 发送通知
             if self._enable_notification:
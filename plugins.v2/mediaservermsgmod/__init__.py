@@ -1,5 +1,4 @@
 import re
-import threading
 import time
 from typing import Any, List, Dict, Tuple, Optional
 
@@ -10,6 +9,7 @@ from app.helper.mediaserver import MediaServerHelper
 from app.log import logger
 from app.modules.themoviedb import CategoryHelper
 from app.plugins import _PluginBase
+from app.plugins.mediaservermsgmod.timer_wheel import TimerWheel
 from app.schemas import WebhookEventInfo, ServiceInfo, MediaServerItem
 from app.schemas.types import EventType, MediaType, MediaImageType, NotificationType
 from app.utils.web import WebUtils
@@ -37,7 +37,7 @@ class MediaServerMsgMod(_PluginBase):
     # 插件图标
     plugin_icon = "mediaplay.png"
     # 插件版本
-    plugin_version = "1.8.2.1"
+    plugin_version = "1.8.2.2"
     # 插件作者
     plugin_author = "jxxghp,Seed680"
     # 作者主页
@@ -60,7 +60,7 @@ class MediaServerMsgMod(_PluginBase):
     # TV剧集消息聚合配置
     _aggregate_time = DEFAULT_AGGREGATE_TIME   # 聚合时间窗口（秒）
     _pending_messages = {}                     # 待聚合的消息 {series_key: [event_info, ...]}
-    _aggregate_timers = {}                     # 聚合定时器 {series_key: timer}
+    _aggregate_timer: Optional[TimerWheel] = None  # 聚合定时器，按 series_key 调度
 
     # Webhook事件映射配置
     _webhook_actions = {
@@ -104,6 +104,9 @@ class MediaServerMsgMod(_PluginBase):
             self._aggregate_enabled = config.get("aggregate_enabled", False)
             self._aggregate_time = int(config.get("aggregate_time", self.DEFAULT_AGGREGATE_TIME))
 
+        if not self._aggregate_timer:
+            self._aggregate_timer = TimerWheel(name="MediaServerMsgAggregate")
+
 
     def service_infos(self, type_filter: Optional[str] = None) -> Optional[Dict[str, ServiceInfo]]:
         """
@@ -672,20 +675,11 @@ class MediaServerMsgMod(_PluginBase):
             logger.debug(f"添加消息到待处理列表: series_id={series_id}")
             self._pending_messages[series_id].append(event_info)
 
-            # 如果已经有定时器，取消它并重新设置
-            if series_id in self._aggregate_timers:
-                logger.debug(f"取消已存在的定时器: {series_id}")
-                try:
-                    self._aggregate_timers[series_id].cancel()
-                except Exception as e:
-                    logger.debug(f"取消定时器时出错: {str(e)}")
-
-            # 设置新的定时器
-            logger.debug(f"设置新的定时器，将在 {self._aggregate_time} 秒后触发")
+            # 设置定时器，已存在时重新计时
+            logger.debug(f"设置定时器，将在 {self._aggregate_time} 秒后触发")
             try:
-                timer = threading.Timer(self._aggregate_time, self._send_aggregated_message, [series_id])
-                self._aggregate_timers[series_id] = timer
-                timer.start()
+                self._aggregate_timer.schedule(series_id, self._aggregate_time,
+                                               self._send_aggregated_message, series_id)
             except Exception as e:
                 logger.error(f"设置定时器时出错: {str(e)}")
                 # 如果定时器设置失败，直接发送消息
@@ -711,14 +705,16 @@ class MediaServerMsgMod(_PluginBase):
         # 获取该series_id的所有待处理消息
         if series_id not in self._pending_messages or not self._pending_messages[series_id]:
             logger.debug(f"消息队列为空或不存在: {series_id}")
-            # 清除定时器引用
-            self._aggregate_timers.pop(series_id, None)
+            # 取消定时器
+            if self._aggregate_timer:
+                self._aggregate_timer.cancel(series_id)
             return
 
         events = self._pending_messages.pop(series_id)
         logger.debug(f"从队列中获取 {len(events)} 条消息: {series_id}")
-        # 清除定时器引用
-        self._aggregate_timers.pop(series_id, None)
+        # 取消定时器，插件退出时直接发送的消息不再重复触发
+        if self._aggregate_timer:
+            self._aggregate_timer.cancel(series_id)
 
         # 构造聚合消息
         if not events:
@@ -1217,11 +1213,16 @@ class MediaServerMsgMod(_PluginBase):
 
         在插件被停用或系统关闭时调用，确保：
         1. 所有待处理的聚合消息被立即发送出去
-        2. 所有正在进行的定时器被取消
+        2. 聚合定时器被停止
         3. 清空所有内部缓存数据
         """
         try:
-            # 发送所有待处理的聚合消息
+            # 停止定时器并立即发送已调度的聚合消息
+            if self._aggregate_timer:
+                self._aggregate_timer.stop(flush=True)
+                self._aggregate_timer = None
+
+            # 发送剩余未调度的聚合消息
             pending_series_ids = list(self._pending_messages.keys())
             for series_id in pending_series_ids:
                 # 直接发送消息而不依赖定时器
@@ -1230,14 +1231,6 @@ class MediaServerMsgMod(_PluginBase):
                 except Exception as e:
                     logger.error(f"发送聚合消息时出错: {str(e)}")
 
-            # 取消所有定时器
-            for timer in self._aggregate_timers.values():
-                try:
-                    timer.cancel()
-                except Exception as e:
-                    logger.debug(f"取消定时器时出错: {str(e)}")
-
-            self._aggregate_timers.clear()
             self._pending_messages.clear()
 
             # 清理缓存
@@ -2,9 +2,11 @@ import datetime
 import os
 import re
 import shutil
+import tempfile
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from threading import Lock
 from typing import Any, List, Dict, Tuple, Optional
 from xml.dom import minidom
 
@@ -37,9 +39,6 @@ from app.utils.http import RequestUtils
 from app.utils.system import SystemUtils
 from app.modules.filemanager.transhandler import TransHandler
 
-ffmpeg_lock = threading.Lock()
-lock = Lock()
-
 
 class FileMonitorHandler(FileSystemEventHandler):
     """
@@ -66,7 +65,7 @@ class ShortPlayMonitorMod(_PluginBase):
     # 插件图标
     plugin_icon = "Amule_B.png"
     # 插件版本
-    plugin_version = "1.7.3"
+    plugin_version = "1.7.4"
     # 插件作者
     plugin_author = "thsrite,Seed680"
     # 作者主页
@@ -95,6 +94,19 @@ class ShortPlayMonitorMod(_PluginBase):
     _notify = False
     _medias = {}
     filemanager = None
+    # 全量同步时的整理并发数
+    _transfer_workers = 4
+    # 同时运行的ffmpeg数量
+    _ffmpeg_workers = 2
+    _ffmpeg_semaphore = threading.BoundedSemaphore(2)
+    _medias_lock = threading.Lock()
+    _dir_locks = {}
+    _dir_locks_lock = threading.Lock()
+    # 全量同步进度
+    _sync_stats = {}
+    _sync_stats_lock = threading.Lock()
+    # 退出事件
+    _event = threading.Event()
 
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
@@ -119,6 +131,9 @@ class ShortPlayMonitorMod(_PluginBase):
             self._monitor_confs = config.get("monitor_confs")
             self._exclude_keywords = config.get("exclude_keywords") or ""
             self._transfer_type = config.get("transfer_type") or "link"
+            self._transfer_workers = self.__to_int(config.get("transfer_workers"), 4)
+            self._ffmpeg_workers = self.__to_int(config.get("ffmpeg_workers"), 2)
+        self._ffmpeg_semaphore = threading.BoundedSemaphore(self._ffmpeg_workers)
 
         # 停止现有任务
         self.stop_service()
@@ -217,19 +232,128 @@ class ShortPlayMonitorMod(_PluginBase):
             self.__update_config()
             self.__handle_image()
 
+    @staticmethod
+    def __to_int(value: Any, default: int) -> int:
+        """
+        转换为正整数，无效时使用默认值
+        """
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
     def sync_all(self):
         """
         立即运行一次，全量同步目录中所有文件
+        遍历目录、整理文件、刮削（NFO与缩略图）分阶段并发执行
         """
-        logger.info("开始全量同步短剧监控目录 ...")
-        # 遍历所有监控目录
-        for mon_path in self._dirconf.keys():
-            # 遍历目录下所有文件
-            for file_path in SystemUtils.list_files(Path(mon_path), settings.RMT_MEDIAEXT):
-                self.__handle_file(is_directory=Path(file_path).is_dir(),
-                                   event_path=str(file_path),
-                                   source_dir=mon_path)
-        logger.info("全量同步短剧监控目录完成！")
+        with self._sync_stats_lock:
+            if self._sync_stats.get("running"):
+                logger.warn("全量同步正在运行中，跳过本次执行")
+                return
+            self._sync_stats = {
+                "running": True,
+                "total": 0,
+                "transferred": 0,
+                "skipped": 0,
+                "scraped": 0,
+                "start_time": time.time(),
+                "end_time": None
+            }
+        logger.info(f"开始全量同步短剧监控目录，整理并发数：{self._transfer_workers}，"
+                    f"ffmpeg并发数：{self._ffmpeg_workers} ...")
+        transfer_executor = ThreadPoolExecutor(max_workers=self._transfer_workers,
+                                               thread_name_prefix="ShortPlayTransfer")
+        scrape_executor = ThreadPoolExecutor(max_workers=self._ffmpeg_workers,
+                                             thread_name_prefix="ShortPlayScrape")
+        running = set()
+        try:
+            for mon_path, file_path in self.__walk_monitor_dirs():
+                # 控制待整理队列长度，避免一次性提交全部文件
+                while len(running) >= self._transfer_workers * 2:
+                    _, running = wait(running, return_when=FIRST_COMPLETED)
+                self.__update_sync_stats("total")
+                running.add(transfer_executor.submit(self.__sync_file, file_path, mon_path, scrape_executor))
+            wait(running)
+        finally:
+            # 整理任务全部完成后才不再提交刮削任务
+            transfer_executor.shutdown(wait=True)
+            scrape_executor.shutdown(wait=True)
+            with self._dir_locks_lock:
+                self._dir_locks = {}
+            with self._sync_stats_lock:
+                self._sync_stats["running"] = False
+                self._sync_stats["end_time"] = time.time()
+        progress = self.__get_sync_progress()
+        logger.info(f"全量同步短剧监控目录完成！共 {progress.get('total')} 个文件，"
+                    f"整理 {progress.get('transferred')} 个，刮削 {progress.get('scraped')} 个，"
+                    f"跳过 {progress.get('skipped')} 个，耗时 {progress.get('elapsed')} 秒")
+
+    def __walk_monitor_dirs(self):
+        """
+        逐个遍历监控目录，边遍历边返回 (监控目录, 媒体文件路径)
+        """
+        for mon_path in list(self._dirconf.keys()):
+            for root, dirs, files in os.walk(mon_path):
+                for name in files:
+                    if self._event.is_set():
+                        logger.info("短剧监控服务已停止，终止全量同步")
+                        return
+                    if Path(name).suffix.lower() not in settings.RMT_MEDIAEXT:
+                        continue
+                    yield mon_path, os.path.join(root, name)
+
+    def __sync_file(self, event_path: str, source_dir: str, scrape_executor: ThreadPoolExecutor):
+        """
+        全量同步时整理一个文件，整理完成后提交刮削任务
+        """
+        if self._event.is_set():
+            return
+        task = self.__transfer_file(is_directory=False, event_path=event_path, source_dir=source_dir)
+        if not task:
+            self.__update_sync_stats("skipped")
+            return
+        self.__update_sync_stats("transferred")
+        scrape_executor.submit(self.__sync_scrape_file, task)
+
+    def __sync_scrape_file(self, task: dict):
+        """
+        全量同步时刮削一个文件
+        """
+        if self._event.is_set():
+            return
+        self.__scrape_file(task)
+        self.__update_sync_stats("scraped")
+        logger.info(f"文件 {task.get('event_path')} 处理完成")
+
+    def __update_sync_stats(self, key: str):
+        """
+        更新全量同步进度
+        """
+        with self._sync_stats_lock:
+            self._sync_stats[key] = self._sync_stats.get(key, 0) + 1
+
+    def __get_sync_progress(self) -> Dict[str, Any]:
+        """
+        获取全量同步进度与处理速度
+        """
+        with self._sync_stats_lock:
+            stats = dict(self._sync_stats)
+        if not stats:
+            return {"running": False}
+        start_time = stats.get("start_time") or time.time()
+        elapsed = (stats.get("end_time") or time.time()) - start_time
+        processed = stats.get("transferred", 0) + stats.get("skipped", 0)
+        stats.update({
+            "start_time": datetime.datetime.fromtimestamp(start_time).strftime("%Y-%m-%d %H:%M:%S"),
+            "end_time": datetime.datetime.fromtimestamp(stats.get("end_time")).strftime("%Y-%m-%d %H:%M:%S")
+            if stats.get("end_time") else None,
+            "elapsed": round(elapsed, 1),
+            # 每分钟处理的文件数
+            "throughput": round(processed * 60 / elapsed, 1) if elapsed > 0 else 0
+        })
+        return stats
 
     def __handle_image(self):
         """
@@ -295,12 +419,25 @@ class ShortPlayMonitorMod(_PluginBase):
 
     def __handle_file(self, is_directory: bool, event_path: str, source_dir: str):
         """
-        同步一个文件
+        同步一个文件，依次完成整理与刮削
+        :event.is_directory
+        :param event_path: 事件文件路径
+        :param source_dir: 监控目录
+        """
+        task = self.__transfer_file(is_directory=is_directory, event_path=event_path, source_dir=source_dir)
+        if task:
+            self.__scrape_file(task)
+        logger.info(f"文件 {event_path} 处理完成")
+
+    def __transfer_file(self, is_directory: bool, event_path: str, source_dir: str) -> Optional[dict]:
+        """
+        整理一个文件（硬链接/上传），成功时返回刮削所需的信息
         :event.is_directory
         :param event_path: 事件文件路径
         :param source_dir: 监控目录
         """
         logger.info(f"文件 {event_path} 开始处理")
+        task = None
         try:
             # 转移路径
             dest_dir = self._dirconf.get(source_dir)
@@ -445,7 +582,7 @@ class ShortPlayMonitorMod(_PluginBase):
                 # 目标文件夹不存在则创建
                 if store_conf == "local" and not Path(target_path).exists():
                     logger.info(f"创建目标文件夹 {target_path}")
-                    os.makedirs(target_path)
+                    os.makedirs(target_path, exist_ok=True)
             else:
                 # 媒体重命名
                 try:
@@ -463,7 +600,7 @@ class ShortPlayMonitorMod(_PluginBase):
                 # 目标文件夹不存在则创建
                 if store_conf == "local" and not Path(target_path).parent.exists():
                     logger.info(f"创建目标文件夹 {Path(target_path).parent}")
-                    os.makedirs(Path(target_path).parent)
+                    os.makedirs(Path(target_path).parent, exist_ok=True)
 
                 # 文件：nfo、图片、视频文件
                 if store_conf == "local" and Path(target_path).exists():
@@ -481,7 +618,8 @@ class ShortPlayMonitorMod(_PluginBase):
                     # 目的操作对象
                     target_oper = self.filemanager._FileManagerModule__get_storage_oper(store_conf)
                     if not source_oper or not target_oper:
-                        return None, f"不支持的存储类型：{store_conf}"
+                        logger.error(f"不支持的存储类型：{store_conf}")
+                        return None
                     file_item = FileItem()
                     file_item.storage = "local"
                     file_item.path = event_path
@@ -504,151 +642,199 @@ class ShortPlayMonitorMod(_PluginBase):
                         logger.info(f"文件 {event_path} 硬链接完成")
                     else:
                         logger.info(f"文件 {event_path} 上传完成")
-                    # 生成 tvshow.nfo
-                    logger.debug(f"文件 {event_path} 生成 tvshow.nfo开始")
-                    logger.debug(f"store_conf: {store_conf}")
-                    if store_conf == "local":
-                        logger.debug(f"tvshow.nfo exists: {(target_path.parent / 'tvshow.nfo').exists()}")
+                    task = {
+                        "event_path": event_path,
+                        "target_path": Path(target_path),
+                        "title": title,
+                        "rename_conf": rename_conf,
+                        "cover_conf": cover_conf,
+                        "store_conf": store_conf
+                    }
+                else:
+                    logger.error(f"文件 {event_path} 硬链接失败，错误码：{retcode}")
+            if self._notify:
+                # 发送消息汇总
+                self.__append_media(title=title, event_path=event_path)
+        except Exception as e:
+            logger.error(f"event_handler_created error: {e}", exc_info=True)
+            return None
+        return task
+
+    def __scrape_file(self, task: dict):
+        """
+        为整理完成的文件生成 tvshow.nfo 与缩略图
+        同一目录的刮削串行执行，避免同一部短剧重复生成封面
+        """
+        event_path = task.get("event_path")
+        target_path = task.get("target_path")
+        title = task.get("title")
+        rename_conf = task.get("rename_conf")
+        cover_conf = task.get("cover_conf")
+        store_conf = task.get("store_conf")
+        # 网盘存储时在本地临时目录生成文件后上传，每个文件独立目录，互不影响
+        tmp_dir = Path(tempfile.mkdtemp(prefix="shortplaymonitormod_")) if store_conf != "local" else None
+        try:
+            with self.__get_dir_lock(target_path.parent):
+                # 生成 tvshow.nfo
+                logger.debug(f"文件 {event_path} 生成 tvshow.nfo开始")
+                logger.debug(f"store_conf: {store_conf}")
+                if store_conf == "local":
+                    logger.debug(f"tvshow.nfo exists: {(target_path.parent / 'tvshow.nfo').exists()}")
+                else:
+                    logger.debug(
+                        f"tvshow.nfo exists: "
+                        f"{self.filemanager.get_file_item(store_conf, (target_path.parent / 'tvshow.nfo'))}")
+
+                if store_conf == "local" and not (target_path.parent / "tvshow.nfo").exists():
+                    self.__gen_tv_nfo_file(dir_path=target_path.parent,
+                                           title=title)
+                # 内存生成nfo
+                if (store_conf != "local"
+                        and None == self.filemanager.get_file_item(store_conf, (target_path.parent /
+                                                                                "tvshow.nfo"))):
+                    if not (tmp_dir / target_path.parent.relative_to(
+                            Path("/")) / "tvshow.nfo").exists():
+                        os.makedirs(
+                            Path(tmp_dir / target_path.parent.relative_to(Path("/"))))
+                        self.__gen_tv_nfo_file(
+                            dir_path=(tmp_dir / target_path.parent.relative_to(Path("/"))),
+                            title=title)
+                        file_item = FileItem()
+                        file_item.storage = "local"
+                        file_item.path = str(tmp_dir / target_path.parent.relative_to(
+                            Path("/")) / "tvshow.nfo")
+                        # 源操作对象
+                        source_oper = self.filemanager._FileManagerModule__get_storage_oper("local")
+                        # 目的操作对象
+                        target_oper = self.filemanager._FileManagerModule__get_storage_oper(store_conf)
+                        if not source_oper or not target_oper:
+                            logger.error(f"不支持的存储类型：{store_conf}")
+                            return
+
+                        new_item, errmsg = TransHandler._TransHandler__transfer_command(
+                            fileitem=file_item,
+                            target_storage=store_conf,
+                            target_file=Path(target_path.parent / "tvshow.nfo"),
+                            transfer_type=self._transfer_type,
+                            source_oper=source_oper, target_oper=target_oper)
+                        if new_item:
+                            logger.debug(f"文件 {Path(target_path.parent / 'tvshow.nfo')} 整理完成")
+                        else:
+                            logger.debug((f"文件 {Path(target_path.parent / 'tvshow.nfo')} 整理失败:{errmsg}"))
+                logger.debug(f"文件 {event_path} 生成 tvshow.nfo结束")
+                logger.debug(f"文件 {event_path} 生成缩略图开始")
+                if store_conf == "local":
+                    logger.debug(f"tvshow.nfo exists: {(target_path.parent / 'poster.jpg').exists()}")
+                else:
+                    logger.debug(
+                        f"tvshow.nfo exists: "
+                        f"{self.filemanager.get_file_item(store_conf, (target_path.parent / 'poster.jpg'))}")
+                # 生成缩略图
+                if (store_conf == "local" and not (target_path.parent / "poster.jpg").exists()):
+                    thumb_path = self.gen_file_thumb(title=title,
+                                                     rename_conf=rename_conf,
+                                                     file_path=target_path)
+                    if thumb_path and Path(thumb_path).exists():
+                        self.__save_poster(input_path=thumb_path,
+                                           poster_path=target_path.parent / "poster.jpg",
+                                           cover_conf=cover_conf)
+                        if (target_path.parent / "poster.jpg").exists():
+                            logger.info(f"{target_path.parent / 'poster.jpg'} 缩略图已生成")
+                        thumb_path.unlink()
                     else:
-                        logger.debug(
-                            f"tvshow.nfo exists: "
-                            f"{self.filemanager.get_file_item(store_conf, (target_path.parent / 'tvshow.nfo'))}")
-
-                    if store_conf == "local" and not (target_path.parent / "tvshow.nfo").exists():
-                        self.__gen_tv_nfo_file(dir_path=target_path.parent,
-                                               title=title)
-                    # 内存生成nfo
-                    if (store_conf != "local"
-                            and None == self.filemanager.get_file_item(store_conf, (target_path.parent /
-                                                                                    "tvshow.nfo"))):
-                        if not ("/tmp/shortplaymonitormod" / target_path.parent.relative_to(
-                                Path("/")) / "tvshow.nfo").exists():
-                            os.makedirs(
-                                Path("/tmp/shortplaymonitormod" / target_path.parent.relative_to(Path("/"))))
-                            self.__gen_tv_nfo_file(
-                                dir_path=("/tmp/shortplaymonitormod" / target_path.parent.relative_to(Path("/"))),
-                                title=title)
+                        # 检查是否有缩略图
+                        thumb_files = SystemUtils.list_files(directory=target_path.parent,
+                                                             extensions=[".jpg"])
+                        if thumb_files:
+                            # 生成poster
+                            for thumb in thumb_files:
+                                self.__save_poster(input_path=thumb,
+                                                   poster_path=target_path.parent / "poster.jpg",
+                                                   cover_conf=cover_conf)
+                                break
+                            # 删除多余jpg
+                            for thumb in thumb_files:
+                                Path(thumb).unlink()
+                if (store_conf != "local"
+                        and None == self.filemanager.get_file_item(store_conf,
+                                                                   (target_path.parent / "poster.jpg"))):
+                    # 没有缩略图 则本地生成
+                    thumb_path = self.gen_file_thumb(title=title,
+                                                     rename_conf=rename_conf,
+                                                     file_path=Path(event_path),
+                                                     to_thumb_path=tmp_dir /
+                                                                   target_path.parent.relative_to(
+                                                                       Path("/")))
+                    if thumb_path and Path(thumb_path).exists():
+                        self.__save_poster(input_path=thumb_path,
+                                           poster_path=tmp_dir /
+                                                       target_path.parent.relative_to(
+                                                           Path("/")) / "poster.jpg",
+                                           cover_conf=cover_conf)
+                        if (tmp_dir / target_path.parent.relative_to(
+                                Path("/")) / "poster.jpg").exists():
                             file_item = FileItem()
                             file_item.storage = "local"
-                            file_item.path = str("/tmp/shortplaymonitormod" / target_path.parent.relative_to(
-                                Path("/")) / "tvshow.nfo")
+                            file_item.path = str(
+                                tmp_dir / target_path.parent.relative_to(
+                                    Path("/")) / "poster.jpg")
                             # 源操作对象
                             source_oper = self.filemanager._FileManagerModule__get_storage_oper("local")
                             # 目的操作对象
                             target_oper = self.filemanager._FileManagerModule__get_storage_oper(store_conf)
                             if not source_oper or not target_oper:
-                                return None, f"不支持的存储类型：{store_conf}"
-
+                                logger.error(f"不支持的存储类型：{store_conf}")
+                                return
                             new_item, errmsg = TransHandler._TransHandler__transfer_command(
                                 fileitem=file_item,
                                 target_storage=store_conf,
-                                target_file=Path(target_path.parent / "tvshow.nfo"),
-                                transfer_type=self._transfer_type,
-                                source_oper=source_oper, target_oper=target_oper)
+                                target_file=Path(target_path.parent / "poster.jpg"),
+                                transfer_type=self._transfer_type, source_oper=source_oper,
+                                target_oper=target_oper)
                             if new_item:
-                                logger.debug(f"文件 {Path(target_path.parent / 'tvshow.nfo')} 整理完成")
-                            else:
-                                logger.debug((f"文件 {Path(target_path.parent / 'tvshow.nfo')} 整理失败:{errmsg}"))
-                    logger.debug(f"文件 {event_path} 生成 tvshow.nfo结束")
-                    logger.debug(f"文件 {event_path} 生成缩略图开始")
-                    if store_conf == "local":
-                        logger.debug(f"tvshow.nfo exists: {(target_path.parent / 'poster.jpg').exists()}")
-                    else:
-                        logger.debug(
-                            f"tvshow.nfo exists: "
-                            f"{self.filemanager.get_file_item(store_conf, (target_path.parent / 'poster.jpg'))}")
-                    # 生成缩略图
-                    if (store_conf == "local" and not (target_path.parent / "poster.jpg").exists()):
-                        thumb_path = self.gen_file_thumb(title=title,
-                                                         rename_conf=rename_conf,
-                                                         file_path=target_path)
-                        if thumb_path and Path(thumb_path).exists():
-                            self.__save_poster(input_path=thumb_path,
-                                               poster_path=target_path.parent / "poster.jpg",
-                                               cover_conf=cover_conf)
-                            if (target_path.parent / "poster.jpg").exists():
-                                logger.info(f"{target_path.parent / 'poster.jpg'} 缩略图已生成")
+                                logger.debug(f"{target_path.parent / 'poster.jpg'} 缩略图已整理")
+                            logger.info(f"{target_path.parent / 'poster.jpg'} 缩略图已生成")
                             thumb_path.unlink()
-                        else:
-                            # 检查是否有缩略图
-                            thumb_files = SystemUtils.list_files(directory=target_path.parent,
-                                                                 extensions=[".jpg"])
-                            if thumb_files:
-                                # 生成poster
-                                for thumb in thumb_files:
-                                    self.__save_poster(input_path=thumb,
-                                                       poster_path=target_path.parent / "poster.jpg",
-                                                       cover_conf=cover_conf)
-                                    break
-                                # 删除多余jpg
-                                for thumb in thumb_files:
-                                    Path(thumb).unlink()
-                    if (store_conf != "local"
-                            and None == self.filemanager.get_file_item(store_conf,
-                                                                       (target_path.parent / "poster.jpg"))):
-                        # 没有缩略图 则本地生成
-                        thumb_path = self.gen_file_thumb(title=title,
-                                                         rename_conf=rename_conf,
-                                                         file_path=Path(event_path),
-                                                         to_thumb_path="/tmp/shortplaymonitormod" /
-                                                                       target_path.parent.relative_to(
-                                                                           Path("/")))
-                        if thumb_path and Path(thumb_path).exists():
-                            self.__save_poster(input_path=thumb_path,
-                                               poster_path="/tmp/shortplaymonitormod" /
-                                                           target_path.parent.relative_to(
-                                                               Path("/")) / "poster.jpg",
-                                               cover_conf=cover_conf)
-                            if ("/tmp/shortplaymonitormod" / target_path.parent.relative_to(
-                                    Path("/")) / "poster.jpg").exists():
-                                file_item = FileItem()
-                                file_item.storage = "local"
-                                file_item.path = str(
-                                    "/tmp/shortplaymonitormod" / target_path.parent.relative_to(
-                                        Path("/")) / "poster.jpg")
-                                # 源操作对象
-                                source_oper = self.filemanager._FileManagerModule__get_storage_oper("local")
-                                # 目的操作对象
-                                target_oper = self.filemanager._FileManagerModule__get_storage_oper(store_conf)
-                                if not source_oper or not target_oper:
-                                    return None, f"不支持的存储类型：{store_conf}"
-                                new_item, errmsg = TransHandler._TransHandler__transfer_command(
-                                    fileitem=file_item,
-                                    target_storage=store_conf,
-                                    target_file=Path(target_path.parent / "poster.jpg"),
-                                    transfer_type=self._transfer_type, source_oper=source_oper,
-                                    target_oper=target_oper)
-                                if new_item:
-                                    logger.debug(f"{target_path.parent / 'poster.jpg'} 缩略图已整理")
-                                logger.info(f"{target_path.parent / 'poster.jpg'} 缩略图已生成")
-                                thumb_path.unlink()
-                else:
-                    logger.error(f"文件 {event_path} 硬链接失败，错误码：{retcode}")
-            if self._notify:
-                # 发送消息汇总
-                media_list = self._medias.get(title) or {}
-                if media_list:
-                    media_files = media_list.get("files") or []
-                    if media_files:
-                        if str(event_path) not in media_files:
-                            media_files.append(str(event_path))
-                    else:
-                        media_files = [str(event_path)]
-                    media_list = {
-                        "files": media_files,
-                        "time": datetime.datetime.now()
-                    }
-                else:
-                    media_list = {
-                        "files": [str(event_path)],
-                        "time": datetime.datetime.now()
-                    }
-                self._medias[title] = media_list
         except Exception as e:
-            logger.error(f"event_handler_created error: {e}", exc_info=True)
-        if Path('/tmp/shortplaymonitormod/').exists():
-            shutil.rmtree('/tmp/shortplaymonitormod/')
-        logger.info(f"文件 {event_path} 处理完成")
+            logger.error(f"文件 {event_path} 刮削失败: {e}", exc_info=True)
+        finally:
+            if tmp_dir and tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def __get_dir_lock(self, dir_path: Path) -> threading.Lock:
+        """
+        获取目录锁
+        """
+        with self._dir_locks_lock:
+            dir_lock = self._dir_locks.get(str(dir_path))
+            if not dir_lock:
+                dir_lock = threading.Lock()
+                self._dir_locks[str(dir_path)] = dir_lock
+            return dir_lock
+
+    def __append_media(self, title: str, event_path: str):
+        """
+        记录入库文件，用于汇总发送消息
+        """
+        with self._medias_lock:
+            media_list = self._medias.get(title) or {}
+            if media_list:
+                media_files = media_list.get("files") or []
+                if media_files:
+                    if str(event_path) not in media_files:
+                        media_files.append(str(event_path))
+                else:
+                    media_files = [str(event_path)]
+                media_list = {
+                    "files": media_files,
+                    "time": datetime.datetime.now()
+                }
+            else:
+                media_list = {
+                    "files": [str(event_path)],
+                    "time": datetime.datetime.now()
+                }
+            self._medias[title] = media_list
 
     def send_msg(self):
         """
@@ -690,21 +876,19 @@ class ShortPlayMonitorMod(_PluginBase):
         :param target_file: 目标文件路径
         :param transfer_type: RmtMode转移方式
         """
-        with lock:
-
-            # 转移
-            if transfer_type == 'link':
-                # 硬链接
-                retcode, retmsg = SystemUtils.link(file_item, target_file)
-            elif transfer_type == 'filesoftlink':
-                # 软链接
-                retcode, retmsg = SystemUtils.softlink(file_item, target_file)
-            elif transfer_type == 'move':
-                # 移动
-                retcode, retmsg = SystemUtils.move(file_item, target_file)
-            else:
-                # 复制
-                retcode, retmsg = SystemUtils.copy(file_item, target_file)
+        # 转移
+        if transfer_type == 'link':
+            # 硬链接
+            retcode, retmsg = SystemUtils.link(file_item, target_file)
+        elif transfer_type == 'filesoftlink':
+            # 软链接
+            retcode, retmsg = SystemUtils.softlink(file_item, target_file)
+        elif transfer_type == 'move':
+            # 移动
+            retcode, retmsg = SystemUtils.move(file_item, target_file)
+        else:
+            # 复制
+            retcode, retmsg = SystemUtils.copy(file_item, target_file)
 
         if retcode != 0:
             logger.error(retmsg)
@@ -971,8 +1155,8 @@ class ShortPlayMonitorMod(_PluginBase):
             if Path(thumb_path).exists():
                 logger.info(f"{file_path} 缩略图已生成：{thumb_path}")
                 return thumb_path
-        # 单线程处理
-        with ffmpeg_lock:
+        # 限制同时运行的ffmpeg数量
+        with self._ffmpeg_semaphore:
             try:
                 if not to_thumb_path:
                     thumb_path = file_path.with_name(file_path.stem + "-thumb.jpg")
@@ -1021,7 +1205,9 @@ class ShortPlayMonitorMod(_PluginBase):
             "interval": self._interval,
             "notify": self._notify,
             "image": self._image,
-            "monitor_confs": self._monitor_confs
+            "monitor_confs": self._monitor_confs,
+            "transfer_workers": self._transfer_workers,
+            "ffmpeg_workers": self._ffmpeg_workers
         })
 
     def get_state(self) -> bool:
@@ -1032,7 +1218,15 @@ class ShortPlayMonitorMod(_PluginBase):
         pass
 
     def get_api(self) -> List[Dict[str, Any]]:
-        pass
+        return [
+            {
+                "path": "/sync_progress",
+                "endpoint": self.__get_sync_progress,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "获取全量同步进度"
+            }
+        ]
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
@@ -1118,7 +1312,7 @@ class ShortPlayMonitorMod(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 3
                                 },
                                 'content': [
                                     {
@@ -1140,7 +1334,7 @@ class ShortPlayMonitorMod(_PluginBase):
                                 'component': 'VCol',
                                 'props': {
                                     'cols': 12,
-                                    'md': 6
+                                    'md': 3
                                 },
                                 'content': [
                                     {
@@ -1152,6 +1346,40 @@ class ShortPlayMonitorMod(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'transfer_workers',
+                                            'label': '整理并发数',
+                                            'placeholder': '4'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'ffmpeg_workers',
+                                            'label': 'ffmpeg并发数',
+                                            'placeholder': '2'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
@@ -1274,11 +1502,97 @@ class ShortPlayMonitorMod(_PluginBase):
             "interval": 10,
             "monitor_confs": "",
             "exclude_keywords": "",
-            "transfer_type": "link"
+            "transfer_type": "link",
+            "transfer_workers": 4,
+            "ffmpeg_workers": 2
         }
 
     def get_page(self) -> List[dict]:
-        pass
+        progress = self.__get_sync_progress()
+        if not progress.get("start_time"):
+            return [
+                {
+                    'component': 'div',
+                    'text': '暂无全量同步记录',
+                    'props': {
+                        'class': 'text-center',
+                    }
+                }
+            ]
+        items = [
+            ("状态", "同步中" if progress.get("running") else "已完成"),
+            ("开始时间", progress.get("start_time")),
+            ("结束时间", progress.get("end_time") or "-"),
+            ("已发现文件", progress.get("total")),
+            ("已整理", progress.get("transferred")),
+            ("已刮削", progress.get("scraped")),
+            ("已跳过", progress.get("skipped")),
+            ("耗时(秒)", progress.get("elapsed")),
+            ("处理速度(个/分钟)", progress.get("throughput"))
+        ]
+        return [
+            {
+                'component': 'VRow',
+                'content': [
+                    {
+                        'component': 'VCol',
+                        'props': {
+                            'cols': 12,
+                        },
+                        'content': [
+                            {
+                                'component': 'VTable',
+                                'props': {
+                                    'hover': True
+                                },
+                                'content': [
+                                    {
+                                        'component': 'thead',
+                                        'content': [
+                                            {
+                                                'component': 'th',
+                                                'props': {
+                                                    'class': 'text-start ps-4'
+                                                },
+                                                'text': '全量同步'
+                                            },
+                                            {
+                                                'component': 'th',
+                                                'props': {
+                                                    'class': 'text-start ps-4'
+                                                },
+                                                'text': ''
+                                            }
+                                        ]
+                                    },
+                                    {
+                                        'component': 'tbody',
+                                        'content': [
+                                            {
+                                                'component': 'tr',
+                                                'props': {
+                                                    'class': 'text-sm'
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'td',
+                                                        'text': name
+                                                    },
+                                                    {
+                                                        'component': 'td',
+                                                        'text': str(value)
+                                                    }
+                                                ]
+                                            } for name, value in items
+                                        ]
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
 
     def stop_service(self):
         """
@@ -1288,7 +1602,9 @@ class ShortPlayMonitorMod(_PluginBase):
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
                 if self._scheduler.running:
+                    self._event.set()
                     self._scheduler.shutdown()
+                    self._event.clear()
                 self._scheduler = None
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e), exc_info=True)
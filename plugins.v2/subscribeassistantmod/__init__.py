@@ -1,8 +1,8 @@
 import json
 import random
-import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Optional, Union, Callable
@@ -36,6 +36,9 @@ from app.schemas.subscribe import Subscribe as SchemaSubscribe
 from app.schemas.types import EventType, ChainEventType, MediaType, NotificationType
 from app.utils.string import StringUtils
 from app.db.subscribe_oper import SubscribeOper
+from app.plugins.subscribeassistantmod.task_store import TaskStore
+from app.plugins.subscribeassistantmod.timer_wheel import TimerWheel
+from app.plugins.subscribeassistantmod.tracker_matcher import TrackerResponseMatcher
 lock = threading.RLock()
 
 
@@ -47,7 +50,7 @@ class SubscribeAssistantMod(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/InfinityPacer/MoviePilot-Plugins/main/icons/subscribeassistant.png"
     # 插件版本
-    plugin_version = "2.7.5.2"
+    plugin_version = "2.7.6.9"
     # 插件作者
     plugin_author = "InfinityPacer,Seed680"
     # 作者主页
@@ -87,10 +90,14 @@ class SubscribeAssistantMod(_PluginBase):
     _tracker_response = None
     # Tracker响应关键字集合
     _tracker_responses = []
+    # Tracker响应关键字匹配器
+    _tracker_matcher: Optional[TrackerResponseMatcher] = None
     # 删除后触发搜索补全
     _auto_search_when_delete = False
     # 跳过删除记录
     _skip_deletion = True
+    # 删除试运行，仅记录将要删除的种子
+    _delete_dry_run = False
     # 超时删除时间（小时）
     _download_timeout = 3
     # 超时记录清理时间（小时）
@@ -145,6 +152,21 @@ class SubscribeAssistantMod(_PluginBase):
     _scheduler = None
     # 退出事件
     _event = threading.Event()
+    # 下载检查时单次批量获取的种子数量
+    _torrent_snapshot_batch_size = 200
+    # 任务存储（订阅任务、下载种子任务、删除记录）
+    _task_store: Optional[TaskStore] = None
+    # TMDB剧集缓存有效期（秒），播出中的季较短，已完结的季较长
+    _tmdb_episodes_airing_ttl = 2 * 3600
+    _tmdb_episodes_ended_ttl = 7 * 24 * 3600
+    # TMDB剧集缓存
+    _tmdb_episodes_cache: Optional[dict] = None
+    _tmdb_episodes_cache_changed = False
+    _tmdb_episodes_cache_lock = threading.Lock()
+    # 补全搜索定时器
+    _search_timer: Optional[TimerWheel] = None
+    # 元数据检查时并发识别媒体信息的线程数
+    _media_prefetch_workers = 8
     # 分集洗版排除内容类型
     _tv_episode_exclude_type = []
     _all_cat = None
@@ -159,6 +181,9 @@ class SubscribeAssistantMod(_PluginBase):
         self.subscribe_oper = SubscribeOper()
         self.category = CategoryHelper()
         self.tmdb = TmdbApi()
+        if not self._task_store:
+            self._task_store = TaskStore(db_path=self.get_data_path() / "tasks.db",
+                                         legacy_loader=lambda key: self.__get_data(key=key))
         if not config:
             return
 
@@ -174,7 +199,13 @@ class SubscribeAssistantMod(_PluginBase):
                                        keyword.strip()]
         else:
             self._tracker_responses = []
-        self._tracker_response_listen = config.get("tracker_response_listen", True)
+        self._tracker_matcher = TrackerResponseMatcher(self._tracker_responses)
+        if self._tracker_matcher.invalid_patterns:
+            for pattern, err in self._tracker_matcher.invalid_patterns:
+                logger.error(f"Tracker响应关键字 {pattern} 不是有效的正则表达式，已忽略：{err}")
+            # 移除格式错误的关键字，保存配置时一并更新
+            self._tracker_responses = self._tracker_matcher.patterns
+            self._tracker_response = "\n".join(self._tracker_responses)
         self._auto_search_when_delete = config.get("auto_search_when_delete", True)
         self._delete_exclude_tags = config.get("delete_exclude_tags", "H&R")
         self._auto_tv_pending = config.get("auto_tv_pending", True)
@@ -182,6 +213,7 @@ class SubscribeAssistantMod(_PluginBase):
         self._meta_check_interval = config.get("meta_check_interval", 6)
         self._auto_download_pending = config.get("auto_download_pending", True)
         self._skip_deletion = config.get("skip_deletion", True)
+        self._delete_dry_run = config.get("delete_dry_run", False)
         self._reset_task = config.get("reset_task", False)
         type_mapping = {
             "tv": {MediaType.TV},
@@ -217,8 +249,12 @@ class SubscribeAssistantMod(_PluginBase):
         self._tv_episode_exclude_type = config.get("tv_episode_exclude_type", [])
         self._all_cat = [*self.category.tv_categorys, *self.category.movie_categorys]
 
-        # 停止现有任务
-        self.stop_service()
+        # 停止现有任务，插件保持启用时保留补全搜索定时器，避免保存配置时丢失未到期的搜索
+        self.__stop_scheduler()
+        if not self._enabled:
+            self.__stop_search_timer()
+        elif not self._search_timer:
+            self._search_timer = TimerWheel(name="SubscribeAssistantSearch")
 
         self._scheduler = BackgroundScheduler(timezone=settings.TZ)
         self._scheduler.start()
@@ -667,6 +703,29 @@ class SubscribeAssistantMod(_PluginBase):
                                                 ]
                                             }
                                         ]
+                                    },
+                                    {
+                                        'component': 'VRow',
+                                        'content': [
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 4
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSwitch',
+                                                        'props': {
+                                                            'model': 'delete_dry_run',
+                                                            'label': '删除试运行',
+                                                            'hint': '仅在日志中记录将要删除的种子及耗时，不实际删除',
+                                                            'persistent-hint': True
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        ]
                                     }
                                 ]
                             },
@@ -1228,6 +1287,7 @@ class SubscribeAssistantMod(_PluginBase):
             "manual_delete_listen": True,
             "auto_search_when_delete": True,
             "skip_deletion": True,
+            "delete_dry_run": False,
             "download_timeout": 3,
             "timeout_history_cleanup": 24,
             "delete_exclude_tags": "H&R",
@@ -1301,6 +1361,16 @@ class SubscribeAssistantMod(_PluginBase):
         """
         退出插件
         """
+        self.__stop_scheduler()
+        self.__stop_search_timer()
+        if self._task_store:
+            self._task_store.close()
+            self._task_store = None
+
+    def __stop_scheduler(self):
+        """
+        停止定时服务
+        """
         try:
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
@@ -1312,6 +1382,14 @@ class SubscribeAssistantMod(_PluginBase):
         except Exception as e:
             print(str(e))
 
+    def __stop_search_timer(self):
+        """
+        停止补全搜索定时器，未到期的补全搜索直接丢弃，订阅本身仍会按计划搜索
+        """
+        if self._search_timer:
+            self._search_timer.stop()
+            self._search_timer = None
+
     @staticmethod
     def __get_float_config(config: dict, key: str, default: float) -> float:
         """
@@ -1344,6 +1422,7 @@ class SubscribeAssistantMod(_PluginBase):
             "auto_best_type": self._auto_best_type,
             "auto_best_clear_history_type": self._auto_best_clear_history_type,
             "skip_deletion": self._skip_deletion,
+            "delete_dry_run": self._delete_dry_run,
             "download_timeout": self._download_timeout,
             "timeout_history_cleanup": self._timeout_history_cleanup,
             "auto_tv_pending_days": self._auto_tv_pending_days,
@@ -1374,9 +1453,7 @@ class SubscribeAssistantMod(_PluginBase):
             logger.info(f"待定订阅 {self.__format_subscribe(subscribe)} 已重置订阅状态为 R，手动更新集数状态为 False")
         SubscribeChain().check()
 
-        self.__save_data("subscribes", {})
-        self.__save_data("torrents", {})
-        self.__save_data("deletes", {})
+        self._task_store.clear("subscribes", "torrents", "deletes")
         self.__save_data("states", {})
         logger.info("已重置所有订阅任务、下载种子任务和超时删除记录")
 
@@ -1423,13 +1500,14 @@ class SubscribeAssistantMod(_PluginBase):
         """
         洗版检查
         """
+        start_time = time.time()
         subscribes = self.subscribe_oper.list(state="N,R,P")
         if not subscribes:
             return
 
-        logger.info("开始检查订阅洗版...")
+        logger.info(f"开始检查订阅洗版，加载 {len(subscribes)} 个订阅耗时 {time.time() - start_time:.2f} 秒...")
         self.process_best_version_complete(subscribes)
-        logger.info("订阅洗版检查完成...")
+        logger.info(f"订阅洗版检查完成，总耗时 {time.time() - start_time:.2f} 秒...")
 
     @eventmanager.register(EventType.PluginAction)
     def toggle_subscribe_state(self, event: Event = None):
@@ -1746,7 +1824,7 @@ class SubscribeAssistantMod(_PluginBase):
 
         # 检查是否开启下载自动待定，并且当前是否处于待定状态
         if self._auto_download_pending:
-            subscribe_tasks = self.__get_data(key="subscribes")
+            subscribe_tasks = self._task_store.get("subscribes")
             subscribe_task, exists = self.__initialize_subscribe_task(subscribe=subscribe,
                                                                       subscribe_tasks=subscribe_tasks)
 
@@ -1765,7 +1843,7 @@ class SubscribeAssistantMod(_PluginBase):
             logger.debug("跳过删除记录功能未开启，跳过处理")
             return
 
-        delete_tasks = self.__get_data("deletes")
+        delete_tasks = self._task_store.get("deletes")
         if not delete_tasks:
             return
 
@@ -2057,10 +2135,8 @@ class SubscribeAssistantMod(_PluginBase):
         if not downloader or not download_hash:
             return
 
-        with lock:
-            # 获取订阅任务和种子任务数据
-            subscribe_tasks = self.__get_data(key="subscribes")
-            torrent_tasks = self.__get_data(key="torrents")
+        # 获取订阅任务和种子任务数据，退出时保存变更
+        with self._task_store.transaction("subscribes", "torrents") as (subscribe_tasks, torrent_tasks):
             if download_hash not in torrent_tasks:
                 return
             torrent_task = torrent_tasks[download_hash]
@@ -2068,9 +2144,6 @@ class SubscribeAssistantMod(_PluginBase):
             self.__clean_invalid_torrents(invalid_torrent_hashes=[download_hash], subscribe_tasks=subscribe_tasks,
                                           torrent_tasks=torrent_tasks)
             logger.info(f"订阅种子 {torrent_desc} 已整理入库，整理类型：{transfer_info.transfer_type}，相关订阅任务已清理")
-            # 保存更新后的数据
-            self.__save_data(key="subscribes", value=subscribe_tasks)
-            self.__save_data(key="torrents", value=torrent_tasks)
 
     def __get_downloader_service(self, downloader: str) -> Optional[ServiceInfo]:
         """
@@ -2427,28 +2500,91 @@ class SubscribeAssistantMod(_PluginBase):
                 self._tracker_response_listen or self._auto_download_pending):
             return
 
-        with lock:
-            # 获取订阅任务和种子任务数据
-            subscribe_tasks = self.__get_data(key="subscribes")
-            torrent_tasks = self.__get_data(key="torrents")
+        # 在锁外一次性获取订阅以及下载器中的种子快照，避免请求下载器时阻塞事件处理
+        snapshot_tasks = self._task_store.get("torrents")
+        subscribes, services, torrents = self.__get_download_snapshot(torrent_tasks=snapshot_tasks)
+        # 获取订阅任务和种子任务数据，退出时仅保存发生变化的任务
+        with self._task_store.transaction("subscribes", "torrents") as (subscribe_tasks, torrent_tasks):
             # 处理下载种子任务
-            self.__process_download_task(subscribe_tasks=subscribe_tasks, torrent_tasks=torrent_tasks)
+            self.__process_download_task(subscribe_tasks=subscribe_tasks, torrent_tasks=torrent_tasks,
+                                         subscribes=subscribes, services=services, torrents=torrents,
+                                         snapshot_hashes=set(snapshot_tasks.keys()))
             # 重置订阅待定状态
-            self.__reset_subscribe_task_pending(subscribe_tasks=subscribe_tasks)
-            # 保存更新后的数据
-            self.__save_data(key="subscribes", value=subscribe_tasks)
-            self.__save_data(key="torrents", value=torrent_tasks)
+            self.__reset_subscribe_task_pending(subscribe_tasks=subscribe_tasks, subscribes=subscribes)
 
-    def __process_download_task(self, subscribe_tasks: dict, torrent_tasks: dict):
+    def __get_download_snapshot(self, torrent_tasks: dict) \
+            -> Tuple[Dict[str, Subscribe], Dict[str, Optional[ServiceInfo]], Dict[str, Optional[dict]]]:
+        """
+        获取下载检查所需的数据快照，订阅一次查询，每个下载器的种子批量获取
+        :param torrent_tasks: 下载任务字典
+        :return: 订阅字典（订阅ID->订阅）、下载器服务字典（下载器->服务）、
+                 种子字典（下载器->{种子hash: 种子}，下载器未连接或获取失败时为None）
+        """
+        subscribes = {str(subscribe.id): subscribe for subscribe in self.subscribe_oper.list() or []}
+
+        downloader_hashes: Dict[str, List[str]] = {}
+        for torrent_hash, torrent_task in torrent_tasks.items():
+            downloader_hashes.setdefault(torrent_task.get("downloader"), []).append(torrent_hash)
+
+        services: Dict[str, Optional[ServiceInfo]] = {}
+        torrents: Dict[str, Optional[dict]] = {}
+        for downloader, torrent_hashes in downloader_hashes.items():
+            service = self.__get_downloader_service(downloader=downloader)
+            services[downloader] = service
+            torrents[downloader] = None
+            if not service or service.instance.is_inactive():
+                continue
+            downloader_torrents = {}
+            batch_size = self._torrent_snapshot_batch_size
+            for i in range(0, len(torrent_hashes), batch_size):
+                batch_torrents, error = service.instance.get_torrents(ids=torrent_hashes[i:i + batch_size])
+                if error:
+                    logger.warning(f"获取下载器 {downloader} 种子信息出错，请稍后重试")
+                    downloader_torrents = None
+                    break
+                for torrent in batch_torrents or []:
+                    torrent_hash = self.__get_torrent_hash(torrent=torrent, dl_type=service.type)
+                    if torrent_hash:
+                        downloader_torrents[torrent_hash] = torrent
+            if downloader_torrents is not None:
+                logger.debug(f"下载器 {downloader} 共 {len(torrent_hashes)} 个种子任务，"
+                             f"获取到 {len(downloader_torrents)} 个种子")
+            torrents[downloader] = downloader_torrents
+        return subscribes, services, torrents
+
+    @staticmethod
+    def __get_torrent_hash(torrent: Any, dl_type: str) -> Optional[str]:
+        """
+        获取种子hash
+        """
+        if dl_type == "qbittorrent":
+            return torrent.get("hash")
+        return torrent.hashString
+
+    def __process_download_task(self, subscribe_tasks: dict, torrent_tasks: dict, subscribes: Dict[str, Subscribe],
+                                services: Dict[str, Optional[ServiceInfo]], torrents: Dict[str, Optional[dict]],
+                                snapshot_hashes: set):
         """
         处理下载种子任务并清理异常种子
         :param subscribe_tasks: 订阅任务字典
         :param torrent_tasks: 下载任务字典
+        :param subscribes: 订阅快照
+        :param services: 下载器服务快照
+        :param torrents: 下载器种子快照
+        :param snapshot_hashes: 快照中包含的种子hash
         """
         # 用于存储异常的种子
         invalid_torrent_hashes = []
         triggered_subscribe_ids = set()
+        # 满足删除条件的种子，按下载器汇总后批量删除
+        pending_deletions: Dict[str, List[dict]] = {}
+        # 需要记录到删除记录中的种子任务，最后统一写入
+        deleted_tasks: List[dict] = []
+        scan_start_time = time.time()
         for torrent_hash, torrent_task in list(torrent_tasks.items()):
+            if torrent_hash not in snapshot_hashes:
+                # 获取快照后新增的种子任务，下次检查时再处理
+                continue
             subscribe_id = torrent_task.get("subscribe_id")
             subscribe_info = torrent_task.get("subscribe_info")
             username = torrent_task.get("username")
@@ -2471,7 +2607,7 @@ class SubscribeAssistantMod(_PluginBase):
                 invalid_torrent_hashes.append(torrent_hash)
                 continue
 
-            subscribe = self.subscribe_oper.get(subscribe_id)
+            subscribe = subscribes.get(str(subscribe_id))
             if not subscribe:
                 logger.debug(f"数据库中未找到相关的订阅信息，种子任务: {torrent_desc}")
                 invalid_torrent_hashes.append(torrent_hash)
@@ -2485,30 +2621,27 @@ class SubscribeAssistantMod(_PluginBase):
             if not self.__check_subscribe_status(subscribe=subscribe):
                 continue
 
-            subscribe_torrent_tasks = subscribe_task.get("torrent_tasks") or []
-            subscribe_torrent_task = {}
-            for task in subscribe_torrent_tasks:
-                if task.get("hash") == torrent_hash:
-                    subscribe_torrent_task = task
-                    break
+            subscribe_torrent_tasks = self.__get_subscribe_torrent_tasks(subscribe_task=subscribe_task)
+            subscribe_torrent_task = subscribe_torrent_tasks.get(torrent_hash)
 
             if not subscribe_torrent_task:
                 logger.debug(f"未找到对应的订阅种子任务，种子任务: {torrent_desc}")
                 invalid_torrent_hashes.append(torrent_hash)
                 continue
 
-            service = self.__get_downloader_service(downloader=downloader)
+            service = services.get(downloader)
             if not service:
                 logger.debug(f"获取下载器 {downloader} 实例失败，请检查配置，种子任务: {torrent_desc}")
                 invalid_torrent_hashes.append(torrent_hash)
                 continue
 
-            if service.instance.is_inactive():
-                logger.debug(f"下载器 {service.name} 未连接")
+            downloader_torrents = torrents.get(downloader)
+            if downloader_torrents is None:
+                logger.debug(f"下载器 {service.name} 未连接或获取种子失败")
                 # 部分情况下，下载器可能会失联，这里不在直接移除种子
                 continue
 
-            torrent = self.__get_torrents(downloader=service.instance, torrent_hashes=torrent_hash)
+            torrent = downloader_torrents.get(torrent_hash)
             if not torrent:
                 logger.info(f"没有获取到对应的种子详情，种子可能已被删除，种子任务: {torrent_desc}")
                 if not manual_check or not self._manual_delete_listen:
@@ -2519,7 +2652,8 @@ class SubscribeAssistantMod(_PluginBase):
                                                       subscribe_torrent_tasks=subscribe_torrent_tasks,
                                                       triggered_subscribe_ids=triggered_subscribe_ids,
                                                       torrent_hash=torrent_hash, torrent_task=torrent_task,
-                                                      torrent_tasks=torrent_tasks, reason="订阅种子手动删除")
+                                                      torrent_tasks=torrent_tasks, deleted_tasks=deleted_tasks,
+                                                      reason="订阅种子手动删除")
                     continue
 
             torrent_info = self.__get_torrent_info(torrent=torrent, dl_type=service.type)
@@ -2535,26 +2669,17 @@ class SubscribeAssistantMod(_PluginBase):
                 if torrent_hash in torrent_tasks:
                     del torrent_tasks[torrent_hash]
 
-                subscribe_task["torrent_tasks"] = [
-                    task for task in subscribe_torrent_tasks if task.get("hash") != torrent_hash
-                ]
+                subscribe_torrent_tasks.pop(torrent_hash, None)
             else:
                 logger.debug(f"种子任务 {torrent_desc} 尚未完成，下载时长 {download_time / 3600 :.2f}")
 
                 deletion_reason = None
                 # 1. 判断 Tracker 响应关键字是否满足删除条件
-                if self._tracker_response_listen and self._tracker_responses:
+                if self._tracker_response_listen and self._tracker_matcher:
                     tracker_responses = torrent_info.get("tracker_responses") or []
                     if tracker_responses:
-                        matched_keyword = None
-                        for pattern in self._tracker_responses:
-                            for response in tracker_responses:
-                                # 使用正则匹配（可在 pattern 内部或通过 re.I 忽略大小写）
-                                if re.search(pattern, response, re.I):
-                                    matched_keyword = pattern
-                                    break
-                            if matched_keyword:
-                                break
+                        # 使用预编译的合并正则匹配（忽略大小写）
+                        matched_keyword = self._tracker_matcher.match(tracker_responses)
                         if matched_keyword:
                             deletion_reason = f"订阅种子，命中 Tracker 响应关键字（{matched_keyword}）"
 
@@ -2580,24 +2705,80 @@ class SubscribeAssistantMod(_PluginBase):
                             continue
 
                 logger.info(f"种子任务 {torrent_desc} 满足删除条件：{deletion_reason}，即将删除并从订阅种子任务中移除")
-                self.__delete_torrents(downloader=service.instance, torrent_hashes=torrent_hash)
+                pending_deletions.setdefault(downloader, []).append({
+                    "service": service,
+                    "torrent_hash": torrent_hash,
+                    "torrent_desc": torrent_desc,
+                    "subscribe": subscribe,
+                    "subscribe_task": subscribe_task,
+                    "subscribe_torrent_tasks": subscribe_torrent_tasks,
+                    "torrent_task": torrent_task,
+                    "reason": deletion_reason,
+                })
+
+        self.__delete_pending_torrents(pending_deletions=pending_deletions, torrent_tasks=torrent_tasks,
+                                       triggered_subscribe_ids=triggered_subscribe_ids, deleted_tasks=deleted_tasks,
+                                       scan_time=time.time() - scan_start_time)
+
+        self.__clean_invalid_torrents(invalid_torrent_hashes, subscribe_tasks, torrent_tasks)
+
+        # 批量记录删除记录
+        if deleted_tasks:
+            self.__with_lock_and_update_delete_tasks(method=self.__update_or_add_delete_tasks,
+                                                     torrent_tasks=deleted_tasks)
+
+    def __delete_pending_torrents(self, pending_deletions: Dict[str, List[dict]], torrent_tasks: dict,
+                                  triggered_subscribe_ids: set, deleted_tasks: List[dict], scan_time: float):
+        """
+        按下载器批量删除满足删除条件的种子，删除成功后清理种子任务
+        :param pending_deletions: 待删除的种子（下载器->删除项列表）
+        :param torrent_tasks: 所有种子任务的字典
+        :param triggered_subscribe_ids: 被触发的订阅 ID 集合
+        :param deleted_tasks: 需要记录到删除记录中的种子任务
+        :param scan_time: 扫描耗时（秒）
+        """
+        if not pending_deletions:
+            return
+
+        total = sum(len(items) for items in pending_deletions.values())
+        if self._delete_dry_run:
+            for downloader, items in pending_deletions.items():
+                for item in items:
+                    logger.info(f"【试运行】下载器 {downloader} 将删除种子任务 {item['torrent_desc']}：{item['reason']}")
+            logger.info(f"【试运行】共 {total} 个种子满足删除条件，涉及 {len(pending_deletions)} 个下载器，"
+                        f"扫描耗时 {scan_time:.2f} 秒，未实际删除")
+            return
+
+        delete_start_time = time.time()
+        deleted_count = 0
+        for downloader, items in pending_deletions.items():
+            start_time = time.time()
+            torrent_hashes = [item["torrent_hash"] for item in items]
+            deleted = self.__delete_torrents(downloader=items[0]["service"].instance, torrent_hashes=torrent_hashes)
+            logger.info(f"下载器 {downloader} 批量删除 {len(torrent_hashes)} 个种子"
+                        f"{'完成' if deleted else '失败，将在下次检查时重试'}，耗时 {time.time() - start_time:.2f} 秒")
+            if not deleted:
+                continue
+            deleted_count += len(items)
+            for item in items:
                 self.__clean_torrent_task_by_hash(
-                    subscribe=subscribe,
-                    subscribe_task=subscribe_task,
-                    subscribe_torrent_tasks=subscribe_torrent_tasks,
+                    subscribe=item["subscribe"],
+                    subscribe_task=item["subscribe_task"],
+                    subscribe_torrent_tasks=item["subscribe_torrent_tasks"],
                     triggered_subscribe_ids=triggered_subscribe_ids,
-                    torrent_hash=torrent_hash,
-                    torrent_task=torrent_task,
+                    torrent_hash=item["torrent_hash"],
+                    torrent_task=item["torrent_task"],
                     torrent_tasks=torrent_tasks,
-                    reason=deletion_reason
+                    deleted_tasks=deleted_tasks,
+                    reason=item["reason"]
                 )
-
-        self.__clean_invalid_torrents(invalid_torrent_hashes, subscribe_tasks, torrent_tasks)
+        logger.info(f"共删除 {deleted_count}/{total} 个种子，扫描耗时 {scan_time:.2f} 秒，"
+                    f"删除耗时 {time.time() - delete_start_time:.2f} 秒")
 
     def __clean_torrent_task_by_hash(self, subscribe: Subscribe, subscribe_task: dict,
-                                     subscribe_torrent_tasks: list[dict], triggered_subscribe_ids: set,
+                                     subscribe_torrent_tasks: Dict[str, dict], triggered_subscribe_ids: set,
                                      torrent_hash: str, torrent_task: dict, torrent_tasks: dict,
-                                     reason: str):
+                                     deleted_tasks: List[dict], reason: str):
         """
           清理并更新种子下载记录
 
@@ -2608,33 +2789,33 @@ class SubscribeAssistantMod(_PluginBase):
           :param torrent_hash: 种子哈希值
           :param torrent_task: 当前种子任务信息
           :param torrent_tasks: 所有种子任务的字典
+          :param deleted_tasks: 需要记录到删除记录中的种子任务
+          :param reason: 原因
           """
         if torrent_hash in torrent_tasks:
             del torrent_tasks[torrent_hash]
 
-        subscribe_task["torrent_tasks"] = [
-            task for task in subscribe_torrent_tasks if task.get("hash") != torrent_hash
-        ]
+        subscribe_torrent_tasks.pop(torrent_hash, None)
 
-        # 记录删除记录
-        self.__with_lock_and_update_delete_tasks(method=self.__update_or_add_delete_tasks,
-                                                 torrent_task=torrent_task)
+        # 记录删除记录，由调用方统一写入
+        deleted_tasks.append(torrent_task)
 
         # 处理删除后续逻辑
         self.__handle_timeout_seed_deletion(subscribe=subscribe, subscribe_task=subscribe_task,
                                             torrent_task=torrent_task,
                                             triggered_subscribe_ids=triggered_subscribe_ids, reason=reason)
 
-    def __reset_subscribe_task_pending(self, subscribe_tasks: dict):
+    def __reset_subscribe_task_pending(self, subscribe_tasks: dict, subscribes: Dict[str, Subscribe]):
         """
        重置订阅待定状态
 
        :param subscribe_tasks: 订阅任务
+       :param subscribes: 订阅快照
        """
         if not subscribe_tasks:
             return
         for subscribe_id, subscribe_task in subscribe_tasks.items():
-            subscribe = self.subscribe_oper.get(sid=subscribe_id)
+            subscribe = subscribes.get(str(subscribe_id))
             if not self.__check_subscribe_status(subscribe=subscribe):
                 continue
             pending = self.__get_subscribe_task_pending(subscribe_task=subscribe_task)
@@ -2711,9 +2892,25 @@ class SubscribeAssistantMod(_PluginBase):
         triggered_subscribe_ids.add(subscribe.id)
         logger.info(f"{self.__format_subscribe(subscribe)}，{reason}，触发补全搜索任务，"
                     f"任务将在 {random_minutes:.2f} 分钟后触发")
-        timer = threading.Timer(random_minutes * 60,
-                                lambda sid=subscribe.id: SubscribeChain().search(sid=sid))
-        timer.start()
+        self.__schedule_subscribe_search(subscribe_id=subscribe.id, delay=random_minutes * 60)
+
+    def __schedule_subscribe_search(self, subscribe_id: int, delay: float):
+        """
+        延迟触发订阅补全搜索，同一订阅已有待执行的搜索时不重复添加
+        :param subscribe_id: 订阅ID
+        :param delay: 延迟时间（秒）
+        """
+        search_timer = self._search_timer
+        if not search_timer:
+            return
+        key = f"search-{subscribe_id}"
+        if key in search_timer:
+            logger.debug(f"订阅 {subscribe_id} 已有待执行的补全搜索任务")
+            return
+        try:
+            search_timer.schedule(key, delay, lambda sid=subscribe_id: SubscribeChain().search(sid=sid))
+        except RuntimeError as e:
+            logger.debug(f"订阅 {subscribe_id} 补全搜索任务添加失败：{str(e)}")
 
     def __clean_invalid_torrents(self, invalid_torrent_hashes: list, subscribe_tasks: dict, torrent_tasks: dict):
         """
@@ -2735,9 +2932,7 @@ class SubscribeAssistantMod(_PluginBase):
 
             # 从订阅任务中移除异常种子
             for subscribe_task in subscribe_tasks.values():
-                subscribe_task["torrent_tasks"] = [
-                    task for task in subscribe_task.get("torrent_tasks", []) if task.get("hash") != torrent_hash
-                ]
+                self.__get_subscribe_torrent_tasks(subscribe_task=subscribe_task).pop(torrent_hash, None)
 
     @staticmethod
     def __get_torrent_desc(torrent_hash: str, torrent_task: dict) -> str:
@@ -2853,8 +3048,12 @@ class SubscribeAssistantMod(_PluginBase):
         if not subscribes:
             return
 
+        # 在锁外并发识别媒体信息，锁内只串行处理订阅任务
+        subscribes = self.__prefetch_media(subscribes=subscribes,
+                                           predicate=lambda s: not s.best_version)
         self.__with_lock_and_update_subscribe_tasks(method=self.__process_subscribe_pause,
                                                     subscribes=subscribes)
+        self.__save_tmdb_episodes_cache()
 
     def __process_subscribe_pause(self, subscribe_tasks: dict, subscribes: list[Subscribe]):
         """
@@ -2863,7 +3062,9 @@ class SubscribeAssistantMod(_PluginBase):
         :param subscribes: 订阅对象列表
         """
         for data in subscribes:
-            if isinstance(data, tuple):
+            # 已预先识别的订阅不再重复识别
+            prefetched = isinstance(data, tuple)
+            if prefetched:
                 subscribe, mediainfo = data
             else:
                 subscribe = data
@@ -2898,7 +3099,7 @@ class SubscribeAssistantMod(_PluginBase):
                         )
 
                 # 自动识别媒体信息
-                if not mediainfo:
+                if not mediainfo and not prefetched:
                     mediainfo = self.__recognize_media(subscribe)
 
                 if not mediainfo:
@@ -3075,9 +3276,7 @@ class SubscribeAssistantMod(_PluginBase):
             random_minutes = random.uniform(3, 5)
             logger.info(f"{self.__format_subscribe(subscribe)}，启用订阅，触发补全搜索任务，"
                         f"任务将在 {random_minutes:.2f} 分钟后触发")
-            timer = threading.Timer(random_minutes * 60,
-                                    lambda sid=subscribe.id: SubscribeChain().search(sid=sid))
-            timer.start()
+            self.__schedule_subscribe_search(subscribe_id=subscribe.id, delay=random_minutes * 60)
 
         target_state = subscribe.state
         if pause and subscribe.state != "S":
@@ -3208,7 +3407,12 @@ class SubscribeAssistantMod(_PluginBase):
         if not subscribes:
             return
 
+        # 在锁外并发识别媒体信息，锁内只串行处理订阅任务
+        subscribes = self.__prefetch_media(
+            subscribes=subscribes,
+            predicate=lambda s: not s.best_version and s.type == MediaType.TV.value and s.state in ["N", "R", "P"])
         self.__with_lock_and_update_subscribe_tasks(method=self.__process_tv_pending, subscribes=subscribes)
+        self.__save_tmdb_episodes_cache()
 
     def __process_tv_pending(self, subscribe_tasks: dict, subscribes: list[Subscribe]):
         """
@@ -3217,7 +3421,9 @@ class SubscribeAssistantMod(_PluginBase):
         :param subscribes: 订阅对象列表
         """
         for data in subscribes:
-            if isinstance(data, tuple):
+            # 已预先识别的订阅不再重复识别
+            prefetched = isinstance(data, tuple)
+            if prefetched:
                 subscribe, mediainfo = data
             else:
                 subscribe = data
@@ -3238,7 +3444,7 @@ class SubscribeAssistantMod(_PluginBase):
                     continue
 
                 # 自动识别媒体信息
-                if not mediainfo:
+                if not mediainfo and not prefetched:
                     mediainfo = self.__recognize_media(subscribe)
 
                 if not mediainfo:
@@ -3262,9 +3468,7 @@ class SubscribeAssistantMod(_PluginBase):
                     random_minutes = random.uniform(3, 5)
                     logger.info(f"{self.__format_subscribe(subscribe)}，新增订阅触发补全搜索任务，"
                                 f"任务将在 {random_minutes:.2f} 分钟后触发")
-                    timer = threading.Timer(random_minutes * 60,
-                                            lambda sid=subscribe.id: SubscribeChain().search(sid=sid))
-                    timer.start()
+                    self.__schedule_subscribe_search(subscribe_id=subscribe.id, delay=random_minutes * 60)
 
                 subscribe_task, exists = self.__initialize_subscribe_task(subscribe=subscribe,
                                                                           subscribe_tasks=subscribe_tasks)
@@ -3425,6 +3629,50 @@ class SubscribeAssistantMod(_PluginBase):
             # username=subscribe.username
         )
 
+    def __prefetch_media(self, subscribes: List[Subscribe], predicate: Callable[[Subscribe], bool]) -> list:
+        """
+        并发识别订阅的媒体信息，相同 tmdbid/doubanid 的订阅只识别一次
+        :param subscribes: 订阅对象列表
+        :param predicate: 需要识别媒体信息的订阅
+        :return: 订阅列表，已识别的订阅替换为 (订阅, 媒体信息)
+        """
+        groups: Dict[Any, List[int]] = {}
+        for index, subscribe in enumerate(subscribes):
+            if not subscribe:
+                continue
+            try:
+                if not predicate(subscribe):
+                    continue
+            except Exception as e:
+                logger.debug(f"{self.__format_subscribe(subscribe)} 预识别媒体信息检查失败，"
+                             f"将在处理时识别：{str(e)}")
+                continue
+            if subscribe.tmdbid:
+                key = (subscribe.type, "tmdb", subscribe.tmdbid)
+            elif subscribe.doubanid:
+                key = (subscribe.type, "douban", subscribe.doubanid)
+            else:
+                key = (subscribe.type, "subscribe", subscribe.id)
+            groups.setdefault(key, []).append(index)
+
+        if not groups:
+            return subscribes
+
+        start_time = time.time()
+        workers = min(self._media_prefetch_workers, len(groups))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SubscribeAssistantMedia") as executor:
+            futures = {key: executor.submit(self.__recognize_media, subscribes[indexes[0]])
+                       for key, indexes in groups.items()}
+
+        results = list(subscribes)
+        for key, future in futures.items():
+            mediainfo = future.result()
+            for index in groups[key]:
+                results[index] = (subscribes[index], mediainfo)
+        logger.info(f"已识别 {len(groups)} 个媒体信息（{sum(len(v) for v in groups.values())} 个订阅），"
+                    f"耗时 {time.time() - start_time:.2f} 秒")
+        return results
+
     def __recognize_media(self, subscribe: Subscribe) -> Optional[MediaInfo]:
         """
         识别媒体信息
@@ -3602,17 +3850,19 @@ class SubscribeAssistantMod(_PluginBase):
                 del torrent_tasks[k]
 
     @staticmethod
-    def __update_or_add_delete_tasks(delete_tasks: dict, torrent_task: dict):
+    def __update_or_add_delete_tasks(delete_tasks: dict, torrent_tasks: List[dict]):
         """
-        更新已删除种子任务
+        批量更新已删除种子任务
         :param delete_tasks: 已删除种子任务
-        :param torrent_task: 种子任务
+        :param torrent_tasks: 种子任务列表
         """
-        if not torrent_task:
-            return
-        torrent_hash = torrent_task.get("hash")
-        torrent_task["delete_time"] = time.time()
-        delete_tasks[torrent_hash] = torrent_task
+        delete_time = time.time()
+        for torrent_task in torrent_tasks or []:
+            if not torrent_task:
+                continue
+            torrent_hash = torrent_task.get("hash")
+            torrent_task["delete_time"] = delete_time
+            delete_tasks[torrent_hash] = torrent_task
 
     def __update_subscribe_torrent_task(self, subscribe_tasks: dict, subscribe: Subscribe,
                                         torrent_hash: Optional[str] = None,
@@ -3664,21 +3914,24 @@ class SubscribeAssistantMod(_PluginBase):
         if not subscribe_task:
             return False
 
-        torrent_tasks = subscribe_task.setdefault("torrent_tasks", [])
-        for task in torrent_tasks:
-            if torrent_hash:
-                # 如果已经有相同的 torrent_hash，直接返回
-                if task.get("hash") == torrent_hash:
-                    return False
-                # 如果任务没有 hash 且信息匹配，更新 hash
+        torrent_tasks = self.__get_subscribe_torrent_tasks(subscribe_task=subscribe_task)
+        if torrent_hash:
+            # 如果已经有相同的 torrent_hash，直接返回
+            if torrent_hash in torrent_tasks:
+                return False
+            # 如果任务没有 hash 且信息匹配，更新 hash
+            for key, task in list(torrent_tasks.items()):
                 if not task.get("hash") and self.__compare_torrent_info_and_task(torrent_info, task):
                     task.update({
                         "hash": torrent_hash,
                         "episodes": episodes,
                         "downloader": downloader
                     })
+                    del torrent_tasks[key]
+                    torrent_tasks[torrent_hash] = task
                     return True
-            else:
+        else:
+            for task in torrent_tasks.values():
                 if self.__compare_torrent_info_and_task(torrent_info, task):
                     return False
 
@@ -3686,7 +3939,7 @@ class SubscribeAssistantMod(_PluginBase):
             return False
 
         # 如果未找到匹配任务，初始化一个新的 torrent_task
-        torrent_tasks.append({
+        torrent_task = {
             "hash": torrent_hash,
             "site_id": torrent_info.site,
             "site_name": torrent_info.site_name,
@@ -3699,7 +3952,8 @@ class SubscribeAssistantMod(_PluginBase):
             "time": time.time(),
             "pending": pending,
             "pending_time": time.time() if pending else None
-        })
+        }
+        torrent_tasks[self.__get_torrent_task_key(torrent_task=torrent_task)] = torrent_task
         return True
 
     def __update_subscribe_tv_pending_task(self, subscribe: Subscribe, subscribe_task: dict,
@@ -3742,8 +3996,7 @@ class SubscribeAssistantMod(_PluginBase):
 
         return self.__get_subscribe_task_download_pending(subscribe_task=subscribe_task)
 
-    @staticmethod
-    def __get_subscribe_task_download_pending(subscribe_task: dict) -> bool:
+    def __get_subscribe_task_download_pending(self, subscribe_task: dict) -> bool:
         """
         获取待定状态
         :param subscribe_task: 订阅任务
@@ -3751,12 +4004,38 @@ class SubscribeAssistantMod(_PluginBase):
         if not subscribe_task:
             return False
 
-        for task in subscribe_task.get("torrent_tasks", []):
+        for task in self.__get_subscribe_torrent_tasks(subscribe_task=subscribe_task).values():
             if task.get("hash") and task.get("pending"):
                 return True
 
         return False
 
+    @staticmethod
+    def __get_torrent_task_key(torrent_task: dict) -> str:
+        """
+        获取订阅种子任务的键，已下载的种子使用hash，尚未下载的种子使用种子链接
+        :param torrent_task: 订阅种子任务
+        """
+        torrent_hash = torrent_task.get("hash")
+        if torrent_hash:
+            return torrent_hash
+        return (f"pending|{torrent_task.get('enclosure') or torrent_task.get('page_url') or ''}"
+                f"|{torrent_task.get('title') or ''}")
+
+    def __get_subscribe_torrent_tasks(self, subscribe_task: dict) -> Dict[str, dict]:
+        """
+        获取订阅种子任务字典（键->种子任务），旧版本以列表保存的数据在此处转换为字典
+        :param subscribe_task: 订阅任务
+        """
+        torrent_tasks = subscribe_task.get("torrent_tasks")
+        if isinstance(torrent_tasks, dict):
+            return torrent_tasks
+        converted = {}
+        for task in torrent_tasks or []:
+            converted[self.__get_torrent_task_key(torrent_task=task)] = task
+        subscribe_task["torrent_tasks"] = converted
+        return converted
+
     def __initialize_subscribe_task(self, subscribe: Subscribe, subscribe_tasks: dict) -> tuple[dict, bool]:
         """
         初始化订阅任务，或者获取已有的订阅任务
@@ -3798,7 +4077,7 @@ class SubscribeAssistantMod(_PluginBase):
             "pause_for_download_time": None,
             "tv_pending": False,
             "tv_pending_time": None,
-            "torrent_tasks": []
+            "torrent_tasks": {}
         }
         subscribe_tasks[subscribe_id] = subscribe_task
         return subscribe_task, False
@@ -3841,6 +4120,11 @@ class SubscribeAssistantMod(_PluginBase):
             logger.debug("洗版天数小于等于0，跳过处理")
             return
 
+        # 1. 筛选：计算每个洗版订阅距离上次更新的天数，只有达到洗版天数的订阅需要更新
+        start_time = time.time()
+        now = datetime.now()
+        completed_subscribes = []
+        checked_count = 0
         for subscribe in subscribes:
             if not subscribe.best_version:
                 continue
@@ -3856,7 +4140,7 @@ class SubscribeAssistantMod(_PluginBase):
                 logger.debug(f"{self.__format_subscribe(subscribe)} 没有有效的日期，跳过处理")
                 continue
 
-                # 将字符串转换为 datetime 对象
+            # 将字符串转换为 datetime 对象
             try:
                 last_update_date = datetime.strptime(last_update_date_str, "%Y-%m-%d %H:%M:%S")
             except ValueError:
@@ -3865,15 +4149,25 @@ class SubscribeAssistantMod(_PluginBase):
                 continue
 
             # 计算距离当前的天数
-            remaining_days = (datetime.now() - last_update_date).total_seconds() / 86400
+            checked_count += 1
+            remaining_days = (now - last_update_date).total_seconds() / 86400
             logger.info(f"{self.__format_subscribe(subscribe)} 距离上次更新 {remaining_days:.2f} 天")
 
             if remaining_days >= self._auto_best_remaining_days:
-                # 如果剩余天数已大于洗版天数，则更新优先级为100，标识为洗版完成
-                logger.info(f"{self.__format_subscribe(subscribe)} 已满足洗版天数，更新优先级为 100")
-                self.subscribe_oper.update(sid=subscribe.id, payload={"current_priority": 100})
+                completed_subscribes.append(subscribe)
             else:
                 logger.info(f"订阅 {self.__format_subscribe(subscribe)} 尚未满足洗版天数，跳过处理")
+        filter_time = time.time() - start_time
+
+        # 2. 更新：将已满足洗版天数的订阅优先级更新为100，标识为洗版完成
+        start_time = time.time()
+        for subscribe in completed_subscribes:
+            logger.info(f"{self.__format_subscribe(subscribe)} 已满足洗版天数，更新优先级为 100")
+            self.subscribe_oper.update(sid=subscribe.id, payload={"current_priority": 100})
+        update_time = time.time() - start_time
+
+        logger.info(f"洗版完成检查共检查 {checked_count} 个洗版订阅，{len(completed_subscribes)} 个已完成，"
+                    f"筛选耗时 {filter_time:.2f} 秒，更新耗时 {update_time:.2f} 秒")
 
     def process_best_version(self, subscribe_dict: dict, mediainfo: MediaInfo):
         """
@@ -3980,19 +4274,7 @@ class SubscribeAssistantMod(_PluginBase):
         :param *args: 额外的位置参数
         :param **kwargs: 额外的关键字参数
         """
-        with lock:
-            try:
-                # 获取数据
-                tasks = self.__get_data(key="subscribes")
-
-                # 执行需要的操作
-                method(tasks, *args, **kwargs)
-
-                # 保存修改后的数据
-                self.__save_data(key="subscribes", value=tasks)
-            except Exception as e:
-                # 处理异常
-                logger.error(f"Error during {method.__name__}: {e}", exc_info=True)
+        self.__with_lock_and_update_tasks("subscribes", method, *args, **kwargs)
 
     def __with_lock_and_update_torrent_tasks(self, method: Callable[..., None], *args: Any, **kwargs: Any) -> None:
         """
@@ -4001,19 +4283,7 @@ class SubscribeAssistantMod(_PluginBase):
         :param *args: 额外的位置参数
         :param **kwargs: 额外的关键字参数
         """
-        with lock:
-            try:
-                # 获取数据
-                tasks = self.__get_data(key="torrents")
-
-                # 执行需要的操作
-                method(tasks, *args, **kwargs)
-
-                # 保存修改后的数据
-                self.__save_data(key="torrents", value=tasks)
-            except Exception as e:
-                # 处理异常
-                logger.error(f"Error during {method.__name__}: {e}", exc_info=True)
+        self.__with_lock_and_update_tasks("torrents", method, *args, **kwargs)
 
     def __with_lock_and_update_delete_tasks(self, method: Callable[..., None], *args: Any, **kwargs: Any) -> None:
         """
@@ -4022,19 +4292,21 @@ class SubscribeAssistantMod(_PluginBase):
         :param *args: 额外的位置参数
         :param **kwargs: 额外的关键字参数
         """
-        with lock:
-            try:
-                # 获取数据
-                tasks = self.__get_data(key="deletes")
+        self.__with_lock_and_update_tasks("deletes", method, *args, **kwargs)
 
-                # 执行需要的操作
+    def __with_lock_and_update_tasks(self, collection: str, method: Callable[..., Any], *args: Any,
+                                     **kwargs: Any) -> None:
+        """
+        锁定任务集合并执行更新，仅保存发生变化的任务，执行失败时丢弃变更
+        :param collection: 任务集合
+        :param method: 需要执行的操作，接收当前数据字典并进行修改
+        """
+        try:
+            with self._task_store.transaction(collection) as tasks:
                 method(tasks, *args, **kwargs)
-
-                # 保存修改后的数据
-                self.__save_data(key="deletes", value=tasks)
-            except Exception as e:
-                # 处理异常
-                logger.error(f"Error during {method.__name__}: {e}", exc_info=True)
+        except Exception as e:
+            # 处理异常
+            logger.error(f"Error during {method.__name__}: {e}", exc_info=True)
 
     def __check_subscribe_status(self, subscribe: Subscribe) -> bool:
         """
@@ -4064,7 +4336,7 @@ class SubscribeAssistantMod(_PluginBase):
         if mediainfo.status in ["Ended", "Canceled"]:
             return True
 
-        episodes = self.tmdb_chain.tmdb_episodes(tmdbid=mediainfo.tmdb_id, season=season)
+        episodes = self.__get_tmdb_episodes(mediainfo=mediainfo, season=season)
         if not episodes:
             return False
 
@@ -4082,7 +4354,7 @@ class SubscribeAssistantMod(_PluginBase):
         if not mediainfo or not mediainfo.tmdb_id or not season:
             return None, None
 
-        episodes = self.tmdb_chain.tmdb_episodes(tmdbid=mediainfo.tmdb_id, season=season)
+        episodes = self.__get_tmdb_episodes(mediainfo=mediainfo, season=season)
         if not episodes:
             return None, None
 
@@ -4141,7 +4413,7 @@ class SubscribeAssistantMod(_PluginBase):
             logger.warning(f"{mediainfo.title} 未找到季 {season} 的上映日期，尝试从集的详细信息中获取")
 
         # 未能从 season_info 中获取有效日期时，从剧集详情中获取
-        episodes = self.tmdb_chain.tmdb_episodes(tmdbid=mediainfo.tmdb_id, season=season)
+        episodes = self.__get_tmdb_episodes(mediainfo=mediainfo, season=season)
         if not episodes:
             logger.warning(f"{mediainfo.title} 未找到季 {season} 的剧集信息，未能获取到上映日期")
             return None, None
@@ -4157,6 +4429,73 @@ class SubscribeAssistantMod(_PluginBase):
         logger.warning(f"{mediainfo.title} 季 {season} 未能从剧集信息中获取到上映日期")
         return None, None
 
+    def __get_tmdb_episodes(self, mediainfo: MediaInfo, season: int) -> List[TmdbEpisode]:
+        """
+        按季获取TMDB剧集信息，优先使用缓存，未命中或已过期时重新获取
+        :param mediainfo: 媒体信息
+        :param season: 季数
+        """
+        cache_key = f"{mediainfo.tmdb_id}-{season}"
+        now = time.time()
+        with self._tmdb_episodes_cache_lock:
+            if self._tmdb_episodes_cache is None:
+                self._tmdb_episodes_cache = self.__get_data(key="tmdb_episodes")
+            cached = self._tmdb_episodes_cache.get(cache_key)
+        if cached and (cached.get("expire_time") or 0) > now:
+            return [TmdbEpisode(**episode) for episode in cached.get("episodes") or []]
+
+        episodes = self.tmdb_chain.tmdb_episodes(tmdbid=mediainfo.tmdb_id, season=season)
+        if not episodes:
+            return []
+
+        # 已完结的季缓存较长时间，播出中的季缓存较短时间
+        if self.__is_tv_season_ended(mediainfo=mediainfo, episodes=episodes):
+            ttl = self._tmdb_episodes_ended_ttl
+        else:
+            ttl = self._tmdb_episodes_airing_ttl
+        with self._tmdb_episodes_cache_lock:
+            self._tmdb_episodes_cache[cache_key] = {
+                "episodes": [{
+                    "air_date": episode.air_date,
+                    "episode_number": episode.episode_number,
+                    "episode_type": episode.episode_type,
+                    "name": episode.name,
+                    "season_number": episode.season_number,
+                } for episode in episodes],
+                "expire_time": now + ttl
+            }
+            self._tmdb_episodes_cache_changed = True
+        return episodes
+
+    def __is_tv_season_ended(self, mediainfo: MediaInfo, episodes: List[TmdbEpisode]) -> bool:
+        """
+        判断季是否已播出完毕，用于决定缓存有效期
+        """
+        if mediainfo.status in ["Ended", "Canceled"]:
+            return True
+        now = datetime.now()
+        for episode in episodes:
+            if episode.episode_type == "finale" and episode.air_date:
+                air_date, _ = self.__parse_date(episode.air_date)
+                if air_date and air_date <= now:
+                    return True
+        return False
+
+    def __save_tmdb_episodes_cache(self):
+        """
+        清理过期的TMDB剧集缓存并保存
+        """
+        with self._tmdb_episodes_cache_lock:
+            if self._tmdb_episodes_cache is None or not self._tmdb_episodes_cache_changed:
+                return
+            now = time.time()
+            self._tmdb_episodes_cache = {
+                key: value for key, value in self._tmdb_episodes_cache.items()
+                if (value.get("expire_time") or 0) > now
+            }
+            self._tmdb_episodes_cache_changed = False
+            self.__save_data(key="tmdb_episodes", value=self._tmdb_episodes_cache)
+
     @staticmethod
     def __get_tv_season_episode_count(mediainfo: MediaInfo, season: int) -> Optional[int]:
         """
@@ -0,0 +1,654 @@
+"""
+订阅助手性能基准与回放工具
+
+使用内存中的下载器、订阅、TMDB以及插件数据替身运行 download_check、meta_check、best_version_check，
+记录每项检查的耗时、外部接口调用次数以及内存峰值，便于在本地发现性能退化。
+需要在 MoviePilot 的运行环境中执行（无需启动服务），例如：
+
+    python -m app.plugins.subscribeassistantmod.benchmark --subscribes 1000 --torrents 10000
+    python -m app.plugins.subscribeassistantmod.benchmark --save-dataset dataset.json
+    python -m app.plugins.subscribeassistantmod.benchmark --dataset dataset.json
+    python -m app.plugins.subscribeassistantmod.benchmark --tracker-matcher
+"""
+import argparse
+import gc
+import json
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+import app.plugins.subscribeassistantmod as plugin_module
+from app.core.context import MediaInfo
+from app.db.models import Subscribe
+from app.plugins.subscribeassistantmod import SubscribeAssistantMod
+from app.plugins.subscribeassistantmod.tracker_matcher import TrackerResponseMatcher
+from app.schemas import TmdbEpisode
+from app.schemas.types import MediaType
+
+
+class CallCounter:
+    """
+    接口调用计数
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    def record(self, name: str, count: int = 1):
+        with self._lock:
+            self.calls[name] += count
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.calls)
+
+
+class FakeTracker:
+    """
+    Tracker 状态
+    """
+
+    def __init__(self, msg: str, tier: int = 0):
+        self.msg = msg
+        self.tier = tier
+
+
+class FakeQbTorrent(dict):
+    """
+    qBittorrent 种子，字段与 qbittorrent-api 返回一致
+    """
+
+    def __init__(self, data: dict, tracker_msgs: Optional[List[str]] = None):
+        super().__init__(data)
+        self.trackers = [FakeTracker(msg=msg) for msg in tracker_msgs or []]
+
+
+class FakeDownloader:
+    """
+    下载器替身，模拟 qBittorrent 的 get_torrents / delete_torrents
+    """
+
+    def __init__(self, name: str, torrents: Dict[str, FakeQbTorrent], counter: CallCounter, latency: float = 0):
+        self.name = name
+        self.torrents = torrents
+        self.counter = counter
+        self.latency = latency
+
+    def is_inactive(self) -> bool:
+        return False
+
+    def get_torrents(self, ids: Optional[List[str]] = None, **kwargs):
+        self.counter.record("downloader.get_torrents")
+        if self.latency:
+            time.sleep(self.latency)
+        if ids is None:
+            return list(self.torrents.values()), False
+        if isinstance(ids, str):
+            ids = [ids]
+        return [self.torrents[torrent_hash] for torrent_hash in ids if torrent_hash in self.torrents], False
+
+    def delete_torrents(self, delete_file: bool, ids: List[str]) -> bool:
+        self.counter.record("downloader.delete_torrents")
+        self.counter.record("downloader.deleted_torrents", len(ids))
+        if self.latency:
+            time.sleep(self.latency)
+        for torrent_hash in ids:
+            self.torrents.pop(torrent_hash, None)
+        return True
+
+
+class FakeDownloaderHelper:
+    """
+    下载器帮助类替身
+    """
+
+    def __init__(self, downloaders: Dict[str, FakeDownloader], counter: CallCounter):
+        self.downloaders = downloaders
+        self.counter = counter
+
+    def get_service(self, name: str, **kwargs):
+        self.counter.record("downloader_helper.get_service")
+        downloader = self.downloaders.get(name)
+        if not downloader:
+            return None
+        return SimpleNamespace(name=name, type="qbittorrent", instance=downloader)
+
+
+class FakeSubscribeOper:
+    """
+    订阅数据替身
+    """
+
+    def __init__(self, subscribes: List[Subscribe], counter: CallCounter, latency: float = 0):
+        self.subscribes = {subscribe.id: subscribe for subscribe in subscribes}
+        self.counter = counter
+        self.latency = latency
+
+    def list(self, state: Optional[str] = None) -> List[Subscribe]:
+        self.counter.record("subscribe_oper.list")
+        if self.latency:
+            time.sleep(self.latency)
+        if not state:
+            return list(self.subscribes.values())
+        states = state.split(",")
+        return [subscribe for subscribe in self.subscribes.values() if subscribe.state in states]
+
+    def get(self, sid: int) -> Optional[Subscribe]:
+        self.counter.record("subscribe_oper.get")
+        return self.subscribes.get(sid)
+
+    def update(self, sid: int, payload: dict) -> Optional[Subscribe]:
+        self.counter.record("subscribe_oper.update")
+        if self.latency:
+            time.sleep(self.latency)
+        subscribe = self.subscribes.get(sid)
+        if subscribe:
+            for key, value in payload.items():
+                setattr(subscribe, key, value)
+        return subscribe
+
+    def __getattr__(self, name: str) -> Callable:
+        def method(*args, **kwargs):
+            self.counter.record(f"subscribe_oper.{name}")
+            return None
+
+        return method
+
+
+class FakeTmdbChain:
+    """
+    TMDB 替身，按季生成剧集
+    """
+
+    def __init__(self, catalog: Dict[int, dict], counter: CallCounter, latency: float = 0):
+        self.catalog = catalog
+        self.counter = counter
+        self.latency = latency
+
+    def tmdb_episodes(self, tmdbid: int, season: int, **kwargs) -> List[TmdbEpisode]:
+        self.counter.record("tmdb_chain.tmdb_episodes")
+        if self.latency:
+            time.sleep(self.latency)
+        media = self.catalog.get(tmdbid)
+        if not media:
+            return []
+        season_info = next((info for info in media["season_info"] if info["season_number"] == season), None)
+        if not season_info:
+            return []
+        air_date = datetime.strptime(season_info["air_date"], "%Y-%m-%d")
+        count = season_info["episode_count"]
+        return [TmdbEpisode(air_date=(air_date + timedelta(days=7 * i)).strftime("%Y-%m-%d"),
+                            episode_number=i + 1,
+                            episode_type="finale" if i == count - 1 else "standard",
+                            name=f"第 {i + 1} 集",
+                            season_number=season) for i in range(count)]
+
+
+class FakeChain:
+    """
+    插件处理链替身，仅实现媒体识别
+    """
+
+    def __init__(self, catalog: Dict[int, dict], counter: CallCounter, latency: float = 0):
+        self.catalog = catalog
+        self.counter = counter
+        self.latency = latency
+
+    def recognize_media(self, tmdbid: Optional[int] = None, **kwargs) -> Optional[MediaInfo]:
+        self.counter.record("chain.recognize_media")
+        if self.latency:
+            time.sleep(self.latency)
+        media = self.catalog.get(tmdbid)
+        if not media:
+            return None
+        mediainfo = MediaInfo()
+        mediainfo.type = MediaType(media["type"])
+        mediainfo.title = media["title"]
+        mediainfo.year = media["year"]
+        mediainfo.tmdb_id = tmdbid
+        mediainfo.status = media["status"]
+        mediainfo.release_date = media["release_date"]
+        mediainfo.vote_average = 7.5
+        mediainfo.season_info = [dict(info) for info in media["season_info"]]
+        mediainfo.seasons = {info["season_number"]: list(range(1, info["episode_count"] + 1))
+                             for info in media["season_info"]}
+        return mediainfo
+
+
+class FakeOper:
+    """
+    其它数据操作替身，记录调用次数并返回空结果
+    """
+
+    def __init__(self, name: str, counter: CallCounter):
+        self._name = name
+        self._counter = counter
+
+    def __getattr__(self, name: str) -> Callable:
+        def method(*args, **kwargs):
+            self._counter.record(f"{self._name}.{name}")
+            return []
+
+        return method
+
+
+class FakeCategoryHelper:
+    tv_categorys = []
+    movie_categorys = []
+
+
+def generate_dataset(subscribes: int = 1000, torrents: int = 10000, downloaders: int = 2,
+                     seed: int = 0) -> dict:
+    """
+    生成模拟数据
+    :param subscribes: 订阅数量
+    :param torrents: 种子任务数量
+    :param downloaders: 下载器数量
+    :param seed: 随机种子，相同参数生成相同的数据
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    downloader_names = [f"qb{i}" for i in range(downloaders)]
+
+    # 媒体：部分剧集存在多季订阅，共享同一个 tmdbid
+    catalog = {}
+    subscribe_rows = []
+    tmdbid = 100000
+    while len(subscribe_rows) < subscribes:
+        tmdbid += 1
+        is_tv = rng.random() < 0.7
+        release = now - timedelta(days=rng.randint(-60, 3650))
+        seasons = rng.randint(1, 4) if is_tv else 0
+        catalog[tmdbid] = {
+            "type": MediaType.TV.value if is_tv else MediaType.MOVIE.value,
+            "title": f"媒体{tmdbid}",
+            "year": str(release.year),
+            "status": rng.choice(["Returning Series", "Ended", "In Production"]) if is_tv else "Released",
+            "release_date": release.strftime("%Y-%m-%d"),
+            "season_info": [{
+                "season_number": season,
+                "air_date": (release + timedelta(days=365 * (season - 1))).strftime("%Y-%m-%d"),
+                "episode_count": rng.randint(6, 24),
+            } for season in range(1, seasons + 1)],
+        }
+        for season in (range(1, seasons + 1) if is_tv else [None]):
+            if len(subscribe_rows) >= subscribes:
+                break
+            created = now - timedelta(days=rng.randint(0, 60))
+            episode_count = catalog[tmdbid]["season_info"][season - 1]["episode_count"] if season else 1
+            subscribe_rows.append({
+                "id": len(subscribe_rows) + 1,
+                "name": catalog[tmdbid]["title"],
+                "year": catalog[tmdbid]["year"],
+                "type": catalog[tmdbid]["type"],
+                "tmdbid": tmdbid,
+                "season": season,
+                "state": rng.choice(["N", "R", "R", "R", "P", "S"]),
+                "best_version": 1 if rng.random() < 0.1 else 0,
+                "current_priority": 0,
+                "total_episode": episode_count,
+                "start_episode": 1 if season else None,
+                "lack_episode": episode_count,
+                "note": [],
+                "date": created.strftime("%Y-%m-%d %H:%M:%S"),
+                "last_update": (created + timedelta(days=rng.randint(0, 10))).strftime("%Y-%m-%d %H:%M:%S"),
+                "username": "benchmark",
+            })
+
+    # 种子任务以及下载器中的种子：已完成、下载中、超时、Tracker 报错、已被手动删除
+    torrent_tasks = {}
+    downloader_torrents = {name: {} for name in downloader_names}
+    for i in range(torrents):
+        subscribe = subscribe_rows[rng.randrange(len(subscribe_rows))]
+        torrent_hash = f"{rng.getrandbits(160):040x}"
+        downloader = rng.choice(downloader_names)
+        added_on = int((now - timedelta(hours=rng.uniform(0, 12))).timestamp())
+        episodes = [rng.randint(1, subscribe["total_episode"])] if subscribe["season"] else []
+        torrent_tasks[torrent_hash] = {
+            "hash": torrent_hash,
+            "subscribe_id": subscribe["id"],
+            "subscribe_info": None,
+            "episodes": episodes,
+            "username": "benchmark",
+            "downloader": downloader,
+            "site_id": rng.randint(1, 20),
+            "site_name": f"site{rng.randint(1, 20)}",
+            "title": f"{subscribe['name']}.S{subscribe['season'] or 0:02d}.1080p-{i}",
+            "description": "",
+            "enclosure": f"https://site/download/{i}",
+            "page_url": f"https://site/details/{i}",
+            "pending_check": True,
+            "timeout_check": True,
+            "manual_check": True,
+            "time": added_on,
+        }
+        kind = rng.random()
+        if kind < 0.05:
+            # 已被手动删除
+            continue
+        size = rng.randint(1, 50) * 1024 ** 3
+        completed = kind < 0.5
+        tracker_msgs = ["torrent not registered with this tracker"] if 0.95 <= kind else ["announce ok"]
+        downloader_torrents[downloader][torrent_hash] = {
+            "data": {
+                "hash": torrent_hash,
+                "name": torrent_tasks[torrent_hash]["title"],
+                "added_on": added_on,
+                "completion_on": added_on + 600 if completed else -1,
+                "last_activity": added_on,
+                "ratio": 0,
+                "uploaded": 0,
+                "downloaded": size if completed else int(size * rng.random()),
+                "size": size,
+                "total_size": size,
+                "tags": "",
+                "tracker": "https://tracker",
+                "state": "uploading" if completed else "downloading",
+            },
+            "tracker_msgs": tracker_msgs,
+        }
+
+    return {
+        "seed": seed,
+        "catalog": {str(k): v for k, v in catalog.items()},
+        "subscribes": subscribe_rows,
+        "torrent_tasks": torrent_tasks,
+        "downloader_torrents": downloader_torrents,
+    }
+
+
+def save_dataset(dataset: dict, path: Path):
+    """
+    保存模拟数据，用于回放
+    """
+    Path(path).write_text(json.dumps(dataset, ensure_ascii=False), encoding="utf-8")
+
+
+def load_dataset(path: Path) -> dict:
+    """
+    读取模拟数据
+    """
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+class BenchmarkEnv:
+    """
+    基准测试环境，根据模拟数据构造插件以及各替身
+    """
+
+    default_config = {
+        "enabled": True,
+        "notify": False,
+        "auto_download_delete": True,
+        "manual_delete_listen": True,
+        "tracker_response_listen": True,
+        "auto_search_when_delete": True,
+        "auto_download_pending": True,
+        "auto_tv_pending": True,
+        "auto_pause": True,
+        "download_timeout": 3,
+        "timeout_history_cleanup": 24,
+        "auto_tv_pending_days": 7,
+        "auto_tv_pending_episodes": 1,
+        "auto_pause_tv_air_days": 30,
+        "auto_pause_tv_latest_days": 14,
+        "auto_pause_movie_air_days": 90,
+        "auto_best_type": "all",
+        "auto_best_remaining_days": 7,
+    }
+
+    def __init__(self, dataset: dict, config: Optional[dict] = None, latency: float = 0):
+        """
+        :param dataset: 模拟数据
+        :param config: 插件配置，覆盖默认配置
+        :param latency: 每次外部接口调用的模拟延迟（秒）
+        """
+        self.counter = CallCounter()
+        self.storage: Dict[str, Any] = {}
+        self._data_dir = tempfile.TemporaryDirectory(prefix="subscribeassistantmod-benchmark-")
+
+        catalog = {int(k): v for k, v in dataset["catalog"].items()}
+        self.subscribes = [Subscribe(**row) for row in dataset["subscribes"]]
+        self.downloaders = {
+            name: FakeDownloader(name=name, counter=self.counter, latency=latency, torrents={
+                torrent_hash: FakeQbTorrent(data=item["data"], tracker_msgs=item["tracker_msgs"])
+                for torrent_hash, item in torrents.items()
+            })
+            for name, torrents in dataset["downloader_torrents"].items()
+        }
+        self.subscribe_oper = FakeSubscribeOper(subscribes=self.subscribes, counter=self.counter, latency=latency)
+        self.tmdb_chain = FakeTmdbChain(catalog=catalog, counter=self.counter, latency=latency)
+        self.chain = FakeChain(catalog=catalog, counter=self.counter, latency=latency)
+        self.plugin = self.__build_plugin(config={**self.default_config, **(config or {})})
+        self.__seed_tasks(torrent_tasks=dataset["torrent_tasks"])
+
+    def __build_plugin(self, config: dict) -> SubscribeAssistantMod:
+        """
+        构造插件，插件数据与外部服务均使用替身
+        """
+        plugin = SubscribeAssistantMod.__new__(SubscribeAssistantMod)
+        plugin.chain = self.chain
+
+        def get_data(key: str = None, plugin_id: str = None):
+            self.counter.record("plugin.get_data")
+            value = self.storage.get(key)
+            return json.loads(value) if value is not None else None
+
+        def save_data(key: str, value: Any, plugin_id: str = None):
+            self.counter.record("plugin.save_data")
+            self.storage[key] = json.dumps(value, ensure_ascii=False, default=str)
+
+        plugin.get_data = get_data
+        plugin.save_data = save_data
+        plugin.get_data_path = lambda plugin_id=None: Path(self._data_dir.name)
+        plugin.update_config = lambda *args, **kwargs: True
+        plugin.post_message = lambda *args, **kwargs: self.counter.record("plugin.post_message")
+
+        with mock.patch.multiple(plugin_module,
+                                 TmdbChain=lambda: self.tmdb_chain,
+                                 DownloaderHelper=lambda: FakeDownloaderHelper(self.downloaders, self.counter),
+                                 DownloadHistoryOper=lambda: FakeOper("downloadhistory_oper", self.counter),
+                                 TransferHistoryOper=lambda: FakeOper("transferhistory_oper", self.counter),
+                                 SubscribeOper=lambda: self.subscribe_oper,
+                                 CategoryHelper=FakeCategoryHelper,
+                                 TmdbApi=lambda: FakeOper("tmdb", self.counter)):
+            plugin.init_plugin(config)
+        return plugin
+
+    def __seed_tasks(self, torrent_tasks: Dict[str, dict]):
+        """
+        写入订阅任务以及种子任务
+        """
+        subscribes = {subscribe.id: subscribe for subscribe in self.subscribes}
+        with self.plugin._task_store.transaction("subscribes", "torrents") as (subscribe_tasks, tasks):
+            for torrent_hash, torrent_task in torrent_tasks.items():
+                subscribe = subscribes.get(torrent_task["subscribe_id"])
+                subscribe_task = subscribe_tasks.setdefault(str(subscribe.id), {
+                    "id": subscribe.id,
+                    "name": subscribe.name,
+                    "year": subscribe.year,
+                    "type": subscribe.type,
+                    "season": subscribe.season,
+                    "tmdbid": subscribe.tmdbid,
+                    "doubanid": None,
+                    "best_version": subscribe.best_version,
+                    "current_priority": subscribe.current_priority,
+                    "torrent_tasks": {},
+                })
+                subscribe_task["torrent_tasks"][torrent_hash] = {
+                    "hash": torrent_hash,
+                    "title": torrent_task["title"],
+                    "enclosure": torrent_task["enclosure"],
+                    "page_url": torrent_task["page_url"],
+                    "episodes": torrent_task["episodes"],
+                    "downloader": torrent_task["downloader"],
+                    "time": torrent_task["time"],
+                }
+                tasks[torrent_hash] = dict(torrent_task)
+
+    def measure(self, name: str, func: Callable[[], Any], trace_memory: bool = True) -> dict:
+        """
+        执行一次检查并记录耗时、接口调用次数以及内存峰值
+        :param name: 检查名称
+        :param func: 检查方法
+        :param trace_memory: 是否记录内存峰值，开启后耗时包含内存追踪的额外开销
+        """
+        self.counter.reset()
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        func()
+        wall_time = time.perf_counter() - start_time
+        peak = None
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return {
+            "check": name,
+            "wall_seconds": round(wall_time, 4),
+            "peak_memory_mb": round(peak / 1024 ** 2, 2) if peak is not None else None,
+            "calls": self.counter.snapshot(),
+        }
+
+    def close(self):
+        """
+        停止插件并清理临时数据
+        """
+        self.plugin.stop_service()
+        self._data_dir.cleanup()
+
+
+def run_benchmark(dataset: dict, config: Optional[dict] = None, latency: float = 0,
+                  trace_memory: bool = True) -> List[dict]:
+    """
+    依次执行 download_check、meta_check、best_version_check 并返回各项指标
+    :param dataset: 模拟数据
+    :param config: 插件配置，覆盖默认配置
+    :param latency: 每次外部接口调用的模拟延迟（秒）
+    :param trace_memory: 是否记录内存峰值
+    """
+    env = BenchmarkEnv(dataset=dataset, config=config, latency=latency)
+    try:
+        return [
+            env.measure("download_check", env.plugin.download_check, trace_memory=trace_memory),
+            env.measure("meta_check", env.plugin.meta_check, trace_memory=trace_memory),
+            env.measure("best_version_check", env.plugin.best_version_check, trace_memory=trace_memory),
+        ]
+    finally:
+        env.close()
+
+
+# 常见的Tracker响应消息
+SAMPLE_TRACKER_RESPONSES = [
+    "",
+    "Success",
+    "announce ok",
+    "Torrent not registered with this tracker",
+    "torrent not registered with this tracker.",
+    "Unregistered torrent",
+    "Torrent banned",
+    "Torrent has been deleted",
+    "Your client is not on the whitelist",
+    "You have reached the limit of simultaneous downloads",
+    "skipping tracker announce (unreachable)",
+    "Timed out",
+    "Connection refused",
+    "tracker is down",
+    "Passkey invalid",
+    "种子未注册",
+    "该种子已被删除",
+    "种子已被禁止",
+    "请求过于频繁，请稍后再试",
+]
+
+
+def tracker_matcher_benchmark(patterns: Optional[List[str]] = None, responses: Optional[List[str]] = None,
+                              rounds: int = 2000) -> Dict[str, float]:
+    """
+    Tracker响应匹配微基准，对比每次逐个正则搜索与预编译合并正则的耗时
+    :param patterns: 关键字列表，默认使用常见关键字
+    :param responses: 单个种子的Tracker响应列表，默认使用常见响应消息
+    :param rounds: 模拟的种子数量
+    :return: 各方式的总耗时（秒）与命中次数
+    """
+    patterns = patterns or ["torrent not registered with this tracker", "torrent banned", "unregistered torrent",
+                            "torrent has been deleted", "种子未注册", "已被删除", "已被禁止"]
+    responses = responses or SAMPLE_TRACKER_RESPONSES
+    # 每个种子取其中几条响应，模拟多 Tracker 的情况
+    corpus = [[responses[(i + j) % len(responses)] for j in range(3)] for i in range(rounds)]
+
+    start = time.perf_counter()
+    legacy_hits = 0
+    for torrent_responses in corpus:
+        matched_keyword = None
+        for pattern in patterns:
+            for response in torrent_responses:
+                if re.search(pattern, response, re.I):
+                    matched_keyword = pattern
+                    break
+            if matched_keyword:
+                break
+        if matched_keyword:
+            legacy_hits += 1
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = TrackerResponseMatcher(patterns)
+    matcher_hits = sum(1 for torrent_responses in corpus if matcher.match(torrent_responses))
+    matcher_time = time.perf_counter() - start
+
+    return {
+        "rounds": rounds,
+        "legacy_seconds": legacy_time,
+        "legacy_hits": legacy_hits,
+        "matcher_seconds": matcher_time,
+        "matcher_hits": matcher_hits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="订阅助手性能基准")
+    parser.add_argument("--subscribes", type=int, default=1000, help="订阅数量")
+    parser.add_argument("--torrents", type=int, default=10000, help="种子任务数量")
+    parser.add_argument("--downloaders", type=int, default=2, help="下载器数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--latency", type=float, default=0, help="外部接口模拟延迟（秒）")
+    parser.add_argument("--dataset", type=Path, help="回放已保存的模拟数据")
+    parser.add_argument("--save-dataset", type=Path, help="保存生成的模拟数据")
+    parser.add_argument("--no-memory", action="store_true", help="不记录内存峰值")
+    parser.add_argument("--tracker-matcher", action="store_true", help="仅执行Tracker响应匹配微基准")
+    args = parser.parse_args()
+
+    if args.tracker_matcher:
+        print(json.dumps(tracker_matcher_benchmark(), ensure_ascii=False))
+        return
+
+    if args.dataset:
+        dataset = load_dataset(args.dataset)
+    else:
+        dataset = generate_dataset(subscribes=args.subscribes, torrents=args.torrents,
+                                   downloaders=args.downloaders, seed=args.seed)
+    if args.save_dataset:
+        save_dataset(dataset, args.save_dataset)
+
+    for result in run_benchmark(dataset=dataset, latency=args.latency, trace_memory=not args.no_memory):
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import copy
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.log import logger
+
+
+def _track(value: Any, on_change: Callable[[], None]) -> Any:
+    """
+    将任务中的字典和列表转换为可记录修改的对象
+    """
+    if isinstance(value, dict):
+        return _TrackedDict(value, on_change)
+    if isinstance(value, list):
+        return _TrackedList(value, on_change)
+    return value
+
+
+def _plain(value: Any) -> Any:
+    """
+    转换为普通的字典和列表
+    """
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _TrackedDict(dict):
+    """
+    任意层级发生修改时通知所属任务的字典
+    新赋值的对象原样保存，提交后再转换，赋值后继续修改该对象也能被写入
+    """
+
+    def __init__(self, data: dict, on_change: Callable[[], None]):
+        super().__init__((key, _track(item, on_change)) for key, item in data.items())
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def pop(self, *args):
+        self._on_change()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._on_change()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._on_change()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(_plain(self), memo)
+
+
+class _TrackedList(list):
+    """
+    发生修改时通知所属任务的列表
+    """
+
+    def __init__(self, data: list, on_change: Callable[[], None]):
+        super().__init__(_track(item, on_change) for item in data)
+        self._on_change = on_change
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(_plain(self), memo)
+
+
+def _notify_after(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._on_change()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "pop",
+              "remove", "clear", "sort", "reverse"):
+    setattr(_TrackedList, _name, _notify_after(_name))
+
+
+class _TaskCollection(dict):
+    """
+    任务集合，记录发生修改的任务键，提交时只序列化这些任务
+    """
+
+    def __init__(self, data: dict):
+        super().__init__()
+        self.dirty: Set[str] = set()
+        for key, value in data.items():
+            super().__setitem__(key, self.track(key, value))
+
+    def track(self, key: str, value: Any) -> Any:
+        """
+        转换任务，任务内部发生修改时标记该任务
+        """
+        return _track(value, lambda: self.dirty.add(str(key)))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty.add(str(key))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty.add(str(key))
+
+    def pop(self, key, *args):
+        self.dirty.add(str(key))
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.dirty.add(str(key))
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self.dirty.update(str(key) for key in self.keys())
+        super().clear()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(_plain(self), memo)
+
+
+class TaskStore:
+    """
+    订阅助手任务存储
+    每条任务单独保存为一行，每个集合使用独立的锁；
+    任务在任意层级发生修改时会被标记，提交时只序列化和写入被标记的任务
+    """
+
+    def __init__(self, db_path: Path, legacy_loader: Optional[Callable[[str], Optional[dict]]] = None):
+        """
+        :param db_path: 数据库文件路径
+        :param legacy_loader: 旧版本数据读取方法，集合首次使用时从插件数据迁移，旧数据保留不删除
+        """
+        self._legacy_loader = legacy_loader
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        # 集合锁
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+        # 集合数据：集合 -> {键: 任务}
+        self._cache: Dict[str, _TaskCollection] = {}
+        # 已写入的数据：集合 -> {键: 序列化后的任务}
+        self._saved: Dict[str, Dict[str, str]] = {}
+        with self._conn_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS tasks ("
+                               "collection TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                               "PRIMARY KEY (collection, key))")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS migrations (collection TEXT PRIMARY KEY)")
+
+    def lock(self, collection: str) -> threading.RLock:
+        """
+        获取集合锁
+        """
+        with self._locks_lock:
+            if collection not in self._locks:
+                self._locks[collection] = threading.RLock()
+            return self._locks[collection]
+
+    @contextmanager
+    def transaction(self, *collections: str):
+        """
+        锁定集合并返回可修改的任务字典，正常退出时提交变更，发生异常时丢弃变更
+        多个集合时按名称顺序加锁并返回字典列表
+        """
+        locks = [self.lock(collection) for collection in sorted(collections)]
+        for collection_lock in locks:
+            collection_lock.acquire()
+        try:
+            tasks = [self.__load(collection) for collection in collections]
+            try:
+                yield tasks[0] if len(tasks) == 1 else tasks
+            except BaseException:
+                for collection in collections:
+                    self.__rollback(collection)
+                raise
+            self.commit(*collections)
+        finally:
+            for collection_lock in reversed(locks):
+                collection_lock.release()
+
+    def get(self, collection: str) -> dict:
+        """
+        获取集合数据的副本，仅用于读取
+        """
+        with self.lock(collection):
+            return copy.deepcopy(self.__load(collection))
+
+    def clear(self, *collections: str):
+        """
+        清空集合
+        """
+        for collection in collections:
+            with self.transaction(collection) as tasks:
+                tasks.clear()
+
+    def commit(self, *collections: str):
+        """
+        提交集合中被标记修改的任务，所有集合在同一个事务中写入
+        """
+        upserts = []
+        deletes = []
+        changes = {}
+        for collection in collections:
+            cache = self._cache.get(collection)
+            if cache is None or not cache.dirty:
+                continue
+            saved = self._saved.setdefault(collection, {})
+            keys = {str(key): key for key in cache.keys()}
+            current = {}
+            for key in cache.dirty:
+                if key in keys:
+                    value = json.dumps(cache[keys[key]], ensure_ascii=False, sort_keys=True, default=str)
+                    current[key] = value
+                    if saved.get(key) != value:
+                        upserts.append((collection, key, value))
+                elif key in saved:
+                    deletes.append((collection, key))
+                    current[key] = None
+            changes[collection] = current
+        if upserts or deletes:
+            with self._conn_lock, self._conn:
+                if upserts:
+                    self._conn.executemany("INSERT OR REPLACE INTO tasks (collection, key, value) VALUES (?, ?, ?)",
+                                           upserts)
+                if deletes:
+                    self._conn.executemany("DELETE FROM tasks WHERE collection = ? AND key = ?", deletes)
+            logger.debug(f"任务存储已提交 {collections}，写入 {len(upserts)} 条，删除 {len(deletes)} 条")
+        for collection, current in changes.items():
+            saved = self._saved[collection]
+            cache = self._cache[collection]
+            keys = {str(key): key for key in cache.keys()}
+            for key, value in current.items():
+                if value is None:
+                    saved.pop(key, None)
+                    continue
+                saved[key] = value
+                # 提交后重新转换，提交前新赋值的对象也能记录后续修改
+                dict.__setitem__(cache, keys[key], cache.track(keys[key], json.loads(value)))
+            cache.dirty.clear()
+
+    def close(self):
+        """
+        关闭数据库连接
+        """
+        with self._conn_lock:
+            self._conn.close()
+
+    def __load(self, collection: str) -> dict:
+        """
+        加载集合数据，首次使用时迁移旧版本插件数据
+        """
+        if collection in self._cache:
+            return self._cache[collection]
+        with self._conn_lock:
+            rows = self._conn.execute("SELECT key, value FROM tasks WHERE collection = ?",
+                                      (collection,)).fetchall()
+            migrated = self._conn.execute("SELECT 1 FROM migrations WHERE collection = ?",
+                                          (collection,)).fetchone()
+        if not migrated and self._legacy_loader:
+            legacy = self._legacy_loader(collection) or {}
+            self._saved[collection] = {key: value for key, value in rows}
+            cache = _TaskCollection({})
+            for key, value in legacy.items():
+                cache[str(key)] = value
+            # 数据库中已有但旧数据中没有的任务一并删除
+            cache.dirty.update(self._saved[collection].keys())
+            self._cache[collection] = cache
+            self.commit(collection)
+            with self._conn_lock, self._conn:
+                self._conn.execute("INSERT OR IGNORE INTO migrations (collection) VALUES (?)", (collection,))
+            logger.info(f"任务存储已迁移旧版本数据 {collection}，共 {len(legacy)} 条")
+        else:
+            self._saved[collection] = {key: value for key, value in rows}
+            self._cache[collection] = _TaskCollection({key: json.loads(value) for key, value in rows})
+        return self._cache[collection]
+
+    def __rollback(self, collection: str):
+        """
+        丢弃集合中未提交的变更，保持字典对象不变
+        """
+        cache = self._cache.get(collection)
+        if cache is None:
+            return
+        dict.clear(cache)
+        for key, value in self._saved.get(collection, {}).items():
+            dict.__setitem__(cache, key, cache.track(key, json.loads(value)))
+        cache.dirty.clear()
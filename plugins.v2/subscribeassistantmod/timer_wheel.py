@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.log import logger
+
+
+class TimerWheel:
+    """
+    共享定时器
+    使用单个调度线程和优先队列管理所有延迟任务，替代每个任务一个 threading.Timer
+    相同键的任务只保留一个，重复调度即为重新计时
+    """
+
+    def __init__(self, name: str, max_workers: int = 1):
+        """
+        :param name: 定时器名称，用于线程命名和日志
+        :param max_workers: 执行到期任务的线程数，调度线程本身不执行任务
+        """
+        self._name = name
+        self._max_workers = max(1, max_workers)
+        self._cond = threading.Condition()
+        # 优先队列：(到期时间, 序号, 键)
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # 任务：键 -> (序号, 到期时间, 回调, 参数, 关键字参数)
+        self._tasks: Dict[Hashable, Tuple[int, float, Callable, tuple, dict]] = {}
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopped = False
+
+    def schedule(self, key: Optional[Hashable], delay: float, func: Callable, *args, **kwargs) -> Hashable:
+        """
+        调度任务，键已存在时替换原任务并重新计时
+        :param key: 任务键，为空时自动生成
+        :param delay: 延迟时间（秒）
+        :param func: 回调方法
+        :return: 任务键
+        """
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError(f"{self._name} 定时器已停止")
+            seq = next(self._counter)
+            if key is None:
+                key = f"{self._name}-{seq}"
+            due = time.monotonic() + max(0.0, delay)
+            self._tasks[key] = (seq, due, func, args, kwargs)
+            heapq.heappush(self._heap, (due, seq, key))
+            self.__ensure_thread()
+            self._cond.notify()
+        return key
+
+    def reschedule(self, key: Hashable, delay: float) -> bool:
+        """
+        重新计时，保留原回调
+        :return: 任务是否存在
+        """
+        with self._cond:
+            task = self._tasks.get(key)
+            if not task:
+                return False
+            _, _, func, args, kwargs = task
+        self.schedule(key, delay, func, *args, **kwargs)
+        return True
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        取消任务，队列中的过期条目在出队时丢弃
+        :return: 任务是否存在
+        """
+        with self._cond:
+            return self._tasks.pop(key, None) is not None
+
+    def pending(self) -> int:
+        """
+        待执行的任务数量
+        """
+        with self._cond:
+            return len(self._tasks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._tasks
+
+    def flush(self) -> int:
+        """
+        立即在当前线程按到期顺序执行所有待执行任务
+        :return: 执行的任务数量
+        """
+        with self._cond:
+            tasks = sorted(self._tasks.items(), key=lambda item: item[1][1])
+            self._tasks.clear()
+            self._heap.clear()
+        for key, (_, _, func, args, kwargs) in tasks:
+            self.__run(key, func, args, kwargs)
+        return len(tasks)
+
+    def stop(self, flush: bool = False) -> int:
+        """
+        停止定时器
+        :param flush: 是否立即执行所有待执行任务，否则直接丢弃
+        :return: 执行或丢弃的任务数量
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if flush:
+            count = self.flush()
+        else:
+            with self._cond:
+                count = len(self._tasks)
+                self._tasks.clear()
+                self._heap.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if count:
+            logger.info(f"{self._name} 定时器已停止，{'执行' if flush else '丢弃'} {count} 个待执行任务")
+        return count
+
+    def __ensure_thread(self):
+        """
+        按需启动调度线程，调用方需持有锁
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                thread_name_prefix=f"{self._name}Worker")
+        self._thread = threading.Thread(target=self.__loop, name=f"{self._name}Timer", daemon=True)
+        self._thread.start()
+
+    def __loop(self):
+        """
+        调度线程，取出到期任务交给执行线程
+        """
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    # 丢弃已取消或已重新调度的条目
+                    while self._heap:
+                        due, seq, key = self._heap[0]
+                        task = self._tasks.get(key)
+                        if task and task[0] == seq:
+                            break
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    timeout = self._heap[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, key = heapq.heappop(self._heap)
+                _, _, func, args, kwargs = self._tasks.pop(key)
+                executor = self._executor
+            try:
+                executor.submit(self.__run, key, func, args, kwargs)
+            except RuntimeError:
+                # 执行线程池已关闭，直接在调度线程中执行
+                self.__run(key, func, args, kwargs)
+
+    def __run(self, key: Hashable, func: Callable, args: tuple, kwargs: Dict[str, Any]):
+        """
+        执行任务
+        """
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"{self._name} 定时任务 {key} 执行失败：{str(e)}", exc_info=True)
@@ -0,0 +1,60 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+
+class TrackerResponseMatcher:
+    """
+    Tracker响应关键字匹配器
+    配置时将所有关键字编译为一个带命名分组的正则（忽略大小写），匹配时可得知命中的关键字
+    """
+
+    _group_prefix = "_tracker_keyword_"
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        :param patterns: 关键字（正则表达式）列表，格式错误的关键字不参与匹配，记录在 invalid_patterns 中
+        """
+        self.patterns: List[str] = []
+        self.invalid_patterns: List[Tuple[str, str]] = []
+        self._compiled: List[re.Pattern] = []
+        for pattern in patterns:
+            try:
+                self._compiled.append(re.compile(pattern, re.I))
+                self.patterns.append(pattern)
+            except re.error as e:
+                self.invalid_patterns.append((pattern, str(e)))
+        self._combined: Optional[re.Pattern] = None
+        # 含分组的关键字合并后分组编号会变化，反向引用将无法匹配，此时逐个匹配
+        if self.patterns and not any(compiled.groups for compiled in self._compiled):
+            try:
+                self._combined = re.compile(
+                    "|".join(f"(?P<{self._group_prefix}{i}>{pattern})" for i, pattern in enumerate(self.patterns)),
+                    re.I)
+            except re.error:
+                # 关键字中存在无法合并的写法（如内联标志），逐个匹配
+                self._combined = None
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def match(self, responses: Iterable[str]) -> Optional[str]:
+        """
+        匹配Tracker响应，返回命中的关键字，未命中时返回None
+        :param responses: Tracker响应列表
+        """
+        if not self.patterns:
+            return None
+        for response in responses:
+            if not response:
+                continue
+            if self._combined:
+                matched = self._combined.search(response)
+                if matched:
+                    for name, value in matched.groupdict().items():
+                        if value is not None and name.startswith(self._group_prefix):
+                            return self.patterns[int(name[len(self._group_prefix):])]
+            else:
+                for pattern, compiled in zip(self.patterns, self._compiled):
+                    if compiled.search(response):
+                        return pattern
+        return None
@@ -15,6 +15,8 @@ from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.modules.qbittorrent.qbittorrent import Qbittorrent
 from app.plugins import _PluginBase
+from app.plugins.trackerspeedlimit.downloader_runner import DownloaderRunner
+from app.plugins.trackerspeedlimit.tracker_helper import TrackerSiteResolver
 from app.schemas import ServiceInfo
 from app.schemas.types import EventType
 from app.schemas.types import SystemConfigKey
@@ -30,7 +32,7 @@ class TrackerSpeedLimit(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/Seed680/MoviePilot-Plugins/main/icons/customplugin.png"
     # 插件版本
-    plugin_version = "0.8.2"
+    plugin_version = "0.8.5.5"
     # 插件作者
     plugin_author = "Seed680"
     # 作者主页
@@ -46,10 +48,16 @@ class TrackerSpeedLimit(_PluginBase):
 
     # 退出事件
     _event = threading.Event()
+    # 下载器任务执行器, 并发执行各下载器并记录耗时
+    _runner = DownloaderRunner(log_tag=LOG_TAG, stop_event=_event, thread_name_prefix="TrackerSpeedLimit")
     # 私有属性
     sites_helper = None
     downloader_helper = None
     tracker_limit_map = None
+    # tracker -> 限速 解析器
+    tracker_resolver: Optional[TrackerSiteResolver] = None
+    # 已设置的限速 (下载器, hash) -> 限速(KB/s, -1为不限速)
+    _applied_limits: Dict[Tuple[str, str], int] = {}
 
     _scheduler = None
     _enable = False
@@ -61,6 +69,10 @@ class TrackerSpeedLimit(_PluginBase):
     _downloaders = []
     _siteConfig = []
     _watch = False
+    # 并发扫描的下载器数量
+    _scan_workers = 4
+    # 单个下载器扫描超时时间(秒)
+    _scan_timeout = 1800
 
     def init_plugin(self, config: dict = None):
         self.downloader_helper = DownloaderHelper()
@@ -77,8 +89,12 @@ class TrackerSpeedLimit(_PluginBase):
             self._downloaders = config.get("downloaders")
             self._siteConfig = config.get("siteConfig", {})
             self._watch = config.get("watch", False)
+            self._scan_workers = max(self.str_to_number(config.get("scan_workers") or 4, 4), 1)
+            self._scan_timeout = max(self.str_to_number(config.get("scan_timeout") or 1800, 1800), 60)
             self.tracker_limit_map = self.process_site_config(self._siteConfig)
             logger.debug(f"tracker_limit_map: {self.tracker_limit_map}")
+        self.tracker_resolver = TrackerSiteResolver(domain_index=self.tracker_limit_map)
+        self._applied_limits = {}
         # 停止现有任务
         self.stop_service()
 
@@ -122,6 +138,8 @@ class TrackerSpeedLimit(_PluginBase):
                     "onlyonce",
                     "siteConfig",
                     "watch",
+                    "scan_workers",
+                    "scan_timeout",
             ):
                 setattr(self, f"_{key}", config.get(key, getattr(self, f"_{key}")))
 
@@ -146,7 +164,9 @@ class TrackerSpeedLimit(_PluginBase):
             "downloaders": [],
             "onlyonce": False,  # 始终返回False,
             "siteConfig": [],
-            "watch": False
+            "watch": False,
+            "scan_workers": 4,
+            "scan_timeout": 1800
         }
 
     def _get_config(self) -> Dict[str, Any]:
@@ -160,6 +180,8 @@ class TrackerSpeedLimit(_PluginBase):
             "downloaders": self._downloaders,
             "onlyonce": False,  # 始终返回False,
             "siteConfig": self._siteConfig,
+            "scan_workers": self._scan_workers,
+            "scan_timeout": self._scan_timeout,
         }
 
     def _get_all_downloaders(self) -> List[Any]:
@@ -267,6 +289,13 @@ class TrackerSpeedLimit(_PluginBase):
                 "methods": ["GET"],
                 "auth": "bear",
                 "summary": "获取站点列表"
+            },
+            {
+                "path": "/scan_stats",
+                "endpoint": self._get_scan_stats,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "获取各下载器最近一次执行耗时"
             }
         ]
 
@@ -331,51 +360,103 @@ class TrackerSpeedLimit(_PluginBase):
         if not self.service_infos:
             return
         logger.info(f"{self.LOG_TAG}开始执行 ...")
-        for service in self.service_infos.values():
-            downloader = service.name
-            downloader_obj = service.instance
-            logger.info(f"{self.LOG_TAG}开始扫描下载器 {downloader} ...")
-            if not downloader_obj:
-                logger.error(f"{self.LOG_TAG} 获取下载器失败 {downloader}")
-                continue
-            # 获取下载器中的种子
-            torrents, error = downloader_obj.get_torrents(ids=hash)
-            # 如果下载器获取种子发生错误 或 没有种子 则跳过
-            if error or not torrents:
-                continue
-            logger.info(f"{self.LOG_TAG}下载器 {downloader} 分析种子信息中 ...")
-            for torrent in torrents:
-                try:
-                    if self._event.is_set():
-                        logger.info(
-                            f"{self.LOG_TAG}停止服务")
-                        return
-                    # 获取已处理种子的key (size, name)
-                    _size, _name = self._torrent_key(torrent=torrent, dl_type=service.type)
-                    # 获取种子hash
-                    _hash = self._get_hash(torrent=torrent, dl_type=service.type)
-                    if not _hash:
-                        continue
-                    trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
-                    for tracker in trackers:
-                        logger.debug(f"tracker: {tracker} ...")
-                        # 检查tracker是否包含特定的关键字，并进行相应的映射
-                        domain = StringUtils.get_url_domain(tracker)
-                        if self.tracker_limit_map.get(domain, None):
-                            logger.info(
-                                f"{domain} {_name} {_hash} 设置限速 {int(self.tracker_limit_map.get(domain))} ...")
-                            self.torrents_set_upload_limit(_hash, int(self.tracker_limit_map.get(domain)),
-                                                           downloader_obj)
-                            break
-                        else:
-                            logger.debug(f"未获取到{domain}的设置 跳过处理...")
-                            # self.torrents_set_upload_limit(_hash, -1, downloader_obj)
-                except Exception as e:
-                    logger.error(
-                        f"{self.LOG_TAG}分析种子信息时发生了错误: {str(e)}", exc_info=True)
+        self._runner.run(task="带宽速度控制",
+                         func=lambda service: self._speed_limit_downloader(service=service, hash=hash),
+                         services=list(self.service_infos.values()),
+                         workers=self._scan_workers, timeout=self._scan_timeout)
 
         logger.info(f"{self.LOG_TAG}执行完成")
 
+    def _speed_limit_downloader(self, service: ServiceInfo, hash=None):
+        """
+        设置单个下载器中种子的上传限速
+        """
+        downloader = service.name
+        downloader_obj = service.instance
+        logger.info(f"{self.LOG_TAG}开始扫描下载器 {downloader} ...")
+        if not downloader_obj:
+            logger.error(f"{self.LOG_TAG} 获取下载器失败 {downloader}")
+            return
+        # 获取下载器中的种子
+        torrents, error = downloader_obj.get_torrents(ids=hash)
+        # 如果下载器获取种子发生错误 或 没有种子 则跳过
+        if error or not torrents:
+            return
+        logger.info(f"{self.LOG_TAG}下载器 {downloader} 分析种子信息中 ...")
+        # 需要修改限速的种子 限速 -> [hash]
+        pending_limits: Dict[int, List[str]] = {}
+        for torrent in torrents:
+            try:
+                if self._runner.is_stopped():
+                    logger.info(
+                        f"{self.LOG_TAG}停止服务")
+                    return
+                # 获取已处理种子的key (size, name)
+                _size, _name = self._torrent_key(torrent=torrent, dl_type=service.type)
+                # 获取种子hash
+                _hash = self._get_hash(torrent=torrent, dl_type=service.type)
+                if not _hash:
+                    continue
+                trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
+                for tracker in trackers:
+                    logger.debug(f"tracker: {tracker} ...")
+                    # 按tracker地址查找限速设置
+                    limit = self.tracker_resolver.resolve(tracker)
+                    if limit:
+                        limit = int(limit)
+                        # 下载器中的限速无法获取时, 使用上次设置的限速
+                        current_limit = self._get_upload_limit(torrent=torrent, dl_type=service.type)
+                        if current_limit is None:
+                            current_limit = self._applied_limits.get((downloader, _hash))
+                        if current_limit == limit:
+                            logger.debug(f"{_name} {_hash} 限速已是 {limit} 跳过处理...")
+                        else:
+                            logger.info(
+                                f"{self.tracker_resolver.get_domain(tracker)} {_name} {_hash} 设置限速 {limit} ...")
+                            pending_limits.setdefault(limit, []).append(_hash)
+                        break
+                    else:
+                        logger.debug(f"未获取到{tracker}的设置 跳过处理...")
+                        # self.torrents_set_upload_limit(_hash, -1, downloader_obj)
+            except Exception as e:
+                logger.error(
+                    f"{self.LOG_TAG}分析种子信息时发生了错误: {str(e)}", exc_info=True)
+        # 按限速分组, 每组调用一次下载器接口
+        for limit, hashes in pending_limits.items():
+            try:
+                self.torrents_set_upload_limit(hashes, limit, downloader_obj)
+                for _hash in hashes:
+                    self._applied_limits[(downloader, _hash)] = limit
+                logger.info(f"{self.LOG_TAG}下载器 {downloader} 批量设置 {len(hashes)} 个种子限速 {limit}")
+            except Exception as e:
+                logger.error(f"{self.LOG_TAG}下载器 {downloader} 批量设置限速 {limit} 失败: {str(e)}")
+        logger.info(f"{self.LOG_TAG}下载器 {downloader} 种子数：{len(torrents)} "
+                    f"修改限速：{sum(len(hashes) for hashes in pending_limits.values())} "
+                    f"接口调用：{len(pending_limits)} 次")
+
+    def _get_scan_stats(self) -> Dict[str, Any]:
+        """
+        API Endpoint: 返回各任务最近一次执行时每个下载器的耗时
+        """
+        return self._runner.stats
+
+    @staticmethod
+    def _get_upload_limit(torrent: Any, dl_type: str) -> Optional[int]:
+        """
+        获取种子当前的上传限速(KB/s), 不限速返回-1, 无法获取返回None
+        """
+        try:
+            if dl_type == "qbittorrent":
+                up_limit = torrent.get("up_limit")
+                if up_limit is None:
+                    return None
+                return int(up_limit) // 1024 if int(up_limit) > 0 else -1
+            else:
+                return int(torrent.upload_limit) if torrent.upload_limited else -1
+        except Exception as e:
+            logger.debug(f"{TrackerSpeedLimit.LOG_TAG}获取种子上传限速失败: {str(e)}")
+            return None
+
     @staticmethod
     def _torrent_key(torrent: Any, dl_type: str) -> Optional[Tuple[int, str]]:
         """
@@ -543,16 +624,16 @@ class TrackerSpeedLimit(_PluginBase):
                 trackers = self._get_trackers(torrent=torrent, dl_type=service.type)
                 for tracker in trackers:
                     logger.debug(f"tracker: {tracker} ...")
-                    # 检查tracker是否包含特定的关键字，并进行相应的映射
-                    domain = StringUtils.get_url_domain(tracker)
-                    if self.tracker_limit_map.get(domain, None):
+                    # 按tracker地址查找限速设置
+                    limit = self.tracker_resolver.resolve(tracker)
+                    if limit:
                         logger.info(
-                            f"{domain} {_name} {_hash} 设置限速 {int(self.tracker_limit_map.get(domain))} ...")
-                        self.torrents_set_upload_limit(_hash, int(self.tracker_limit_map.get(domain)),
-                                                       downloader_obj)
+                            f"{self.tracker_resolver.get_domain(tracker)} {_name} {_hash} 设置限速 {int(limit)} ...")
+                        self.torrents_set_upload_limit(_hash, int(limit), downloader_obj)
+                        self._applied_limits[(downloader, _hash)] = int(limit)
                         break
                     else:
-                        logger.debug(f"未获取到{domain}的设置 跳过处理...")
+                        logger.debug(f"未获取到{tracker}的设置 跳过处理...")
                         # self.torrents_set_upload_limit(_hash, -1, downloader_obj)
         except Exception as e:
             logger.error(
@@ -565,6 +646,8 @@ class TrackerSpeedLimit(_PluginBase):
         """
         停止服务
         """
+        # 通知执行中的下载器任务退出, 定时服务(get_service)启动的任务同样需要停止
+        self._runner.stop()
         try:
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
@@ -576,7 +659,7 @@ class TrackerSpeedLimit(_PluginBase):
         except Exception as e:
             print(str(e))
 
-    def torrents_set_upload_limit(self, torrent_hash: str, limit: str | int,
+    def torrents_set_upload_limit(self, torrent_hash: str | List[str], limit: str | int,
                                   service_instance: Qbittorrent | Transmission):
         if isinstance(service_instance, Qbittorrent):
             service_instance.qbc.torrents_set_upload_limit(torrent_hashes=torrent_hash, limit=int(limit*1024))
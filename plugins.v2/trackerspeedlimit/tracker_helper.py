@@ -0,0 +1,76 @@
+"""
+Tracker 地址解析辅助类
+将种子的 tracker 地址解析为站点信息，按域名建立索引并缓存已解析的 tracker 地址
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.string import StringUtils
+
+
+class TrackerSiteResolver:
+    """
+    tracker地址 -> 站点 解析器
+    1、按自定义映射(tracker关键字 -> 映射域名)或 tracker 域名查找索引
+    2、索引未命中时调用 fallback 查找, 查找结果(包括未找到)同样缓存
+    3、已解析的 tracker 地址按 LRU 缓存, 重复解析为一次字典查询
+    """
+
+    # 未找到站点时的缓存标记
+    _MISSING = object()
+
+    def __init__(self, domain_index: Dict[str, Any],
+                 mappings: Optional[Dict[str, str]] = None,
+                 fallback: Optional[Callable[[str], Any]] = None,
+                 cache_size: int = 4096):
+        """
+        :param domain_index: 域名 -> 站点信息
+        :param mappings: tracker关键字 -> 映射域名
+        :param fallback: 索引未命中时按域名查找站点信息的方法
+        :param cache_size: tracker地址缓存数量
+        """
+        self._domain_index = dict(domain_index or {})
+        self._mappings = dict(mappings or {})
+        self._fallback = fallback
+        self._cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_domain(self, tracker: str) -> str:
+        """
+        获取 tracker 对应的站点域名, 优先使用自定义映射
+        """
+        for key, mapped_domain in self._mappings.items():
+            if key in tracker:
+                return mapped_domain
+        return StringUtils.get_url_domain(tracker)
+
+    def resolve(self, tracker: str) -> Optional[Any]:
+        """
+        解析 tracker 地址对应的站点信息, 未找到时返回None
+        """
+        if not tracker:
+            return None
+        with self._lock:
+            value = self._cache.get(tracker)
+            if value is not None:
+                self._cache.move_to_end(tracker)
+                return None if value is self._MISSING else value
+        domain = self.get_domain(tracker)
+        value = self._domain_index.get(domain, self._MISSING) if domain else self._MISSING
+        if value is self._MISSING and domain and self._fallback:
+            value = self._fallback(domain) or self._MISSING
+            self._domain_index[domain] = value
+        with self._lock:
+            self._cache[tracker] = value
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return None if value is self._MISSING else value
+
+    def clear(self):
+        """
+        清空 tracker 地址缓存
+        """
+        with self._lock:
+            self._cache.clear()